@@ -0,0 +1,123 @@
+"""Render plain text as multi-line ASCII banners with FIGlet fonts.
+
+Fonts are standard ``.flf`` files in ``fonts/``. Each font is parsed once
+per process into a glyph table mapping a character to its rows, padded to a
+common width, so rendering a line is just a row-wise concatenation of table
+entries. Characters are placed at full width (FIGlet layout -1); kerning and
+smushing rules in a font are ignored.
+
+Usage:
+    python banner.py "Happy Holidays" --font block
+"""
+import argparse
+import os
+import sys
+from functools import lru_cache
+
+FONTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fonts")
+DEFAULT_FONT = "block"
+# Code points every FIGlet font defines, in file order, after ASCII 32-126
+_DEUTSCH = (196, 214, 220, 228, 246, 252, 223)
+
+
+class Font:
+    """A parsed FIGlet font: ``height`` rows per glyph and a glyph table"""
+
+    def __init__(self, height, glyphs):
+        self.height = height
+        self.glyphs = glyphs
+        self.missing = glyphs.get("?", ("",) * height)
+
+    def render_line(self, text):
+        rows = [self.glyphs.get(ch, self.missing) for ch in text]
+        if not rows:
+            return [""] * self.height
+        return ["".join(parts) for parts in zip(*rows)]
+
+
+def _parse_code(token):
+    # FIGlet code tags are decimal, 0x hex or 0-prefixed octal
+    sign = -1 if token.startswith("-") else 1
+    token = token.lstrip("+-")
+    if token[:2].lower() == "0x":
+        return sign * int(token[2:], 16)
+    if token.startswith("0") and len(token) > 1:
+        return sign * int(token[1:], 8)
+    return sign * int(token)
+
+
+def parse_flf(text):
+    """Parse the contents of a FIGlet .flf font into a Font"""
+    lines = text.splitlines()
+    header = lines[0].split()
+    if not header or not header[0].startswith("flf2a"):
+        raise ValueError("not a FIGlet font (missing flf2a header)")
+    hardblank = header[0][5]
+    height = int(header[1])
+    comment_lines = int(header[5])
+
+    def read_glyph(start):
+        rows = []
+        for line in lines[start:start + height]:
+            line = line.rstrip()
+            # The last character is the end mark; the final row repeats it
+            line = line.rstrip(line[-1]) if line else line
+            rows.append(line.replace(hardblank, " "))
+        width = max((len(row) for row in rows), default=0)
+        return tuple(row.ljust(width) for row in rows)
+
+    glyphs = {}
+    pos = 1 + comment_lines
+    for code in list(range(32, 127)) + list(_DEUTSCH):
+        if pos + height > len(lines):
+            break
+        glyphs[chr(code)] = read_glyph(pos)
+        pos += height
+    # Code-tagged characters: a line with the code point, then the glyph
+    while pos + height < len(lines):
+        tag = lines[pos].split()
+        try:
+            code = _parse_code(tag[0])
+        except (IndexError, ValueError):
+            break
+        if code >= 0:
+            glyphs[chr(code)] = read_glyph(pos + 1)
+        pos += height + 1
+    return Font(height, glyphs)
+
+
+def available_fonts():
+    """Names of the bundled fonts"""
+    return sorted(name[:-4] for name in os.listdir(FONTS_DIR) if name.endswith(".flf"))
+
+
+@lru_cache(maxsize=None)
+def load_font(name=DEFAULT_FONT):
+    """The compiled glyph table for a bundled font, parsed on first use"""
+    if name not in available_fonts():
+        raise ValueError(f"unknown font {name!r} (available: {', '.join(available_fonts())})")
+    with open(os.path.join(FONTS_DIR, name + ".flf"), encoding="latin-1") as f:
+        return parse_flf(f.read())
+
+
+def render_banner(text, font=DEFAULT_FONT):
+    """Render text as a banner; each input line becomes ``font.height`` rows"""
+    font = load_font(font)
+    rows = []
+    for line in text.splitlines() or [""]:
+        rows.extend(font.render_line(line))
+    return "\n".join(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print text as an ASCII banner.")
+    parser.add_argument("text", help="text to render; \\n starts a new banner line")
+    parser.add_argument("-f", "--font", default=DEFAULT_FONT, choices=available_fonts(),
+                        help=f"font to use (default: {DEFAULT_FONT})")
+    args = parser.parse_args(argv)
+    print(render_banner(args.text.replace("\\n", "\n"), args.font))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,280 @@
+"""Headless batch generation of LED message pages.
+
+Reads a CSV or JSONL manifest of messages and renders every page with
+``create_html_file`` across a process pool.
+
+Usage:
+    python batch.py manifest.csv --output-dir docs --workers 8
+
+With ``--publish`` the output directory is committed and pushed in one go
+once the batch is done (see deploy.publish_pages).
+
+With ``--cache`` pages are content-addressed (see cache.py): repeated
+greetings are rendered once per batch, pages from earlier runs are reused,
+and manifest filenames are ignored.
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from generator import write_html_file
+from banner import DEFAULT_FONT, render_banner
+from cache import DEFAULT_MAX_BYTES, PageCache, normalize_inputs, page_filename, page_key
+from deploy import publish_pages
+from gallery import Gallery, is_gallery_page
+from page import FEATURES, SNOW_COUNT
+
+DEFAULT_COLOR = "#ff3366"
+DEFAULT_DELAY = 5
+# "\n" and "\\" in CSV messages of rows that set the escapes column
+_ESCAPE_RE = re.compile(r"\\([\\n])")
+
+
+def _flag(value):
+    return str(value or "").lower() in ("1", "true", "yes")
+
+
+def load_manifest(path):
+    """Read batch jobs from a .csv or .jsonl manifest"""
+    jobs = []
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.lower().endswith(('.jsonl', '.ndjson')):
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    jobs.append(json.loads(line))
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{path}:{line_no}: invalid JSON ({e.msg})") from e
+        else:
+            for row in csv.DictReader(f):
+                # Quoted cells can hold real newlines. Escapes are opt-in, since
+                # ascii art is full of backslashes ("\n/" is a tree, not a newline)
+                if row.get("message") and _flag(row.get("escapes")):
+                    row["message"] = _ESCAPE_RE.sub(lambda m: "\n" if m.group(1) == "n" else "\\", row["message"])
+                jobs.append(row)
+    return jobs
+
+
+def normalize_job(job, index):
+    """Fill in defaults and validate a single manifest entry"""
+    message = job.get("message")
+    if not message and job.get("banner"):
+        message = render_banner(str(job["banner"]), job.get("font") or DEFAULT_FONT)
+    if not message and job.get("image"):
+        # NumPy and Pillow are only needed for image jobs
+        from imageart import DEFAULT_WIDTH, image_to_ascii
+        width = job.get("width")
+        dither = _flag(job.get("dither"))
+        message = image_to_ascii(job["image"], int(width) if width else DEFAULT_WIDTH, dither=dither)
+    if not message or not str(message).strip():
+        raise ValueError("missing message")
+    message = str(message)
+
+    color = job.get("color") or DEFAULT_COLOR
+    delay = job.get("delay")
+    delay = DEFAULT_DELAY if delay in (None, "") else int(delay)
+    filename = job.get("filename") or f"message-{index:06d}.html"
+    # Manifests come from elsewhere: pages stay directly inside the output directory
+    if filename in (".", "..") or any(sep in filename for sep in ("/", "\\", os.sep)):
+        raise ValueError(f"filename must be a plain file name, not {filename!r}")
+    if is_gallery_page(filename):
+        raise ValueError(f"{filename} is reserved for the gallery")
+
+    return {"message": message, "color": color, "delay": delay, "filename": filename}
+
+
+def _render_job(args):
+    index, job, output_dir, options = args
+    try:
+        job = normalize_job(job, index)
+        # The parent appends to the manifest once for the whole batch
+        path, entry, replaced = write_html_file(job["message"], job["color"], job["delay"], job["filename"],
+                                                output_dir, **options)
+        return index, path, None, (entry, replaced)
+    except Exception as e:
+        return index, None, f"{type(e).__name__}: {e}", None
+
+
+def _cache_lookup(jobs, cache, options):
+    """Split jobs into cache hits and one render task per distinct uncached page.
+
+    Returns ``(results, tasks, pending)`` where ``pending`` maps the index of
+    each task to its cache key and the indices of every job that shares it.
+    """
+    results, tasks, pending, by_key = [], [], {}, {}
+    for index, job in enumerate(jobs):
+        try:
+            job = normalize_job(job, index)
+            key = page_key(job["message"], job["color"], job["delay"], **options)
+        except Exception as e:
+            results.append((index, None, f"{type(e).__name__}: {e}"))
+            continue
+        if key in by_key:
+            pending[by_key[key]][1].append(index)
+            continue
+        path = cache.get(key)
+        if path is not None:
+            results.append((index, path, None))
+            continue
+        message, color, delay = normalize_inputs(job["message"], job["color"], job["delay"])
+        job = {"message": message, "color": color, "delay": delay, "filename": page_filename(key)}
+        by_key[key] = index
+        pending[index] = (key, [index])
+        tasks.append((index, job, cache.output_dir, options))
+    return results, tasks, pending
+
+
+def create_html_batch(jobs, output_dir="docs", workers=None, chunksize=None, cache=None, **options):
+    """Render many pages in parallel and return a summary report.
+
+    ``jobs`` is an iterable of dicts with ``message`` and optional ``color``,
+    ``delay`` and ``filename`` keys. Instead of a message, a job may give
+    ``banner`` text (with an optional ``font``) to render in big letters, or
+    an ``image`` path to convert to ASCII art, with optional ``width`` and
+    ``dither``. Extra keyword ``options`` are passed to
+    ``create_html_file`` for every page. Failing jobs do not stop the batch;
+    they are collected in the report's ``errors`` list as ``(index, message)``.
+    New pages are added to the output directory's manifest and gallery in
+    one append at the end.
+
+    If ``cache`` is a PageCache, pages are content-addressed in its output
+    directory instead: each distinct page is rendered at most once and jobs
+    that hit the cache are counted in the report's ``cached`` field. The
+    report's ``pages_per_sec`` is for the ``rendered`` pages only.
+    """
+    jobs = list(jobs)
+    if cache is not None:
+        output_dir = cache.output_dir
+        results, tasks, pending = _cache_lookup(jobs, cache, options)
+    else:
+        results, pending = [], {}
+        tasks = [(index, job, output_dir, options) for index, job in enumerate(jobs)]
+    os.makedirs(output_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    if workers == 1 or len(tasks) <= 1:
+        rendered = list(map(_render_job, tasks))
+    else:
+        workers = workers or os.cpu_count() or 1
+        if chunksize is None:
+            # A few chunks per worker keeps the pool busy without paying IPC per page
+            chunksize = max(1, len(tasks) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            rendered = list(executor.map(_render_job, tasks, chunksize=chunksize))
+    elapsed = time.perf_counter() - start
+
+    written = [written for _, _, error, written in rendered if error is None]
+    # Pages written over earlier ones (a manifest run again) replace their cards
+    Gallery(output_dir).add([entry for entry, _ in written], replace=any(replaced for _, replaced in written))
+    for index, path, error, _ in rendered:
+        if index not in pending:
+            results.append((index, path, error))
+            continue
+        key, indices = pending[index]
+        if error is None:
+            cache.put(key, path)
+        results.extend((i, path, error) for i in indices)
+    if cache is not None:
+        cache.save()
+    results.sort(key=lambda result: result[0])
+
+    files = [path for _, path, error in results if error is None]
+    errors = [(index, error) for index, _, error in results if error is not None]
+    rendered_ok = sum(1 for _, _, error, _ in rendered if error is None)
+    return {
+        "total": len(jobs),
+        "ok": len(files),
+        "failed": len(errors),
+        "rendered": rendered_ok,
+        "cached": len(files) - rendered_ok,
+        "files": files,
+        "errors": errors,
+        "elapsed": elapsed,
+        # ``elapsed`` only covers rendering, so cache hits are left out of the rate
+        "pages_per_sec": rendered_ok / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate LED message pages from a CSV/JSONL manifest.")
+    parser.add_argument("manifest", help="CSV or JSONL file with message (or banner and font, or image, width "
+                                         "and dither), color, delay and filename columns; CSV rows with "
+                                         "escapes=1 read \\n in the message as a newline and \\\\ as a backslash")
+    parser.add_argument("-o", "--output-dir", default="docs", help="directory to write pages into (default: docs)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--shared-assets", action="store_true",
+                        help="link one content-hashed CSS/JS asset instead of inlining the engine in every page")
+    parser.add_argument("--prebaked-textures", action="store_true",
+                        help="ship the tree sprites as precomputed PNGs (requires NumPy)")
+    parser.add_argument("--cached-scenery", action="store_true",
+                        help="draw the static city once into an offscreen canvas and composite it each frame")
+    parser.add_argument("--target-fps", type=float, default=None,
+                        help="let pages adapt render scale and snow density to hold this frame rate")
+    parser.add_argument("--max-fps", type=float, default=None, help="cap the page's render loop at this frame rate")
+    parser.add_argument("--pause-when-hidden", action="store_true", help="stop rendering while the page is hidden")
+    parser.add_argument("--low-power", action="store_true", help="only redraw the layers that changed each frame")
+    parser.add_argument("--instrument", action="store_true", help="record frame times and canvas calls in each page")
+    parser.add_argument("--offscreen", action="store_true",
+                        help="render in a Web Worker on an OffscreenCanvas where the browser supports it")
+    parser.add_argument("--snow-count", type=int, default=SNOW_COUNT,
+                        help="snow flakes per page (default: %(default)s; ignored with --target-fps)")
+    parser.add_argument("--snow-speed", type=float, default=1.0, help="multiplier for the snow's fall speed")
+    parser.add_argument("--snow-wind", type=float, default=0.0,
+                        help="sideways snow drift in CSS pixels per second, negative for leftwards")
+    parser.add_argument("--features", default=",".join(FEATURES),
+                        help="comma-separated parts of the page to include, or 'none' for the message only "
+                             "(default: %(default)s)")
+    parser.add_argument("--minify", action="store_true", help="minify the embedded CSS/JS/HTML")
+    parser.add_argument("--precompress", action="store_true", help="also write .gz/.br siblings for static servers")
+    parser.add_argument("--cache", action="store_true",
+                        help="name pages by content hash and skip pages that were already generated")
+    parser.add_argument("--cache-max-mb", type=float, default=DEFAULT_MAX_BYTES / 2**20,
+                        help="evict least recently used cached pages beyond this size (default: %(default).0f)")
+    parser.add_argument("--publish", action="store_true",
+                        help="commit every new or changed page in one git commit and push it (see deploy.py)")
+    args = parser.parse_args(argv)
+    if args.offscreen and (args.low_power or args.instrument):
+        parser.error("--offscreen cannot be combined with --low-power or --instrument")
+    features = () if args.features == "none" else tuple(name.strip() for name in args.features.split(",") if name)
+    unknown = set(features) - set(FEATURES)
+    if unknown:
+        parser.error(f"unknown features: {', '.join(sorted(unknown))} (available: {', '.join(FEATURES)})")
+
+    jobs = load_manifest(args.manifest)
+    cache = PageCache(args.output_dir, int(args.cache_max_mb * 2**20)) if args.cache else None
+    report = create_html_batch(jobs, args.output_dir, args.workers, cache=cache, shared_assets=args.shared_assets,
+                               prebaked_textures=args.prebaked_textures, cached_scenery=args.cached_scenery,
+                               target_fps=args.target_fps, max_fps=args.max_fps,
+                               pause_when_hidden=args.pause_when_hidden, low_power=args.low_power,
+                               instrument=args.instrument, offscreen=args.offscreen, snow_count=args.snow_count,
+                               snow_speed=args.snow_speed, snow_wind=args.snow_wind, features=features,
+                               minify=args.minify, precompress=args.precompress)
+
+    for index, error in report["errors"]:
+        print(f"job {index}: {error}", file=sys.stderr)
+    print(
+        f"{report['ok']}/{report['total']} pages written to {args.output_dir} "
+        f"in {report['elapsed']:.2f}s ({report['rendered']} rendered, {report['pages_per_sec']:.0f} pages/s)"
+        + (f", {report['cached']} from cache" if cache else "")
+    )
+    if args.publish:
+        try:
+            published = publish_pages(args.output_dir)
+        except subprocess.CalledProcessError as e:
+            print(f"publish failed: {e.stderr or e.stdout or e}", file=sys.stderr)
+            return 1
+        if published["commit"]:
+            print(f"published {len(published['files'])} file(s), removed {len(published['deleted'])}, in {published['commit'][:12]}")
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
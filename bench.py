@@ -0,0 +1,332 @@
+"""Benchmarks for page generation and the generated engine.
+
+Reports generation throughput (single process and batch), the time and
+peak memory for one page of very large ascii art, the cold-start import
+time of the headless core, bytes per page (raw, gzip and brotli) for the
+main engine configurations, the engine script size and parse time for
+feature-stripped builds against the full one, and a static count of
+canvas calls per frame derived from the scene parameters at common screen
+sizes.
+
+The size and draw-cost sections are deterministic and can be written to a
+baseline file, so a regression shows up as a diff:
+
+    python bench.py --baseline bench_baseline.json
+"""
+import argparse
+import gzip
+import json
+import math
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+
+from generator import create_html_file
+from batch import create_html_batch
+from page import FEATURES, SNOW_COUNT, compile_page, render_page
+
+try:
+    import brotli
+except ImportError:  # optional; brotli sizes are reported as null without it
+    brotli = None
+
+SAMPLE_MESSAGE = "HAPPY HOLIDAYS"
+# Modules the headless core must never import
+GUI_MODULES = ("tkinter", "_tkinter", "webbrowser")
+
+SCREEN_SIZES = {
+    "phone": (390, 844),
+    "tablet": (768, 1024),
+    "laptop": (1366, 768),
+    "1080p": (1920, 1080),
+    "1440p": (2560, 1440),
+    "4k": (3840, 2160),
+}
+
+# Engine configurations to size, as create_html_file keyword arguments
+CONFIGS = {
+    "inline": {},
+    "shared-assets": {"shared_assets": True},
+    "cached-scenery": {"cached_scenery": True},
+    "minified": {"minify": True},
+    "minified-shared-assets": {"shared_assets": True, "minify": True},
+    "offscreen": {"offscreen": True},
+    "message-only": {"features": ()},
+}
+
+# Feature sets for the engine comparison, as create_html_file ``features``
+FEATURE_SETS = {
+    "full": FEATURES,
+    "no-snow": ("scenery", "lights", "effects", "mobile"),
+    "snow-only": ("snow", "effects", "mobile"),
+    "message-only": (),
+}
+
+# Compiles each script the way a page load does (top level eagerly, functions
+# lazily); the trailing comment keeps V8 from reusing an earlier compile
+PARSE_PROBE = r"""
+const vm = require("vm");
+const sources = JSON.parse(require("fs").readFileSync(0, "utf8"));
+const runs = Number(process.argv[1]);
+const result = {};
+for (const [name, source] of Object.entries(sources)) {
+  const times = [];
+  for (let i = 0; i < runs; i++) {
+    const start = process.hrtime.bigint();
+    new vm.Script(`${source}\n// ${name} ${i}`);
+    times.push(Number(process.hrtime.bigint() - start) / 1e6);
+  }
+  times.sort((a, b) => a - b);
+  result[name] = times[Math.floor(runs / 2)];
+}
+console.log(JSON.stringify(result));
+"""
+
+# Mirrors the constants at the top of the generated engine
+DPR = 0.5
+LEVELS = 7
+SECTIONS = range(-2, 3 * 2)
+
+
+def _add(counter, **calls):
+    for name, count in calls.items():
+        counter[name] += count
+
+
+def _rhombus(counter, count=1):
+    _add(counter, createLinearGradient=count, beginPath=count, moveTo=count, lineTo=3 * count,
+         closePath=count, fill=count)
+
+
+def _line(counter, count=1):
+    _add(counter, beginPath=count, moveTo=count, lineTo=count, stroke=count)
+
+
+def frame_draw_calls(width, height, snow_count=SNOW_COUNT, cached_scenery=False):
+    """Canvas calls issued by one frame of `animate` at a given CSS viewport size.
+
+    Mirrors drawSectionScenery, drawSectionLights and drawSnow in page.py, so
+    it must be updated together with them.
+    """
+    scene_width = math.floor(width * DPR)
+    section_height = 300 * DPR
+    level_width = section_height / (LEVELS + 1) * (3.6 / 3.0)
+    colls = math.ceil(scene_width / level_width)
+    padik_cols = sum(1 for col in range(colls) if col % 6 < 2)
+    icicles = math.ceil(scene_width / 3)
+
+    calls = Counter()
+    # Snow is one path: a rect per flake and a single fill
+    _add(calls, setTransform=2, translate=1, beginPath=1, rect=snow_count, fill=1)
+    if cached_scenery:
+        _add(calls, drawImage=1)
+    else:
+        _add(calls, fillRect=1)
+
+    for i in SECTIONS:
+        if not cached_scenery:
+            rows = len(range(LEVELS))
+            padiks = rows * padik_cols if i % 2 == 0 else 0
+            windows = rows * colls - padiks
+            _add(calls, drawImage=2 * 6 + 1)
+            _rhombus(calls, 2 + windows + 2 * padiks)
+            _add(calls, stroke=windows)
+            _line(calls, 2 * windows + 3 * padiks)
+            _line(calls, colls + 2 + (LEVELS + 1))
+            _add(calls, beginPath=1, moveTo=1, lineTo=2 * icicles, fill=1)
+        # Tree lights
+        _add(calls, beginPath=1, moveTo=1, lineTo=13, stroke=1)
+
+    calls = dict(sorted(calls.items()))
+    calls["total"] = sum(calls.values())
+    return calls
+
+
+def draw_cost_report():
+    """Per-frame canvas calls for each screen size and render mode"""
+    report = {}
+    for name, (width, height) in SCREEN_SIZES.items():
+        report[name] = {
+            "viewport": [width, height],
+            "immediate": frame_draw_calls(width, height)["total"],
+            "cached_scenery": frame_draw_calls(width, height, cached_scenery=True)["total"],
+        }
+    return report
+
+
+def _sizes(data):
+    return {
+        "raw": len(data),
+        "gzip": len(gzip.compress(data, 9)),
+        "brotli": len(brotli.compress(data, quality=11)) if brotli else None,
+    }
+
+
+def size_report(message=SAMPLE_MESSAGE):
+    """Bytes per page, and per shared asset, for each engine configuration"""
+    report = {}
+    for name, options in CONFIGS.items():
+        html = render_page(message, **options).encode("utf-8")
+        entry = {"page": _sizes(html)}
+        assets = compile_page(**options).assets
+        if assets:
+            entry["assets"] = {
+                asset.rsplit(".", 1)[-1]: _sizes(content.encode("utf-8") if isinstance(content, str) else content)
+                for asset, content in assets.items()
+            }
+        report[name] = entry
+    return report
+
+
+def engine_report(runs=50):
+    """Engine script bytes and parse time for each feature set.
+
+    ``parse_ms`` is the median compile time in Node (V8, the engine of
+    Chrome), or null when ``node`` is not installed.
+    """
+    sources = {}
+    for name, features in FEATURE_SETS.items():
+        assets = compile_page(shared_assets=True, features=features).assets
+        sources[name] = next(content for asset, content in assets.items() if asset.endswith(".js"))
+    parse_ms = {}
+    node = shutil.which("node")
+    if node:
+        result = subprocess.run([node, "-e", PARSE_PROBE, str(runs)], input=json.dumps(sources),
+                                capture_output=True, text=True, check=True)
+        parse_ms = json.loads(result.stdout)
+    full = len(sources["full"])
+    return {
+        name: {
+            "features": list(FEATURE_SETS[name]),
+            **_sizes(source.encode("utf-8")),
+            "share_of_full": round(len(source) / full, 3),
+            "parse_ms": parse_ms.get(name),
+        }
+        for name, source in sources.items()
+    }
+
+
+def throughput_report(pages=2000, workers=None):
+    """Pages/sec for in-memory rendering, single-process writes and a batch run"""
+    jobs = [{"message": f"{SAMPLE_MESSAGE}\nGUEST {i}", "filename": f"bench-{i}.html"} for i in range(pages)]
+    report = {"pages": pages}
+
+    start = time.perf_counter()
+    for job in jobs:
+        render_page(job["message"])
+    report["render_pages_per_sec"] = pages / (time.perf_counter() - start)
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        start = time.perf_counter()
+        for job in jobs:
+            create_html_file(job["message"], filename=job["filename"], output_dir=output_dir)
+        report["single_process_pages_per_sec"] = pages / (time.perf_counter() - start)
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        batch = create_html_batch(jobs, output_dir, workers)
+        report["batch_pages_per_sec"] = batch["pages_per_sec"]
+        report["batch_workers"] = workers or os.cpu_count()
+    return report
+
+
+def large_art_report(lines=50000, width=200):
+    """Time and peak Python memory to write one page of very large ascii art"""
+    art = "\n".join("*" * (i % width) for i in range(lines))
+    with tempfile.TemporaryDirectory() as output_dir:
+        # Compile the template first so only the page itself is measured
+        create_html_file(SAMPLE_MESSAGE, output_dir=output_dir, manifest=False)
+        tracemalloc.start()
+        start = time.perf_counter()
+        path = create_html_file(art, filename="large-art.html", output_dir=output_dir, manifest=False)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return {
+            "lines": lines,
+            "art_bytes": len(art),
+            "page_bytes": os.path.getsize(path),
+            "seconds": elapsed,
+            "peak_memory_bytes": peak,
+        }
+
+
+def cold_start_report(runs=10, module="generator"):
+    """Import cost of the headless core in fresh interpreters.
+
+    ``import_ms`` is the cumulative ``-X importtime`` figure for ``module``
+    (median over ``runs``), ``process_ms`` the wall time of the whole
+    interpreter, next to ``bare_process_ms`` for one that imports nothing.
+    """
+    root = os.path.dirname(os.path.abspath(__file__))
+    probe = f"import sys, {module}; print(' '.join(m for m in {GUI_MODULES!r} if m in sys.modules))"
+
+    def run(code):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=root,
+                                capture_output=True, text=True, check=True)
+        return time.perf_counter() - start, result
+
+    import_us, process, bare = [], [], []
+    gui_modules = set()
+    for _ in range(runs):
+        bare.append(run("pass")[0])
+        elapsed, result = run(probe)
+        process.append(elapsed)
+        gui_modules.update(result.stdout.split())
+        # "import time: self [us] | cumulative | imported package"
+        for line in result.stderr.splitlines():
+            fields = line.split("|")
+            if len(fields) == 3 and fields[2].strip() == module:
+                import_us.append(int(fields[1]))
+    return {
+        "module": module,
+        "runs": runs,
+        "import_ms": statistics.median(import_us) / 1000,
+        "process_ms": statistics.median(process) * 1000,
+        "bare_process_ms": statistics.median(bare) * 1000,
+        "gui_modules": sorted(gui_modules),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark LED page generation and per-frame draw cost.")
+    parser.add_argument("--pages", type=int, default=2000, help="pages to generate for throughput (default: 2000)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="batch worker processes (default: CPU count)")
+    parser.add_argument("--large-art-lines", type=int, default=50000,
+                        help="lines of ascii art for the large-art write (default: 50000)")
+    parser.add_argument("--max-import-ms", type=float, default=None,
+                        help="exit with an error if importing the headless core takes longer than this")
+    parser.add_argument("--skip-throughput", action="store_true", help="only report the deterministic sections")
+    parser.add_argument("--baseline", help="write the size and draw-cost sections to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = {"sizes": size_report(), "draw_cost": draw_cost_report()}
+    if args.baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write("\n")
+    if not args.skip_throughput:
+        results["throughput"] = throughput_report(args.pages, args.workers)
+        results["large_art"] = large_art_report(args.large_art_lines)
+    results["engine"] = engine_report()
+    results["cold_start"] = cold_start = cold_start_report()
+
+    print(json.dumps(results, indent=2))
+    if cold_start["gui_modules"]:
+        print(f"headless core imported GUI modules: {', '.join(cold_start['gui_modules'])}", file=sys.stderr)
+        return 1
+    if args.max_import_ms is not None and cold_start["import_ms"] > args.max_import_ms:
+        print(f"importing the headless core took {cold_start['import_ms']:.1f} ms "
+              f"(limit {args.max_import_ms:g} ms)", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
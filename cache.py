@@ -0,0 +1,118 @@
+"""Content-addressed page cache.
+
+Pages are named after a hash of their normalised inputs (message, color,
+delay) and the engine version, so identical requests map to the same file
+and distinct requests can never overwrite each other. A hit returns the
+existing file without rendering or writing anything. An on-disk index tracks
+page sizes and last use, and the least recently used pages are evicted once
+the cache grows past ``max_bytes``; evicted pages are also taken off the
+gallery (see gallery.py).
+
+``generator.cached_html_file`` puts this cache in front of ``create_html_file``.
+"""
+import hashlib
+import json
+import os
+import time
+
+from gallery import Gallery
+from page import page_template, write_atomic
+
+INDEX_NAME = ".page-cache.json"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+COMPRESSED_SUFFIXES = (".gz", ".br")
+
+
+def normalize_inputs(message, color, delay):
+    """Canonical form of the inputs that produce a page"""
+    # Whitespace is significant: every line is centered on its own length
+    message = message.replace("\r\n", "\n").replace("\r", "\n")
+    color = color.strip().lower()
+    delay = float(delay)
+    return message, color, int(delay) if delay.is_integer() else delay
+
+
+def page_key(message, color, delay, **options):
+    """Content hash for a page; ``options`` are create_html_file keyword arguments
+
+    Only single-message pages are keyed here. Playlist pages are written by
+    name and never cached, since page_inputs reads back just their first item.
+    """
+    message, color, delay = normalize_inputs(message, color, delay)
+    precompress = options.pop("precompress", False)
+    # Whether the page is listed in the gallery does not change the page
+    options.pop("manifest", None)
+    version = page_template(**options).version
+    payload = json.dumps([version, precompress, message, color, delay], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def page_filename(key):
+    return f"message-{key[:16]}.html"
+
+
+class PageCache:
+    """Size-bounded LRU cache of generated pages in one output directory"""
+
+    def __init__(self, output_dir="docs", max_bytes=DEFAULT_MAX_BYTES):
+        self.output_dir = output_dir
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(output_dir, INDEX_NAME)
+        self.entries = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    def total_bytes(self):
+        return sum(entry["size"] for entry in self.entries.values())
+
+    def get(self, key):
+        """Path of a cached page, or None; marks the page as recently used"""
+        filename = page_filename(key)
+        path = os.path.join(self.output_dir, filename)
+        if not os.path.exists(path):
+            self.entries.pop(key, None)
+            return None
+        if key not in self.entries:
+            # Written by an earlier run whose index was lost; adopt it
+            self.entries[key] = {"file": filename, "size": self._size(path)}
+        self.entries[key]["last_used"] = time.time()
+        return path
+
+    def put(self, key, path):
+        """Record a newly written page and evict old pages if over budget"""
+        self.entries[key] = {"file": os.path.basename(path), "size": self._size(path), "last_used": time.time()}
+        self.evict(keep=key)
+
+    def evict(self, keep=None):
+        """Delete least recently used pages until the cache fits in max_bytes"""
+        total = self.total_bytes()
+        evicted = []
+        for key, entry in sorted(self.entries.items(), key=lambda item: item[1].get("last_used", 0)):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            path = os.path.join(self.output_dir, entry["file"])
+            for victim in (path, *(path + suffix for suffix in COMPRESSED_SUFFIXES)):
+                if os.path.exists(victim):
+                    os.remove(victim)
+            total -= entry["size"]
+            evicted.append(entry["file"])
+            del self.entries[key]
+        if evicted:
+            # Evicted pages must not stay on the gallery as dead links
+            Gallery(self.output_dir).remove(evicted)
+
+    def save(self):
+        """Write the index back to disk"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        write_atomic(self.index_path, json.dumps(self.entries, separators=(",", ":")).encode("utf-8"))
+
+    @staticmethod
+    def _size(path):
+        size = os.path.getsize(path)
+        for suffix in COMPRESSED_SUFFIXES:
+            if os.path.exists(path + suffix):
+                size += os.path.getsize(path + suffix)
+        return size
@@ -0,0 +1,293 @@
+"""Background deploy queue for generated pages.
+
+Pages submitted within a short window are combined into a single
+``git commit`` and ``git push`` on a worker thread, so the Tk event loop
+never waits on git. Progress and results are reported through a ``notify``
+callback; the GUI wraps it in ``root.after`` to get back onto the Tk thread.
+
+``publish_pages`` is the bulk path for batch runs: every new or changed
+file under ``docs/`` goes into one commit written with ``git fast-import``
+and is pushed once, so publishing thousands of pages costs a handful of
+git processes instead of several per page.
+
+Usage:
+    python deploy.py docs
+"""
+import argparse
+import hashlib
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+
+_STOP = object()
+NULL_OID = "0" * 40
+
+
+def git(args, cwd=None):
+    """Run a git command and return its stdout"""
+    proc = subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True, check=True)
+    return proc.stdout.strip()
+
+
+def pages_url(repo_url, filename):
+    """GitHub Pages URL for a file in docs/, or None for non-https remotes"""
+    if repo_url.endswith('.git'):
+        repo_url = repo_url[:-4]
+    if not repo_url.startswith('https://'):
+        return None
+    username, repo_name = repo_url.split('/')[-2:]
+    return f"https://{username}.github.io/{repo_name}/{filename}"
+
+
+def blob_hash(data):
+    """The object id git gives a blob with this content"""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def _read_blob(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    return blob_hash(data), data
+
+
+def _changed_files(directory, top):
+    """(path, mode, blob id) for files under ``directory`` that differ from HEAD.
+
+    Paths are relative to the top level ``top``. They come from
+    ``git ls-files``, so .gitignore applies; dot files (the local cache and
+    gallery state) are never published. Committed files that are gone from
+    disk, such as evicted pages, are yielded with a mode and id of None.
+    """
+    listed = git(["ls-files", "-z", "--cached", "--others", "--exclude-standard", "--", directory], top)
+    committed = {}
+    if subprocess.run(["git", "rev-parse", "--verify", "--quiet", "HEAD"], cwd=top, capture_output=True).returncode == 0:
+        for item in filter(None, git(["ls-tree", "-r", "-z", "HEAD", "--", directory], top).split("\0")):
+            info, path = item.split("\t", 1)
+            mode, _, object_id = info.split()
+            committed[path] = (mode, object_id)
+
+    for path in dict.fromkeys(filter(None, listed.split("\0"))):
+        full_path = os.path.join(top, path)
+        if os.path.basename(path).startswith(".") or os.path.islink(full_path) or not os.path.isfile(full_path):
+            continue
+        mode = "100755" if os.access(full_path, os.X_OK) else "100644"
+        object_id, _ = _read_blob(full_path)
+        if committed.get(path) != (mode, object_id):
+            yield path, mode, object_id
+    for path in committed:
+        if not os.path.lexists(os.path.join(top, path)):
+            yield path, None, None
+
+
+def _existing_objects(object_ids, cwd):
+    """The subset of ``object_ids`` already in the repository"""
+    if not object_ids:
+        return set()
+    proc = subprocess.run(["git", "cat-file", "--batch-check=%(objectname) %(objecttype)"], cwd=cwd,
+                          input="\n".join(object_ids) + "\n", capture_output=True, text=True, check=True)
+    return {line.split()[0] for line in proc.stdout.splitlines() if line.endswith(" blob")}
+
+
+def publish_pages(directory="docs", cwd=None, message=None, push=True, remote="origin", notify=None):
+    """Commit every new or changed file in ``directory`` at once and push it.
+
+    The commit is streamed to ``git fast-import`` on top of the current
+    branch, with blobs git already has referenced by id instead of sent
+    again, and the index is updated to match, so the working tree stays
+    clean. Files deleted from ``directory`` are deleted in the commit too.
+    Returns the same result dict as DeployQueue's ``done`` event, plus the
+    ``deleted`` paths; ``commit`` is None when nothing changed.
+    """
+    notify = notify or (lambda event, payload: None)
+    cwd = cwd or os.getcwd()
+    top = git(["rev-parse", "--show-toplevel"], cwd)
+    directory = os.path.relpath(os.path.join(cwd, directory), top)
+    ref = git(["symbolic-ref", "HEAD"], cwd)
+    parent = subprocess.run(["git", "rev-parse", "--verify", "--quiet", "HEAD"], cwd=cwd,
+                            capture_output=True, text=True).stdout.strip()
+
+    notify("progress", "Hashing pages...")
+    changed = list(_changed_files(directory, top))
+    files = [path for path, mode, _ in changed if mode]
+    deleted = [path for path, mode, _ in changed if not mode]
+    if not changed:
+        return {"files": [], "deleted": [], "commit": None, "urls": []}
+
+    if message is None:
+        if len(changed) == 1:
+            message = f"Deploy: {files[0]}" if files else f"Remove: {deleted[0]}"
+        else:
+            message = f"Deploy: {len(files)} pages" + (f", {len(deleted)} removed" if deleted else "")
+    known = _existing_objects([object_id for _, _, object_id in changed if object_id], cwd)
+
+    notify("progress", f"Committing {len(changed)} page(s)...")
+    # Without --force, fast-import refuses to move the branch if it changed meanwhile
+    proc = subprocess.Popen(["git", "fast-import", "--quiet", "--done"], cwd=top,
+                            stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        stream = proc.stdin
+        encoded = message.encode("utf-8")
+        committer = git(["var", "GIT_COMMITTER_IDENT"], cwd).encode("utf-8")
+        stream.write(b"commit %s\nmark :1\ncommitter %s\ndata %d\n%s\n" % (ref.encode(), committer, len(encoded), encoded))
+        if parent:
+            stream.write(b"from %s\n" % parent.encode())
+        for i, (path, mode, object_id) in enumerate(changed):
+            quoted = path.encode("utf-8").replace(b"\\", b"\\\\").replace(b'"', b'\\"')
+            if mode is None:
+                stream.write(b'D "%s"\n' % quoted)
+            elif object_id not in known:
+                # Read again rather than holding every page in memory; the
+                # id is taken from these bytes in case the file changed
+                object_id, data = _read_blob(os.path.join(top, path))
+                changed[i] = (path, mode, object_id)
+                stream.write(b'M %s inline "%s"\ndata %d\n%s\n' % (mode.encode(), quoted, len(data), data))
+            else:
+                stream.write(b'M %s %s "%s"\n' % (mode.encode(), object_id.encode(), quoted))
+        stream.write(b"\ndone\n")
+        stream.close()
+    except BrokenPipeError:
+        pass
+    stderr = proc.stderr.read()
+    if proc.wait() != 0:
+        raise subprocess.CalledProcessError(proc.returncode, "git fast-import", stderr=stderr.decode("utf-8", "replace"))
+    commit = git(["rev-parse", ref], cwd)
+
+    # Point the index at the committed blobs so the pages do not show up as changes
+    # (mode 0 removes the entry)
+    index_info = "".join(f"{mode or 0} {object_id or NULL_OID}\t{path}\0" for path, mode, object_id in changed)
+    subprocess.run(["git", "update-index", "-z", "--index-info"], cwd=top, input=index_info.encode("utf-8"), check=True)
+    subprocess.run(["git", "update-index", "-q", "--refresh"], cwd=top, capture_output=True)
+
+    urls = []
+    if push:
+        notify("progress", "Pushing to GitHub...")
+        git(["push", remote, ref], cwd)
+        repo_url = git(["config", "--get", f"remote.{remote}.url"], cwd)
+        urls = [url for url in (pages_url(repo_url, os.path.basename(path)) for path in files) if url]
+    return {"files": files, "deleted": deleted, "commit": commit, "urls": urls}
+
+
+class DeployQueue:
+    """Coalesces submitted pages into one commit and one push per window.
+
+    ``notify(event, payload)`` is called from the worker thread with
+    ``"progress"`` (a status string), ``"done"`` (a result dict with
+    ``files``, ``commit`` and ``urls``) or ``"error"`` (a message string).
+    """
+
+    def __init__(self, notify, cwd=None, window=2.0):
+        self.notify = notify
+        self.cwd = cwd
+        self.window = window
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="deploy-worker", daemon=True)
+        self._thread.start()
+
+    def submit(self, path, *related):
+        """Queue a generated page for the next deploy.
+
+        ``related`` paths (or git pathspecs), such as the gallery files, are
+        committed with it, including deletions under them, but are not
+        reported as pages.
+        """
+        self._queue.put((path, related))
+
+    def close(self, timeout=None):
+        """Deploy anything still queued, then stop the worker"""
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def is_alive(self):
+        """Whether the worker is still running (a closed queue may still be deploying)"""
+        return self._thread.is_alive()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            # Keep collecting until the window closes so a burst becomes one commit
+            deadline = time.monotonic() + self.window
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            files = list(dict.fromkeys(path for path, _ in batch))
+            related = list(dict.fromkeys(path for _, paths in batch for path in paths))
+            self._deploy(files, related)
+
+    def _deploy(self, files, related=()):
+        names = [os.path.basename(path) for path in files]
+        try:
+            self.notify("progress", f"Committing {len(files)} page(s)...")
+            git(["add", "-A", "--", *files, *related], self.cwd)
+            if subprocess.run(["git", "diff", "--cached", "--quiet"], cwd=self.cwd).returncode == 0:
+                if not self._unpushed():
+                    self.notify("done", {"files": files, "commit": None, "urls": []})
+                    return
+                # Nothing new, but an earlier push failed: retry it
+                commit = git(["rev-parse", "HEAD"], self.cwd)
+            else:
+                if len(names) == 1:
+                    commit_message = f"Deploy: {names[0]}"
+                else:
+                    commit_message = f"Deploy: {len(names)} pages\n\n" + "\n".join(names)
+                git(["commit", "-m", commit_message], self.cwd)
+                commit = git(["rev-parse", "HEAD"], self.cwd)
+
+            self.notify("progress", "Pushing to GitHub...")
+            git(["push"], self.cwd)
+
+            repo_url = git(["config", "--get", "remote.origin.url"], self.cwd)
+            urls = [url for url in (pages_url(repo_url, name) for name in names) if url]
+            self.notify("done", {"files": files, "commit": commit, "urls": urls})
+        except subprocess.CalledProcessError as e:
+            self.notify("error", f"Failed to deploy to GitHub:\n{e.stderr or e.stdout or str(e)}")
+        except FileNotFoundError:
+            self.notify("error", "Git command not found. Make sure Git is installed and in your system's PATH.")
+
+    def _unpushed(self):
+        """Whether the branch has commits its upstream does not"""
+        proc = subprocess.run(["git", "rev-list", "--count", "@{upstream}..HEAD"], cwd=self.cwd,
+                              capture_output=True, text=True)
+        return proc.returncode == 0 and proc.stdout.strip() != "0"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Commit all new or changed pages in one go and push them.")
+    parser.add_argument("directory", nargs="?", default="docs", help="directory to publish (default: docs)")
+    parser.add_argument("-m", "--message", default=None, help="commit message (default: Deploy: <n> pages)")
+    parser.add_argument("--remote", default="origin", help="remote to push to (default: origin)")
+    parser.add_argument("--no-push", action="store_true", help="only create the commit")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        result = publish_pages(args.directory, message=args.message, push=not args.no_push, remote=args.remote,
+                               notify=lambda event, payload: print(payload, file=sys.stderr))
+    except subprocess.CalledProcessError as e:
+        print(f"publish failed: {e.stderr or e.stdout or e}", file=sys.stderr)
+        return 1
+    if result["commit"] is None:
+        print("nothing to publish")
+    else:
+        print(f"published {len(result['files'])} file(s), removed {len(result['deleted'])}, in {result['commit'][:12]} "
+              f"({time.perf_counter() - start:.2f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,400 @@
+"""Append-only page manifest and the paginated docs/index.html gallery.
+
+Every generated page is appended to ``manifest.jsonl`` in the output
+directory as one JSON line (file, hash, time, color, size, title). The
+gallery is built from that manifest in fixed pages of PAGE_SIZE entries:
+``index.html`` holds the first entries, ``index-2.html`` the next, and so
+on. Because pages only ever fill up at the end, adding an entry reads at
+most one page worth of the manifest and rewrites only the last gallery page
+(plus the previous one when a new page is opened, to link to it). A page
+regenerated under the same name has its entry overwritten in place (lines
+are padded to leave room for it), which rewrites only the gallery page
+holding its card. Only removing entries, for pages that were deleted (e.g.
+evicted from the page cache), rewrites the whole gallery.
+
+Thumbnails are small static SVGs of the message in ``thumbs/``, loaded
+lazily, so the gallery never runs the LED engine.
+
+To build the manifest for pages that predate it:
+    python gallery.py docs --rebuild
+"""
+import argparse
+import bisect
+import datetime
+import glob
+import hashlib
+import html
+import json
+import os
+import re
+import sys
+
+from page import write_atomic
+
+MANIFEST_NAME = "manifest.jsonl"
+STATE_NAME = ".gallery-state.json"
+THUMBS_DIR = "thumbs"
+PAGE_SIZE = 60
+# Manifest lines are padded to a multiple of this many bytes
+LINE_PADDING = 32
+THUMB_WIDTH = 320
+THUMB_HEIGHT = 180
+
+GALLERY_HTML = '''<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>Winter LED Messages{title_suffix}</title>
+<style>
+body {{ margin: 0; padding: 20px; background: #0a0a1a; color: #ddd; font-family: Arial, sans-serif; }}
+h1 {{ font-size: 1.4em; color: #ff3366; }}
+.grid {{ display: grid; grid-template-columns: repeat(auto-fill, minmax({width}px, 1fr)); gap: 16px; }}
+.card {{ background: #151528; border-radius: 8px; overflow: hidden; text-decoration: none; color: inherit; }}
+.card img {{ display: block; width: 100%; height: auto; aspect-ratio: {width} / {height}; background: #000; }}
+.card span {{ display: block; padding: 6px 10px; font-size: 0.8em; color: #999; }}
+nav {{ margin: 20px 0; display: flex; gap: 16px; }}
+nav a {{ color: #ff3366; }}
+</style>
+</head>
+<body>
+<h1>Winter LED Messages</h1>
+{nav}
+<div class="grid">
+{cards}
+</div>
+{nav}
+</body>
+</html>
+'''
+
+CARD_HTML = ('<a class="card" href="{href}"><img src="{thumb}" alt="{title}" loading="lazy" decoding="async" '
+             'width="{width}" height="{height}"><span>{time}</span></a>')
+
+
+def gallery_page_name(number):
+    """File name of a gallery page; page 0 is index.html"""
+    return "index.html" if number == 0 else f"index-{number + 1}.html"
+
+
+def is_gallery_page(filename):
+    """Whether ``filename`` is one of the names gallery pages are written to"""
+    return re.fullmatch(r"index(-\d+)?\.html", filename) is not None
+
+
+def message_title(message, limit=40):
+    """First non-blank line of a message, shortened for captions"""
+    match = re.search(r"\S[^\n]*", message)
+    if not match:
+        return ""
+    line = match.group().strip()
+    return line if len(line) <= limit else line[:limit - 1] + "…"
+
+
+def page_entry(filepath, message, color, size, digest):
+    """Manifest entry for a page of ``size`` bytes with SHA-256 hex ``digest``"""
+    return {
+        "file": os.path.basename(filepath),
+        "hash": digest[:16],
+        "time": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "color": color,
+        "size": size,
+        "title": message_title(message),
+        "message": message,
+    }
+
+
+def thumbnail_svg(message, color):
+    """A static SVG preview of the message, sized to fit the thumbnail"""
+    # Only the top of very large art is visible at this size anyway
+    lines = message[:65536].split("\n", 16)[:16]
+    columns = max(1, max(len(line) for line in lines))
+    # Monospace glyphs are roughly 0.6em wide
+    font_size = min(THUMB_HEIGHT * 0.8 / len(lines), THUMB_WIDTH * 0.9 / (columns * 0.6), 28)
+    top = (THUMB_HEIGHT - font_size * len(lines)) / 2 + font_size * 0.8
+    text = "".join(
+        f'<tspan x="50%" y="{top + i * font_size:.1f}">{html.escape(line)}</tspan>'
+        for i, line in enumerate(lines)
+    )
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{THUMB_WIDTH}" height="{THUMB_HEIGHT}" '
+        f'viewBox="0 0 {THUMB_WIDTH} {THUMB_HEIGHT}">'
+        f'<rect width="100%" height="100%" fill="#0a0a1a"/>'
+        f'<text fill="{html.escape(color)}" font-family="Courier New, monospace" font-size="{font_size:.1f}" '
+        f'font-weight="bold" text-anchor="middle" xml:space="preserve">{text}</text></svg>'
+    )
+
+
+def _manifest_line(entry):
+    # Padded so a regenerated page's entry, whose title or size may have
+    # grown a little, usually still fits where the old one was
+    line = json.dumps(entry, ensure_ascii=False).encode("utf-8")
+    return line + b" " * (-len(line) % LINE_PADDING) + b"\n"
+
+
+class Gallery:
+    """The manifest and gallery pages of one output directory"""
+
+    def __init__(self, output_dir="docs"):
+        self.output_dir = output_dir
+        self.manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+        self.state_path = os.path.join(output_dir, STATE_NAME)
+
+    def _load_state(self):
+        # The state says where each gallery page starts in the manifest (the
+        # last one still filling up; everything after its offset belongs to
+        # it) and where each page's entry is, so cards can be updated in place
+        if os.path.exists(self.state_path):
+            with open(self.state_path, encoding="utf-8") as f:
+                state = json.load(f)
+            # States written before entries were indexed are rebuilt
+            if "files" in state:
+                return state
+        return None
+
+    def _read_from(self, offset, end=None):
+        if not os.path.exists(self.manifest_path):
+            return []
+        with open(self.manifest_path, "rb") as f:
+            f.seek(offset)
+            return f.readlines() if end is None else f.read(end - offset).splitlines(keepends=True)
+
+    def add(self, entries, replace=False):
+        """Append page_entry() dicts to the manifest and update the gallery.
+
+        The message in each entry is only used for its thumbnail; the
+        manifest stores the short title instead. With ``replace`` (pages
+        that were regenerated under an existing name), the earlier entry for
+        each file is overwritten where it is, so only its gallery page and
+        the last one are rewritten.
+        """
+        entries = list(entries)
+        if not entries:
+            return
+        os.makedirs(os.path.join(self.output_dir, THUMBS_DIR), exist_ok=True)
+        lines = []
+        for entry in entries:
+            message = entry.pop("message", "")
+            thumb = os.path.join(self.output_dir, THUMBS_DIR, f"{entry['hash']}.svg")
+            if not os.path.exists(thumb):
+                write_atomic(thumb, thumbnail_svg(message, entry["color"]).encode("utf-8"))
+            lines.append((entry["file"], _manifest_line(entry)))
+        if replace:
+            lines = self._replace(lines)
+        with open(self.manifest_path, "ab") as f:
+            f.write(b"".join(line for _, line in lines))
+        self.update()
+
+    def _replace(self, lines):
+        """Overwrite the entries of files already listed; returns the lines still to append"""
+        if not os.path.exists(self.manifest_path):
+            return lines
+        state = self._load_state()
+        if state is None:
+            self.update()
+            state = self._load_state()
+        appended, pages, grown = [], set(), set()
+        with open(self.manifest_path, "r+b") as f:
+            for file, line in lines:
+                offset = state["files"].get(file)
+                if offset is None:
+                    appended.append((file, line))
+                    continue
+                f.seek(offset)
+                old = f.readline()
+                if len(line) > len(old):
+                    grown.add(file)
+                    appended.append((file, line))
+                    continue
+                f.seek(offset)
+                f.write(line[:-1].ljust(len(old) - 1) + b"\n")
+                pages.add(bisect.bisect_right(state["starts"], offset) - 1)
+        if grown:
+            # An entry that outgrew its padding moves to the end, which shifts
+            # every later offset: start over from the rewritten manifest
+            self._discard(grown)
+            return appended
+        for number in pages - {state["page"]}:
+            self._write_page(number, self._read_from(state["starts"][number], state["starts"][number + 1]),
+                             has_next=True)
+        return appended
+
+    def remove(self, files):
+        """Take deleted pages out of the manifest and rebuild the gallery if any were listed"""
+        if self._discard(set(files)):
+            self.update()
+
+    def _discard(self, files):
+        # Entries are dropped from anywhere in the manifest, so the page
+        # offsets in the state no longer hold and the next update starts over
+        lines = self._read_from(0)
+        kept = [line for line in lines if json.loads(line)["file"] not in files]
+        if len(kept) == len(lines):
+            return False
+        write_atomic(self.manifest_path, b"".join(kept))
+        if os.path.exists(self.state_path):
+            os.remove(self.state_path)
+        return True
+
+    def update(self):
+        """Rewrite the last gallery page, closing full pages along the way"""
+        state = self._load_state() or {"page": 0, "offset": 0, "starts": [0], "files": {}}
+        lines = self._read_from(state["offset"])
+        offset = state["offset"]
+        for line in lines:
+            state["files"][json.loads(line)["file"]] = offset
+            offset += len(line)
+        while len(lines) > PAGE_SIZE:
+            # The page is full and another one follows: write it with its next link
+            self._write_page(state["page"], lines[:PAGE_SIZE], has_next=True)
+            state["offset"] += sum(len(line) for line in lines[:PAGE_SIZE])
+            state["page"] += 1
+            state["starts"].append(state["offset"])
+            lines = lines[PAGE_SIZE:]
+        self._write_page(state["page"], lines, has_next=False)
+        write_atomic(self.state_path, json.dumps(state).encode("utf-8"))
+        # Pages past the last one are left over from before entries were removed
+        stale = state["page"] + 1
+        while os.path.exists(os.path.join(self.output_dir, gallery_page_name(stale))):
+            os.remove(os.path.join(self.output_dir, gallery_page_name(stale)))
+            stale += 1
+
+    def rebuild(self):
+        """Regenerate every gallery page from the manifest"""
+        if os.path.exists(self.state_path):
+            os.remove(self.state_path)
+        self.update()
+
+    def _write_page(self, number, lines, has_next):
+        # Pages deleted by hand since they were listed are left out
+        entries = [entry for entry in map(json.loads, lines)
+                   if os.path.exists(os.path.join(self.output_dir, entry["file"]))]
+        cards = "\n".join(
+            CARD_HTML.format(
+                href=html.escape(entry["file"]),
+                thumb=f"{THUMBS_DIR}/{entry['hash']}.svg",
+                title=html.escape(entry.get("title", "")),
+                time=html.escape(entry["time"].replace("T", " ")[:16]),
+                width=THUMB_WIDTH,
+                height=THUMB_HEIGHT,
+            )
+            for entry in entries
+        )
+        links = []
+        if number > 0:
+            links.append(f'<a href="{gallery_page_name(number - 1)}">&larr; Previous</a>')
+        if has_next:
+            links.append(f'<a href="{gallery_page_name(number + 1)}">Next &rarr;</a>')
+        content = GALLERY_HTML.format(
+            title_suffix=f" - page {number + 1}" if number else "",
+            nav=f"<nav>{''.join(links)}</nav>" if links else "",
+            cards=cards,
+            width=THUMB_WIDTH,
+            height=THUMB_HEIGHT,
+        )
+        write_atomic(os.path.join(self.output_dir, gallery_page_name(number)), content.encode("utf-8"))
+
+
+def record_page(output_dir, entry, replace=False):
+    """Add one page to the manifest and gallery of ``output_dir``.
+
+    ``replace`` overwrites the earlier entry for the same file, for pages
+    written over an existing one.
+    """
+    Gallery(output_dir).add([entry], replace)
+
+
+def gallery_files(output_dir):
+    """Paths to deploy along with a page so the published gallery matches.
+
+    The manifest, its state and the thumbnails, plus the gallery pages as
+    one git pathspec pattern, so that gallery pages removed since the last
+    deploy are committed as deletions.
+    """
+    paths = [os.path.join(output_dir, name) for name in (MANIFEST_NAME, STATE_NAME, THUMBS_DIR)]
+    paths = [path for path in paths if os.path.exists(path)]
+    if os.path.exists(os.path.join(output_dir, gallery_page_name(0))):
+        paths.append(os.path.join(output_dir, "index*.html"))
+    return paths
+
+
+def scan_pages(output_dir):
+    """Manifest entries for existing message-*.html pages, oldest first"""
+    paths = sorted(glob.glob(os.path.join(output_dir, "message-*.html")), key=os.path.getmtime)
+    for path in paths:
+        with open(path, "rb") as f:
+            data = f.read()
+        text = data.decode("utf-8", errors="replace")
+        message = _embedded_message(text)
+        color = _embedded_color(text)
+        entry = page_entry(path, message, color, len(data), hashlib.sha256(data).hexdigest())
+        entry["time"] = datetime.datetime.fromtimestamp(
+            os.path.getmtime(path), datetime.timezone.utc).isoformat(timespec="seconds")
+        yield entry
+
+
+def page_inputs(path):
+    """The message, color and delay a generated page was rendered with"""
+    with open(path, encoding="utf-8", errors="replace") as f:
+        text = f.read()
+    return {"message": _embedded_message(text), "color": _embedded_color(text), "delay": _embedded_delay(text)}
+
+
+def _embedded_message(text):
+    # Playlist pages start with their first item
+    for marker, first in (("const rawMessage = ", False), ("const ledPlaylist = ", True)):
+        start = text.find(marker)
+        if start == -1:
+            continue
+        try:
+            message, _ = json.JSONDecoder().raw_decode(text, start + len(marker))
+        except json.JSONDecodeError:
+            continue
+        if first and isinstance(message, list) and message and isinstance(message[0], dict):
+            message = message[0].get("message")
+        if isinstance(message, str):
+            return message
+    return ""
+
+
+def _embedded_color(text):
+    # Pages from before page.py inlined the color into the message border
+    for marker in ("--led-color:", "border: 2px solid "):
+        start = text.find(marker)
+        if start != -1:
+            return text[start + len(marker):].split(";", 1)[0].strip()
+    return "#ff3366"
+
+
+def _embedded_delay(text):
+    start = text.find("--led-delay:")
+    if start == -1:
+        return 5
+    try:
+        return float(text[start + len("--led-delay:"):].split("s;", 1)[0])
+    except ValueError:
+        return 5
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maintain the page manifest and gallery of an output directory.")
+    parser.add_argument("output_dir", nargs="?", default="docs", help="directory holding the pages (default: docs)")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="rescan message-*.html into a new manifest, then regenerate every gallery page")
+    args = parser.parse_args(argv)
+
+    gallery = Gallery(args.output_dir)
+    if args.rebuild:
+        if os.path.exists(gallery.manifest_path):
+            os.remove(gallery.manifest_path)
+        if os.path.exists(gallery.state_path):
+            os.remove(gallery.state_path)
+        gallery.add(scan_pages(args.output_dir))
+    else:
+        gallery.rebuild()
+    print(f"gallery written to {os.path.join(args.output_dir, gallery_page_name(0))}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
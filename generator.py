@@ -0,0 +1,156 @@
+"""Headless page generation: the part of the app that writes pages.
+
+Importing this module pulls in no GUI toolkit, so scripts, batch workers
+and servers without a display can use ``create_html_file`` directly and
+start quickly. The Tkinter app lives in gui.py.
+"""
+import os
+
+from cache import normalize_inputs, page_filename, page_key
+from gallery import page_entry, record_page
+from page import (FEATURES, PLAYLIST_DWELL, QUALITY_TIERS, SNOW_COUNT, page_template, page_values, playlist_values,
+                  write_assets, write_chunks)
+
+
+def create_html_file(message, color="#ff3366", delay=5, filename="winter_led.html", output_dir="docs",
+                     shared_assets=False, prebaked_textures=False, cached_scenery=False,
+                     target_fps=None, min_render_scale=0.5, max_render_scale=4.0, quality_tiers=QUALITY_TIERS,
+                     max_fps=None, pause_when_hidden=False, low_power=False, instrument=False,
+                     offscreen=False, snow_count=SNOW_COUNT, snow_speed=1.0, snow_wind=0.0, features=FEATURES,
+                     minify=False, precompress=False, manifest=True):
+    """Create the complete HTML file with LED message
+
+    Passing ``target_fps`` turns on adaptive quality: the page steps its render
+    scale between ``min_render_scale`` and ``max_render_scale`` (multiples of
+    the default resolution) and its snow density through ``quality_tiers``.
+
+    ``max_fps`` caps the render loop (e.g. 15, 30 or 60), ``pause_when_hidden``
+    stops it while the page is not visible, and ``low_power`` moves snow to its
+    own layer and only redraws the scenery when it has visibly changed.
+
+    ``instrument`` records frame times and canvas calls per layer in the page;
+    press "h" for the on-screen HUD and "e" to export a JSON report for
+    ``perfreport.py``.
+
+    ``offscreen`` draws the scene in a Web Worker on an OffscreenCanvas, so
+    the main thread stays free for input and layout; browsers without
+    OffscreenCanvas render on the main thread as before. It cannot be
+    combined with ``low_power`` or ``instrument``.
+
+    ``snow_count`` sets the number of flakes (thousands are fine),
+    ``snow_speed`` multiplies their fall speed and ``snow_wind`` makes them
+    drift sideways, in CSS pixels per second (negative for leftwards). With
+    ``target_fps`` the flake count comes from ``quality_tiers`` instead.
+
+    ``features`` picks the parts of the page to ship, from page.FEATURES:
+    the ``scenery``, tree ``lights`` and ``snow`` drawn on the canvas, the
+    glow and blink ``effects`` of the message box and the ``mobile`` font
+    override. Only their code is emitted; with none of the canvas features
+    the page is a message-only kiosk page with no canvas engine at all.
+
+    ``minify`` strips comments and whitespace from the embedded CSS/JS/HTML,
+    and ``precompress`` writes maximum-compression .gz (and, with the brotli
+    module installed, .br) siblings for static servers.
+
+    ``manifest`` appends the page to ``manifest.jsonl`` in the output
+    directory and updates the ``index.html`` gallery (see gallery.py).
+    """
+
+    filepath, entry, replaced = write_html_file(
+        message,
+        color,
+        delay,
+        filename,
+        output_dir,
+        shared_assets,
+        minify,
+        quality_tiers,
+        precompress,
+        prebaked_textures=prebaked_textures,
+        cached_scenery=cached_scenery,
+        target_fps=target_fps,
+        min_render_scale=min_render_scale,
+        max_render_scale=max_render_scale,
+        max_fps=max_fps,
+        pause_when_hidden=pause_when_hidden,
+        low_power=low_power,
+        instrument=instrument,
+        offscreen=offscreen,
+        snow_count=snow_count,
+        snow_speed=snow_speed,
+        snow_wind=snow_wind,
+        features=features,
+    )
+    if manifest:
+        # A page written over an existing one replaces its gallery card
+        record_page(output_dir, entry, replace=replaced)
+
+    return filepath
+
+
+def write_html_file(message, color, delay, filename, output_dir, shared_assets=False, minify=False,
+                    quality_tiers=QUALITY_TIERS, precompress=False, **engine_options):
+    """Write one page without listing it in the gallery.
+
+    Returns ``(path, entry, replaced)``: the page's manifest entry (see
+    gallery.page_entry) and whether it was written over an existing page,
+    for callers that record many pages in one Gallery.add. The keyword
+    arguments are create_html_file's.
+    """
+    # Ensure the output directory exists
+    os.makedirs(output_dir, exist_ok=True)
+    filepath = os.path.join(output_dir, filename)
+
+    # The template is compiled once per configuration; each page is a slot fill
+    template = page_template(shared_assets, minify, quality_tiers, **engine_options)
+    write_assets(template, output_dir, precompress)
+    replaced = os.path.exists(filepath)
+    # Pages are streamed to disk so very large ascii art never exists as one string
+    size, digest = write_chunks(filepath, template.render_chunks(page_values(message, color, delay)), precompress)
+    return filepath, page_entry(filepath, message, color, size, digest), replaced
+
+
+def create_playlist_file(items, color="#ff3366", delay=5, dwell=PLAYLIST_DWELL, filename="playlist.html",
+                         output_dir="docs", shared_assets=False, quality_tiers=QUALITY_TIERS, minify=False,
+                         precompress=False, manifest=True, **engine_options):
+    """Create one page that rotates through several messages
+
+    ``items`` are messages, or dicts with a ``message`` and optional
+    ``color`` and ``dwell`` (seconds on screen after fading in; default
+    ``dwell``). The page starts the engine and builds its textures once;
+    moving to the next item only swaps the message text and --led-color.
+    Other keyword arguments are the create_html_file engine options.
+    """
+    items = list(items)
+    values = playlist_values(items, color, delay, dwell)
+
+    os.makedirs(output_dir, exist_ok=True)
+    filepath = os.path.join(output_dir, filename)
+    template = page_template(shared_assets, minify, quality_tiers, playlist=True, **engine_options)
+    write_assets(template, output_dir, precompress)
+    existed = os.path.exists(filepath)
+    size, digest = write_chunks(filepath, template.render_chunks(values), precompress)
+    if manifest:
+        # The gallery shows the first message
+        first = items[0] if isinstance(items[0], str) else items[0]["message"]
+        record_page(output_dir, page_entry(filepath, first, values["color"], size, digest), replace=existed)
+
+    return filepath
+
+
+def cached_html_file(cache, message, color="#ff3366", delay=5, **options):
+    """Content-addressed create_html_file; returns ``(path, hit)``.
+
+    The page is named after a hash of its normalised inputs and engine
+    version and written to ``cache.output_dir``. If it already exists, it is
+    returned as is without rendering. ``options`` are create_html_file
+    keyword arguments other than ``filename`` and ``output_dir``.
+    """
+    key = page_key(message, color, delay, **options)
+    path = cache.get(key)
+    if path is not None:
+        return path, True
+    message, color, delay = normalize_inputs(message, color, delay)
+    path = create_html_file(message, color, delay, page_filename(key), cache.output_dir, **options)
+    cache.put(key, path)
+    return path, False
@@ -0,0 +1,368 @@
+"""Tkinter front end for the generator.
+
+Imported by ``automate.main()`` only when the app is started, so the
+generator itself never loads Tk.
+"""
+import tkinter as tk
+from tkinter import colorchooser, filedialog, messagebox
+import os
+import webbrowser
+
+from banner import DEFAULT_FONT, available_fonts, render_banner
+from cache import PageCache
+from deploy import DeployQueue
+from gallery import gallery_files
+from generator import cached_html_file
+from page import center_lines
+from preview import PreviewWriter
+from server import PREVIEW_URL, PreviewServer
+
+
+# Quiet time after the last edit before the preview is re-rendered
+PREVIEW_DEBOUNCE_MS = 300
+# Lines of the message shown in the in-app preview pane
+PREVIEW_LINES = 8
+# How often closing checks whether the workers have finished
+CLOSE_POLL_MS = 100
+
+
+class LEDGeneratorApp:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("🎄 ASCII LED Message Generator")
+        self.root.geometry("700x650")
+        self.root.resizable(False, False)
+
+        self.color = "#ff3366"
+        self.created_file = None
+        self.cache = PageCache()
+
+        self.preview_job = None
+        self.server = None
+        self.preview_writer = PreviewWriter(
+            notify=self.on_preview_written,
+            on_error=lambda error: self.root.after(0, self.on_preview_error, error),
+        )
+
+        self.create_widgets()
+
+        # Git runs on a worker thread; results come back through the Tk event loop
+        self.deployer = DeployQueue(
+            notify=lambda event, payload: self.root.after(0, self.on_deploy_event, event, payload)
+        )
+        self.closing = False
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def on_close(self):
+        """Let queued deploys and the last preview write finish before the window goes away"""
+        if self.closing:
+            return
+        self.closing = True
+        if self.preview_job is not None:
+            self.root.after_cancel(self.preview_job)
+        self.status_label.config(text="Finishing before closing...")
+        # Without a timeout these would block the event loop that the workers report through
+        self.deployer.close(timeout=0)
+        self.preview_writer.close(timeout=0)
+        self.finish_close()
+
+    def finish_close(self):
+        if self.deployer.is_alive() or self.preview_writer.is_alive():
+            self.root.after(CLOSE_POLL_MS, self.finish_close)
+            return
+        if self.server is not None:
+            self.server.stop()
+        self.root.destroy()
+
+    def create_widgets(self):
+        title_frame = tk.Frame(self.root, bg="#2c3e50", height=60)
+        title_frame.pack(fill=tk.X)
+        title_frame.pack_propagate(False)
+
+        title_label = tk.Label(
+            title_frame,
+            text="🎄 ASCII LED Message Generator",
+            font=("Arial", 18, "bold"),
+            bg="#2c3e50",
+            fg="white"
+        )
+        title_label.pack(pady=15)
+
+        main_frame = tk.Frame(self.root, padx=20, pady=20)
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        tk.Label(main_frame, text="Your ASCII Art Message:", font=("Arial", 11, "bold")).pack(anchor=tk.W)
+        tk.Label(main_frame, text="(Enter any ASCII art)", font=("Arial", 9), fg="gray").pack(anchor=tk.W)
+
+        self.message_text = tk.Text(main_frame, height=10, font=("Courier New", 11), wrap=tk.WORD)
+        self.message_text.pack(fill=tk.BOTH, expand=True, pady=(5, 15))
+        self.message_text.insert("1.0", "HAPPY HOLIDAYS")
+        self.message_text.edit_modified(False)
+        self.message_text.bind("<<Modified>>", self.on_message_modified)
+
+        settings_frame = tk.Frame(main_frame)
+        settings_frame.pack(fill=tk.X, pady=(0, 15))
+
+        left_col = tk.Frame(settings_frame)
+        left_col.pack(side=tk.LEFT, fill=tk.X, expand=True)
+
+        color_frame = tk.Frame(left_col)
+        color_frame.pack(fill=tk.X, pady=5)
+        tk.Label(color_frame, text="LED Color:", font=("Arial", 10, "bold")).pack(side=tk.LEFT)
+        self.color_btn = tk.Button(
+            color_frame,
+            text="    ",
+            bg=self.color,
+            width=5,
+            command=self.pick_color
+        )
+        self.color_btn.pack(side=tk.LEFT, padx=10)
+        self.color_label = tk.Label(color_frame, text=self.color, font=("Courier New", 9))
+        self.color_label.pack(side=tk.LEFT)
+
+        delay_frame = tk.Frame(left_col)
+        delay_frame.pack(fill=tk.X, pady=5)
+        tk.Label(delay_frame, text="Delay (seconds):", font=("Arial", 10, "bold")).pack(side=tk.LEFT)
+        self.delay_var = tk.IntVar(value=5)
+        self.delay_slider = tk.Scale(
+            delay_frame,
+            from_=0,
+            to=10,
+            orient=tk.HORIZONTAL,
+            variable=self.delay_var,
+            length=200
+        )
+        self.delay_slider.pack(side=tk.LEFT, padx=10)
+        self.delay_var.trace_add("write", lambda *_: self.schedule_preview())
+
+        right_col = tk.Frame(settings_frame)
+        right_col.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(20, 0))
+
+        image_frame = tk.Frame(right_col)
+        image_frame.pack(fill=tk.X, pady=5)
+        tk.Button(image_frame, text="🖼 Image to ASCII...", command=self.import_image).pack(side=tk.LEFT)
+        tk.Label(image_frame, text="Width:", font=("Arial", 10, "bold")).pack(side=tk.LEFT, padx=(10, 0))
+        self.image_width_var = tk.IntVar(value=80)
+        tk.Spinbox(image_frame, from_=20, to=300, width=4, textvariable=self.image_width_var).pack(side=tk.LEFT, padx=5)
+        self.dither_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(image_frame, text="Dither", variable=self.dither_var).pack(side=tk.LEFT)
+
+        banner_frame = tk.Frame(right_col)
+        banner_frame.pack(fill=tk.X, pady=5)
+        tk.Button(banner_frame, text="🔠 Text to Banner", command=self.insert_banner).pack(side=tk.LEFT)
+        self.banner_var = tk.StringVar(value="HAPPY HOLIDAYS")
+        tk.Entry(banner_frame, textvariable=self.banner_var, width=18).pack(side=tk.LEFT, padx=5)
+        self.font_var = tk.StringVar(value=DEFAULT_FONT)
+        tk.OptionMenu(banner_frame, self.font_var, *available_fonts()).pack(side=tk.LEFT)
+
+        preview_header = tk.Frame(main_frame)
+        preview_header.pack(fill=tk.X)
+        tk.Label(preview_header, text="Live Preview:", font=("Arial", 10, "bold")).pack(side=tk.LEFT)
+        tk.Button(preview_header, text="Open in browser", command=self.open_preview, relief=tk.FLAT,
+                  fg="#3498db", cursor="hand2").pack(side=tk.LEFT, padx=5)
+        self.preview_label = tk.Label(
+            main_frame,
+            font=("Courier New", 8, "bold"),
+            bg="#0a0a1a",
+            fg=self.color,
+            justify=tk.LEFT,
+            height=PREVIEW_LINES
+        )
+        self.preview_label.pack(fill=tk.X, pady=(5, 0))
+
+        button_frame = tk.Frame(main_frame)
+        button_frame.pack(fill=tk.X, pady=(15, 0))
+
+        action_frame = tk.Frame(button_frame)
+        action_frame.pack(side=tk.RIGHT)
+
+        self.generate_btn = tk.Button(
+            action_frame,
+            text="🚀 Generate HTML",
+            command=self.generate_html,
+            bg="#27ae60",
+            fg="white",
+            font=("Arial", 11, "bold"),
+            padx=20,
+            pady=8,
+            cursor="hand2"
+        )
+        self.generate_btn.pack(side=tk.LEFT, padx=5)
+
+        self.open_btn = tk.Button(
+            action_frame,
+            text="🌐 Open in Browser",
+            command=self.open_in_browser,
+            bg="#3498db",
+            fg="white",
+            font=("Arial", 11, "bold"),
+            padx=20,
+            pady=8,
+            cursor="hand2",
+            state=tk.DISABLED
+        )
+        self.open_btn.pack(side=tk.LEFT, padx=5)
+
+        self.deploy_btn = tk.Button(
+            action_frame,
+            text="🚀 Deploy to GitHub",
+            command=self.deploy_to_github,
+            bg="#4a4a4a",
+            fg="white",
+            font=("Arial", 11, "bold"),
+            padx=20,
+            pady=8,
+            cursor="hand2"
+        )
+        self.deploy_btn.pack(side=tk.LEFT, padx=5)
+
+        self.status_label = tk.Label(main_frame, text="", font=("Arial", 9), fg="gray")
+        self.status_label.pack(anchor=tk.W, pady=(10, 0))
+
+        self.schedule_preview()
+
+    def on_message_modified(self, event):
+        # <<Modified>> only fires again once the flag is reset
+        self.message_text.edit_modified(False)
+        self.schedule_preview()
+
+    def schedule_preview(self):
+        """Debounce edits: re-render once input has been quiet for PREVIEW_DEBOUNCE_MS"""
+        if self.preview_job is not None:
+            self.root.after_cancel(self.preview_job)
+        self.preview_job = self.root.after(PREVIEW_DEBOUNCE_MS, self.update_preview)
+
+    def update_preview(self):
+        self.preview_job = None
+        message = self.message_text.get("1.0", tk.END).strip("\n")
+        try:
+            delay = self.delay_var.get()
+        except tk.TclError:
+            return
+        # Center only the visible lines so huge art costs the pane nothing extra
+        head = self.message_text.get("1.0", f"{PREVIEW_LINES}.end").strip("\n")
+        self.preview_label.config(text="\n".join(center_lines(head)), fg=self.color)
+        # The page itself is rendered and written off the Tk thread
+        self.preview_writer.submit(message, self.color, delay)
+
+    def open_preview(self):
+        if self.preview_job is not None:
+            self.root.after_cancel(self.preview_job)
+            self.update_preview()
+        webbrowser.open(self.local_server().url(PREVIEW_URL))
+
+    def on_preview_written(self, path):
+        # Called on the preview thread; notify_reload is thread-safe
+        if self.server is not None:
+            self.server.notify_reload(PREVIEW_URL)
+
+    def on_preview_error(self, error):
+        self.status_label.config(text=f"Preview failed: {error}")
+
+    def local_server(self):
+        """The local preview server for docs/, started on first use"""
+        if self.server is None:
+            self.server = PreviewServer(self.cache.output_dir, aliases={PREVIEW_URL: self.preview_writer.path}).start()
+        return self.server
+
+    def deploy_to_github(self):
+        # First, generate the file.
+        created_file_path = self.generate_html()
+
+        if not created_file_path:
+            # The generate_html method already shows an error, so we can just return.
+            return
+
+        # The page was also added to the gallery, which has to go out with it
+        self.deployer.submit(created_file_path, *gallery_files(self.cache.output_dir))
+        self.status_label.config(text=f"Queued for deploy: {os.path.basename(created_file_path)}")
+
+    def on_deploy_event(self, event, payload):
+        if event == "progress":
+            self.status_label.config(text=payload)
+        elif event == "error":
+            self.status_label.config(text="Deployment failed")
+            messagebox.showerror("Deployment Error", payload)
+        elif payload["commit"] is None:
+            self.status_label.config(text="Nothing new to deploy")
+        else:
+            self.status_label.config(text=f"Deployed {len(payload['files'])} page(s)")
+            urls = payload["urls"]
+            if urls:
+                # Copy URL to clipboard
+                self.root.clipboard_clear()
+                self.root.clipboard_append("\n".join(urls))
+
+                messagebox.showinfo("Success! 🎉", "Deployment successful!\n\nURL: " + "\nURL: ".join(urls) + "\n(Copied to clipboard!)")
+            else:
+                messagebox.showinfo("Success! 🎉", "Deployment to GitHub Pages successful!")
+
+    def pick_color(self):
+        color = colorchooser.askcolor(initialcolor=self.color, title="Choose LED Color")
+        if color[1]:
+            self.color = color[1]
+            self.color_btn.config(bg=self.color)
+            self.color_label.config(text=self.color)
+            self.schedule_preview()
+
+    def import_image(self):
+        path = filedialog.askopenfilename(
+            title="Choose an image",
+            filetypes=[("Images", "*.png *.jpg *.jpeg *.gif *.bmp *.webp"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            # NumPy and Pillow are only needed for this feature
+            from imageart import image_to_ascii
+            art = image_to_ascii(path, self.image_width_var.get(), dither=self.dither_var.get())
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to convert image:\n{str(e)}")
+            return
+        self.message_text.delete("1.0", tk.END)
+        self.message_text.insert("1.0", art)
+
+    def insert_banner(self):
+        text = self.banner_var.get().strip()
+        if not text:
+            messagebox.showwarning("Empty Text", "Please enter some banner text!")
+            return
+        self.message_text.delete("1.0", tk.END)
+        self.message_text.insert("1.0", render_banner(text, self.font_var.get()))
+
+    def generate_html(self):
+        # Only strip blank lines: leading spaces are part of the art
+        message = self.message_text.get("1.0", tk.END).strip("\n")
+
+        if not message.strip():
+            messagebox.showwarning("Empty Message", "Please enter a message!")
+            return None # Return None on failure
+
+        delay = self.delay_var.get()
+
+        try:
+            self.created_file, hit = cached_html_file(self.cache, message, self.color, delay)
+            self.cache.save()
+            filename = os.path.basename(self.created_file)
+
+            messagebox.showinfo(
+                "Already Generated" if hit else "Success! 🎉",
+                f"{'This page already exists' if hit else 'File created successfully!'}\n\n📄 {filename}\n📍 {os.path.abspath(self.created_file)}"
+            )
+
+            self.open_btn.config(state=tk.NORMAL)
+            if self.server is not None and not hit:
+                self.server.notify_reload(self.created_file)
+            return self.created_file # Return the path of the created file
+
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to create file:\n{str(e)}")
+            return None # Return None on failure
+
+    def open_in_browser(self):
+        if self.created_file and os.path.exists(self.created_file):
+            # Served over HTTP so caching, compression and live reload behave as deployed
+            page = os.path.relpath(self.created_file, self.cache.output_dir).replace(os.sep, "/")
+            webbrowser.open(self.local_server().url(page))
+        else:
+            messagebox.showwarning("No File", "Please generate the HTML file first!")
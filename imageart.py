@@ -0,0 +1,101 @@
+"""Image to ASCII art conversion for the message field.
+
+The image is decoded with Pillow, then downsampled, mapped to a character
+ramp and optionally dithered entirely with NumPy array operations.
+Conversions are memoized by image hash and options, so converting the same
+logo again (from the GUI or across a batch) is a dictionary lookup.
+
+Requires NumPy and Pillow.
+"""
+import hashlib
+import io
+from collections import OrderedDict
+
+import numpy as np
+from PIL import Image
+
+# Darkest to brightest; the page draws light text on a dark background
+RAMP = " .:-=+*#%@"
+DEFAULT_WIDTH = 80
+# Character cells are about twice as tall as they are wide
+CHAR_ASPECT = 0.5
+CACHE_SIZE = 64
+
+# 4x4 Bayer matrix, normalised to thresholds in (-0.5, 0.5)
+_BAYER = (np.array([[0, 8, 2, 10], [12, 4, 14, 6], [3, 11, 1, 9], [15, 7, 13, 5]], dtype=np.float32) + 0.5) / 16 - 0.5
+
+_converted = OrderedDict()
+
+
+def _read(source):
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    with open(source, "rb") as f:
+        return f.read()
+
+
+def load_luminance(data, min_width=None):
+    """Decode image bytes to a float32 luminance array in 0..1.
+
+    Transparent pixels count as background (black). With ``min_width`` the
+    image is first shrunk to no less than twice that width (JPEGs already
+    while decoding), since the result is downsampled to it anyway.
+    """
+    image = Image.open(io.BytesIO(data))
+    if min_width and image.format == "JPEG":
+        # DCT scaling: decode at 1/2, 1/4 or 1/8 size, never below what we need
+        image.draft("RGB", (min_width * 2, max(1, min_width * image.height // image.width)))
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA")
+    factor = image.width // (min_width * 2) if min_width else 1
+    if factor > 1:
+        # Integer box reduction in C keeps the float array below small
+        image = image.reduce(factor)
+    rgba = np.asarray(image.convert("RGBA"), dtype=np.float32) / 255
+    # Rec. 709 luma, premultiplied by alpha
+    return (rgba[..., :3] @ np.array([0.2126, 0.7152, 0.0722], dtype=np.float32)) * rgba[..., 3]
+
+
+def downsample(luminance, columns, aspect=CHAR_ASPECT):
+    """Box-filter to ``columns`` wide, with rows corrected for the character aspect"""
+    height, width = luminance.shape
+    columns = max(1, min(columns, width))
+    rows = max(1, min(height, round(height / width * columns * aspect)))
+    # Integer cell edges; reduceat sums each run of pixels between them
+    ys = np.linspace(0, height, rows + 1).astype(np.intp)
+    xs = np.linspace(0, width, columns + 1).astype(np.intp)
+    sums = np.add.reduceat(np.add.reduceat(luminance, ys[:-1], axis=0), xs[:-1], axis=1)
+    return sums / np.outer(np.diff(ys), np.diff(xs))
+
+
+def to_ascii(cells, ramp=RAMP, dither=False, invert=False):
+    """Map a 2-D array of luminance cells to lines of ramp characters"""
+    if invert:
+        cells = 1 - cells
+    levels = len(ramp) - 1
+    scaled = cells * levels
+    if dither:
+        rows, columns = cells.shape
+        scaled = scaled + np.tile(_BAYER, (rows // 4 + 1, columns // 4 + 1))[:rows, :columns]
+    indices = np.clip(np.rint(scaled), 0, levels).astype(np.intp)
+    chars = np.frombuffer(ramp.encode("ascii"), dtype=np.uint8)[indices]
+    # Append a newline column and decode every row in one go
+    newline = np.full((chars.shape[0], 1), ord("\n"), dtype=np.uint8)
+    return np.hstack([chars, newline]).tobytes().decode("ascii")[:-1]
+
+
+def image_to_ascii(source, width=DEFAULT_WIDTH, dither=False, invert=False, ramp=RAMP):
+    """Convert an image (path or bytes) to ASCII art ``width`` characters wide"""
+    data = _read(source)
+    key = (hashlib.sha256(data).hexdigest(), width, bool(dither), bool(invert), ramp)
+    if key in _converted:
+        _converted.move_to_end(key)
+        return _converted[key]
+
+    cells = downsample(load_luminance(data, width), width)
+    art = to_ascii(cells, ramp, dither, invert)
+
+    _converted[key] = art
+    if len(_converted) > CACHE_SIZE:
+        _converted.popitem(last=False)
+    return art
@@ -0,0 +1,144 @@
+"""Conservative minifiers for the generated page.
+
+These only remove comments and whitespace; they never rename or rewrite
+code. The JavaScript minifier understands strings, template literals,
+comments and regular-expression literals, which it tells apart from
+division by the token before the slash. Line breaks are kept wherever
+dropping them could change automatic semicolon insertion.
+"""
+import re
+
+_WORD = re.compile(r"[A-Za-z0-9_$]")
+
+# A line break after these characters can never end a statement
+_JOIN_AFTER = set(";{,([")
+# ...nor before these
+_JOIN_BEFORE = set(")]},;.")
+# A slash after these words starts a regular expression, not a division
+_REGEX_KEYWORDS = {"return", "typeof", "instanceof", "in", "of", "new", "delete", "void", "throw", "case", "do",
+                   "else", "yield", "await"}
+
+
+def _needs_space(prev, nxt):
+    if _WORD.match(prev) and _WORD.match(nxt):
+        return True
+    # Keep `a + +b`, `a - -b` and `a / /b` apart
+    return prev == nxt and prev in "+-/"
+
+
+def _regex_allowed(out):
+    """Whether a slash after the code emitted so far starts a regular expression"""
+    if not out:
+        return True
+    tail = "".join(out[-12:])
+    prev = tail[-1]
+    if prev in ")]\"'`":
+        return False
+    if prev in "+-":
+        # a++ / b
+        return not tail.endswith(prev * 2)
+    word = re.search(r"[A-Za-z0-9_$]+$", tail)
+    return word is None or word.group() in _REGEX_KEYWORDS
+
+
+def minify_js(source):
+    """Strip comments and redundant whitespace from JavaScript"""
+    out = []
+    pending = ""  # whitespace seen since the last emitted code character
+    # Stack of open template literals; each entry is the brace depth of the
+    # `${ ... }` expression currently being scanned inside it
+    templates = []
+    i = 0
+    n = len(source)
+
+    def flush(next_char):
+        nonlocal pending
+        if pending and out:
+            prev = out[-1][-1]
+            if "\n" in pending and prev not in _JOIN_AFTER and next_char not in _JOIN_BEFORE:
+                out.append("\n")
+            elif _needs_space(prev, next_char):
+                out.append(" ")
+        pending = ""
+
+    while i < n:
+        ch = source[i]
+        if ch in " \t\r\n":
+            pending += ch
+            i += 1
+        elif source.startswith("//", i):
+            end = source.find("\n", i)
+            i = n if end == -1 else end
+        elif source.startswith("/*", i):
+            end = source.find("*/", i + 2)
+            i = n if end == -1 else end + 2
+            pending += " "
+        elif ch == "/" and _regex_allowed(out):
+            # Copy the literal verbatim; a slash inside [...] does not end it
+            j = i + 1
+            in_class = False
+            while j < n and source[j] != "\n" and (source[j] != "/" or in_class):
+                if source[j] == "\\":
+                    j += 1
+                elif source[j] == "[":
+                    in_class = True
+                elif source[j] == "]":
+                    in_class = False
+                j += 1
+            while j + 1 < n and _WORD.match(source[j + 1]):
+                j += 1
+            flush(ch)
+            out.append(source[i:j + 1])
+            i = j + 1
+        elif ch in "'\"":
+            j = i + 1
+            while j < n and source[j] != ch:
+                j += 2 if source[j] == "\\" else 1
+            flush(ch)
+            out.append(source[i:j + 1])
+            i = j + 1
+        elif ch == "`" or (ch == "}" and templates and templates[-1] == 0):
+            # Start of a template literal, or the end of a ${ } inside one:
+            # copy literal text verbatim up to the closing ` or the next ${
+            if ch == "`":
+                flush(ch)
+            else:
+                templates.pop()
+            j = i + 1
+            while j < n and source[j] != "`" and not source.startswith("${", j):
+                j += 2 if source[j] == "\\" else 1
+            if source.startswith("${", j):
+                templates.append(0)
+                out.append(source[i:j + 2])
+                i = j + 2
+            else:
+                out.append(source[i:j + 1])
+                i = j + 1
+        else:
+            if templates:
+                if ch == "{":
+                    templates[-1] += 1
+                elif ch == "}":
+                    templates[-1] -= 1
+            flush(ch)
+            out.append(ch)
+            i += 1
+    return "".join(out).strip() + "\n"
+
+
+def minify_css(source):
+    """Strip comments and redundant whitespace from CSS"""
+    source = re.sub(r"/\*.*?\*/", "", source, flags=re.S)
+    source = re.sub(r"\s+", " ", source)
+    # Selectors keep the space before ":" (descendant vs pseudo-class), so only
+    # whitespace around braces, semicolons, commas and after colons is removed
+    source = re.sub(r"\s*([{};,])\s*", r"\1", source)
+    source = re.sub(r":\s+", ":", source)
+    source = source.replace(";}", "}")
+    return source.strip() + "\n"
+
+
+def minify_html(source):
+    """Drop whitespace-only text between tags and line indentation"""
+    source = re.sub(r">\s+<", "><", source)
+    return re.sub(r"\n\s+", "\n", source)
@@ -0,0 +1,1467 @@
+"""Page template for the winter LED message.
+
+The page is split once into static segments and per-message slots
+(``message``, ``color``, ``delay``), so rendering a page is a slot fill
+instead of re-formatting the whole document. The CSS and the canvas engine
+can either be inlined (self-contained page) or written once as
+content-hashed assets under ``<output_dir>/assets`` that every page links to.
+"""
+import gzip
+import hashlib
+import json
+import os
+import re
+from contextlib import ExitStack
+from functools import lru_cache
+
+ASSETS_DIR = "assets"
+
+# Snow flakes per adaptive quality tier, lowest first; pages start in the middle tier
+QUALITY_TIERS = (25, 50, 100, 200, 400)
+# Snow flakes on pages without adaptive quality
+SNOW_COUNT = 100
+# Parts of the page that can be left out; pages get all of them by default
+FEATURES = ("scenery", "lights", "snow", "effects", "mobile")
+# The features drawn on the canvas; a page with none of them has no engine loop
+CANVAS_FEATURES = ("scenery", "lights", "snow")
+# Seconds a playlist message stays up after fading in, unless the item says otherwise
+PLAYLIST_DWELL = 10
+
+_SLOT_RE = re.compile(r"\{\{(\w+)\}\}")
+
+PAGE_CSS = r'''html, body {
+  margin: 0;
+  padding: 0;
+  overflow: hidden;
+}
+
+#led-message {
+  display: flex;
+  flex-direction: column;
+  align-items: center;
+  justify-content: center;
+  gap: 15px; /* Added gap for spacing */
+  position: fixed;
+  top: 50%;
+  left: 50%;
+  transform: translate(-50%, -50%);
+  opacity: 0;
+  animation: fadeIn 2s ease-in var(--led-delay) forwards;
+  background: rgba(0, 0, 0, 0.7);
+  padding: clamp(10px, 1.5vw, 20px);
+  border-radius: 10px;
+  border: 2px solid var(--led-color);
+  overflow: auto;
+  z-index: 1000;
+}
+
+#ascii-art {
+  font-family: 'Courier New', monospace;
+  font-size: clamp(24px, 4vw, 48px);
+  color: var(--led-color);
+  white-space: pre;
+  margin: 0;
+  padding: 0;
+  text-align: left;
+}
+
+#ieee-sub-message {
+  font-family: 'Arial', sans-serif;
+  font-size: 12px;
+  color: rgba(255, 255, 255, 0.7);
+  white-space: nowrap;
+}
+
+@keyframes fadeIn {
+  to { opacity: 1; }
+}
+'''
+
+# Overlay effects: the LED glow and the blinking message box
+EFFECTS_CSS = r'''#led-message {
+  box-shadow:
+    0 0 20px rgba(255, 51, 102, 0.5),
+    inset 0 0 20px rgba(255, 51, 102, 0.2);
+}
+
+#ascii-art {
+  text-shadow:
+    0 0 10px var(--led-color),
+    0 0 20px var(--led-color),
+    0 0 30px var(--led-color),
+    0 0 40px var(--led-color);
+}
+
+@keyframes blink {
+  0%, 100% { opacity: 1; }
+  50% { opacity: 0.7; }
+}
+
+.blink {
+  animation: blink 2s infinite;
+}
+'''
+
+# Pages without a canvas engine get the sky color as a plain background
+STATIC_BACKGROUND_CSS = r'''body {
+  background: hsl(204deg 67% 44%);
+}
+'''
+
+# The engine expects a global `rawMessage` defined by the page before it runs.
+ENGINE_SETUP_JS = r'''const c = document.querySelector("#c");
+let ctx = c.getContext("2d");
+const dpr = 0.5;
+c.width = window.innerWidth * dpr;
+c.height = window.innerHeight * dpr;
+c.style.width = "100vw";
+c.style.height = "100vh";
+c.style.imageRendering = "pixelated";
+
+// Scene geometry is in dpr units; renderScale only changes the backing resolution
+const sceneWidth = c.width;
+const sceneHeight = c.height;
+let renderScale = 1;
+
+const setRenderScale = (scale) => {
+  renderScale = scale;
+  c.width = Math.round(sceneWidth * scale);
+  c.height = Math.round(sceneHeight * scale);
+};
+
+const resetView = () => {
+  ctx.setTransform(renderScale, 0, 0, renderScale, 0, 0);
+};
+
+const palette = [
+  "#65dcf3",
+  "hsl(204deg 67% 44%)",
+  "#4ca7df",
+  "#367cb1",
+  "#286097"
+];
+
+const lights = [
+  "hsl(323deg, 78%, 75%)",
+  "hsl(42deg, 61%, 75%)",
+  "hsl(143deg, 61%, 75%)"
+];
+
+const bgGradient = ctx.createLinearGradient(0, 0, 0, sceneHeight);
+bgGradient.addColorStop(0, palette[1]);
+bgGradient.addColorStop(1, palette[1]);
+
+const sectionHeight = 600 * dpr;
+const width = sceneWidth;
+const height = 300 * dpr;
+const sectionCount = 3;
+
+const scrollOffset = (time) => {
+  return (time / 100 / dpr) % (sectionHeight * 2);
+};
+'''
+
+# Scenery: the isometric buildings, windows and icicles. Drawing helpers first;
+# the sprites and the per-section drawing follow in the texture and scene chunks.
+SCENERY_SETUP_JS = r'''const windows = [
+  ["#286097", "#1f4c7d"],
+  ["#286097", "#1f4c7d"],
+  ["#286097", "#1f4c7d"],
+  ["#286097", "#1f4c7d"],
+  ["#e087a7", "#c172ab"],
+  ["#5fb7e7", "#4aa2d4"],
+  ["#7ad2a1", "#4ea695"]
+];
+
+const getScreenCoords = (left, x, y) => {
+  return [x, Math.floor(left ? y + (x / sceneWidth) * height : y + (1 - x / sceneWidth) * height)];
+};
+
+const levels = 7;
+const levelHeight = height / (levels + 1);
+const levelWidth = levelHeight * (3.6 / 3.0);
+const windowHeight = levelHeight * (1.5 / 3.0);
+const windowWidth = windowHeight * (2.4 / 1.5);
+const windowLeftPadding = (levelWidth - windowWidth) / 2;
+const windowTopPadding = (levelHeight - windowHeight) / 2;
+const colls = Math.ceil(sceneWidth / levelWidth);
+
+const drawGradientRhombus = (left, x, y, width, height, colorFrom, colorTo) => {
+  const ratio = height / width / (Math.PI * 2);
+  const gradientCoords = [
+    ...getScreenCoords(left, x + width * (left ? 0.5 + ratio : 0.5 - ratio), y),
+    ...getScreenCoords(left, x + width * (left ? 0.5 - ratio : 0.5 + ratio), y + height)
+  ];
+  const houseLeftGradient = ctx.createLinearGradient(...gradientCoords);
+  houseLeftGradient.addColorStop(0, colorFrom);
+  houseLeftGradient.addColorStop(1, colorTo);
+  ctx.fillStyle = houseLeftGradient;
+  ctx.beginPath();
+  ctx.moveTo(...getScreenCoords(left, x, y));
+  ctx.lineTo(...getScreenCoords(left, x, y + height));
+  ctx.lineTo(...getScreenCoords(left, x + width, y + height));
+  ctx.lineTo(...getScreenCoords(left, x + width, y));
+  ctx.closePath();
+  ctx.fill();
+};
+
+const drawWindow = (left, x, y, colors) => {
+  ctx.strokeStyle = palette[3];
+  drawGradientRhombus(left, x, y, windowWidth, windowHeight, ...colors);
+  ctx.stroke();
+  ctx.strokeStyle = palette[3];
+  ctx.beginPath();
+  ctx.moveTo(...getScreenCoords(left, x + windowWidth * 0.3, y));
+  ctx.lineTo(...getScreenCoords(left, x + windowWidth * 0.3, y + windowHeight));
+  ctx.stroke();
+  ctx.beginPath();
+  ctx.moveTo(...getScreenCoords(left, x + windowWidth * 0.7, y));
+  ctx.lineTo(...getScreenCoords(left, x + windowWidth * 0.7, y + windowHeight));
+  ctx.stroke();
+};
+
+const drawPadik = (left, x, y, colors) => {
+  drawGradientRhombus(left, x - windowLeftPadding, y - windowTopPadding, levelWidth, levelHeight, palette[3], palette[3]);
+  drawGradientRhombus(left, x, y, windowWidth, windowHeight, palette[4], palette[4]);
+  ctx.strokeStyle = palette[3];
+  ctx.lineWidth = 1;
+  ctx.beginPath();
+  ctx.moveTo(...getScreenCoords(left, x + windowWidth * 0.3, y));
+  ctx.lineTo(...getScreenCoords(left, x + windowWidth * 0.3, y + windowHeight));
+  ctx.stroke();
+  ctx.beginPath();
+  ctx.moveTo(...getScreenCoords(left, x + windowWidth * 0.7, y));
+  ctx.lineTo(...getScreenCoords(left, x + windowWidth * 0.7, y + windowHeight));
+  ctx.stroke();
+  ctx.beginPath();
+  ctx.moveTo(...getScreenCoords(left, x, y + windowHeight * 0.5));
+  ctx.lineTo(...getScreenCoords(left, x + windowWidth, y + windowHeight * 0.5));
+  ctx.stroke();
+  ctx.lineWidth = 1;
+};
+
+const distance = (x1, y1, x2, y2) => {
+  return Math.sqrt((x1 - x2) ** 2 + (y1 - y2) ** 2);
+};
+'''
+
+# Procedural sprites, drawn pixel by pixel at load time
+TEXTURE_JS = r'''const generateTreeTexture = () => {
+  const canvas = document.createElement("canvas");
+  canvas.layerName = "textures";
+  const ctx = canvas.getContext("2d");
+  canvas.width = canvas.height = 300 * dpr;
+  const cx = canvas.width / 2;
+  const cy = canvas.height / 2;
+  for (let y = 0; y < canvas.height; y++) {
+    for (let x = 0; x < canvas.width; x++) {
+      if (distance(x, y, cx, cy) < cx * (0.7 + Math.random() * 0.3)) {
+        const w = Math.random();
+        const h = 1 - y / canvas.height;
+        ctx.fillStyle = `hsl(206deg, 69%, ${30 + w * 70 * h}%)`;
+        ctx.fillRect(x, y, 1, 1);
+      }
+    }
+  }
+  return canvas;
+};
+
+const threeCanvas = generateTreeTexture();
+
+const generateChristmasTreeTexture = () => {
+  const canvas = document.createElement("canvas");
+  canvas.layerName = "textures";
+  const ctx = canvas.getContext("2d");
+  canvas.width = 200 * dpr;
+  canvas.height = 300 * dpr;
+
+  function drawTriangle(x1, y1, x2, y2, x3, y3, color) {
+    ctx.beginPath();
+    ctx.moveTo(x1, y1);
+    ctx.lineTo(x1 + (x2 - x1) * 0.5, y1 * 1.15);
+    ctx.lineTo(x2, y2);
+    ctx.lineTo(x3, y3);
+    ctx.closePath();
+    ctx.fillStyle = color;
+    ctx.fill();
+  }
+
+  const baseX = canvas.width / 2;
+  const baseY = canvas.height;
+  const width = canvas.width;
+  const height = canvas.height;
+  const levels = 5;
+
+  for (let i = 0; i < levels; i++) {
+    const levelHeight = height / levels;
+    const levelWidth = width - (i * width) / levels;
+    const topX = baseX;
+    const topY = baseY - (i + 1) * levelHeight;
+    const leftX = baseX - levelWidth / 2;
+    const rightX = baseX + levelWidth / 2;
+    const bottomY = baseY - i * levelHeight;
+
+    const darkColor = `hsl(204deg 67% ${24 + i * 5}%)`;
+    drawTriangle(leftX, bottomY + 2, rightX, bottomY + 2, topX, topY, darkColor);
+
+    const snowColor = `hsl(204deg 67% ${50 + i * 5}%)`;
+    drawTriangle(leftX, bottomY - 2, rightX, bottomY - 2, topX, topY, snowColor);
+  }
+  return canvas;
+};
+
+const christmassThreeCanvas = generateChristmasTreeTexture();
+'''
+
+# Sprites precomputed by textures.py; the {{...}} markers are filled in at compile time
+PREBAKED_TEXTURE_JS = r'''const loadTexture = (src, width, height) => {
+  const image = new Image(width, height);
+  image.src = src;
+  return image;
+};
+
+const threeCanvas = loadTexture("{{threeCanvas}}", {{threeCanvas_width}}, {{threeCanvas_height}});
+const christmassThreeCanvas = loadTexture("{{christmassThreeCanvas}}", {{christmassThreeCanvas_width}}, {{christmassThreeCanvas_height}});
+'''
+
+SCENE_JS = r'''const drawTreesLine = (left, x, y) => {
+  const treesCount = 5;
+  for (let t = -1; t < treesCount; t++) {
+    const [tx, ty] = getScreenCoords(left, x + t * (200 * dpr), left ? y + height : y + height - 20);
+    ctx.drawImage(threeCanvas, tx, ty + Math.sin(tx * 10) * 10 - 10);
+  }
+};
+
+// Everything in a section except the tree lights; it never changes over time
+const drawSectionScenery = (i) => {
+  const y = i * sectionHeight;
+  const x = (sceneWidth - width) / 2;
+
+  drawTreesLine(i % 2, x, y - height - 25);
+  drawGradientRhombus(i % 2, x, y - height / 3, sceneWidth, height / 3, palette[2], palette[0]);
+  drawGradientRhombus(i % 2, x, y, sceneWidth, height, palette[2], palette[3]);
+
+  for (let row = 0.5; row < levels; row++) {
+    for (let col = 0; col < colls; col++) {
+      const random = () => {
+        return Math.abs(Math.sin(i) + Math.cos(row) + Math.sin(col)) % 1;
+      };
+
+      const colors = windows[Math.floor(random() * windows.length) % windows.length];
+      const left = col * levelWidth + windowLeftPadding + x;
+      const top = row * levelHeight + windowTopPadding + y;
+
+      if (i % 2 === 0 && col % 6 < 2) {
+        drawPadik(i % 2, left, top, ["red", "red"]);
+      } else {
+        drawWindow(i % 2, left, top, colors);
+      }
+    }
+  }
+
+  ctx.strokeStyle = palette[4];
+  for (let col = 0; col < colls; col++) {
+    ctx.beginPath();
+    ctx.moveTo(...getScreenCoords(i % 2, col * levelWidth + x, y));
+    ctx.lineTo(...getScreenCoords(i % 2, col * levelWidth + x, y + height));
+    ctx.stroke();
+  }
+
+  ctx.beginPath();
+  ctx.moveTo(...getScreenCoords(i % 2, 0, y));
+  ctx.lineTo(...getScreenCoords(i % 2, sceneWidth, y));
+  ctx.stroke();
+
+  ctx.beginPath();
+  ctx.moveTo(...getScreenCoords(i % 2, 0, y + 1));
+  ctx.lineTo(...getScreenCoords(i % 2, sceneWidth, y + 1));
+  ctx.stroke();
+
+  for (let row = 0.5; row < levels + 1; row++) {
+    ctx.beginPath();
+    ctx.moveTo(...getScreenCoords(i % 2, 0, row * levelHeight + y));
+    ctx.lineTo(...getScreenCoords(i % 2, sceneWidth, row * levelHeight + y));
+    ctx.stroke();
+  }
+
+  const iciclesCount = sceneWidth / 3;
+  ctx.fillStyle = palette[0];
+  ctx.beginPath();
+  ctx.moveTo(...getScreenCoords(i % 2, x, y - 1));
+  for (let j = 0; j < iciclesCount; j++) {
+    ctx.lineTo(...getScreenCoords(i % 2, x + j * 3, y + 10 * Math.abs(Math.sin(j) * Math.sin(j / 10))));
+    ctx.lineTo(...getScreenCoords(i % 2, x + j * 3 + 3, y));
+  }
+  ctx.fill();
+
+  drawTreesLine(i % 2, x, y);
+
+  const ct_x = i % 2 ? x + 5 : x + width - 55;
+  const ct_y = y + 100;
+  ctx.drawImage(christmassThreeCanvas, ct_x, ct_y);
+};
+'''
+
+# Tree lights: a zigzag over each Christmas tree that changes color every second
+LIGHTS_JS = r'''// The width of the Christmas tree sprite; the lights work without the scenery
+const christmasTreeWidth = 200 * dpr;
+
+const drawSectionLights = (i, time) => {
+  const y = i * sectionHeight;
+  const x = (sceneWidth - width) / 2;
+  const ct_x = i % 2 ? x + 5 : x + width - 55;
+  const ct_y = y + 100;
+  const ct_c = ct_x + (christmasTreeWidth / 2);
+
+  ctx.strokeStyle = lights[Math.floor(time / 1000) % lights.length];
+  ctx.beginPath();
+  ctx.moveTo(ct_c, ct_y);
+  ctx.lineTo(ct_c - 5, ct_y + 7);
+  ctx.lineTo(ct_c, ct_y + 14);
+  ctx.lineTo(ct_c + 5, ct_y + 15);
+  ctx.lineTo(ct_c, ct_y + 22);
+  ctx.lineTo(ct_c - 8, ct_y + 25);
+  ctx.lineTo(ct_c, ct_y + 32);
+  ctx.lineTo(ct_c + 8, ct_y + 35);
+  ctx.lineTo(ct_c, ct_y + 43);
+  ctx.lineTo(ct_c - 14, ct_y + 45);
+  ctx.lineTo(ct_c, ct_y + 53);
+  ctx.lineTo(ct_c + 14, ct_y + 55);
+  ctx.lineTo(ct_c, ct_y + 62);
+  ctx.lineTo(ct_c - 18, ct_y + 56);
+  ctx.stroke();
+};
+'''
+
+# Snow is a particle system with its state in typed arrays, one array per
+# field: positions are fractions of the scene size, so wrap-around is one
+# comparison and resizes need no rescaling. Each frame integrates every flake
+# with the elapsed time (one Math.cos call for the shared sway) and draws them
+# all as a single path with one fill.
+SNOW_JS = r'''let snowCount = {{snow_count}};
+const snowSpeed = {{snow_speed}};
+// CSS pixels per second, positive to the right
+const snowWind = {{snow_wind}};
+const snow = {
+  capacity: 0,
+  x: new Float32Array(0),
+  y: new Float32Array(0),
+  fall: new Float32Array(0),
+  sway: new Float32Array(0),
+  lastTime: null,
+};
+
+// Hash noise rather than Math.random, so raster.py can place the same flakes
+const snowNoise = (i, k) => {
+  const s = Math.sin(i * 12.9898 + k * 78.233) * 43758.5453;
+  return s - Math.floor(s);
+};
+
+const growSnow = (count) => {
+  const grow = (old) => {
+    const array = new Float32Array(count);
+    array.set(old);
+    return array;
+  };
+  snow.x = grow(snow.x);
+  snow.y = grow(snow.y);
+  snow.fall = grow(snow.fall);
+  snow.sway = grow(snow.sway);
+  for (let i = snow.capacity; i < count; i++) {
+    snow.x[i] = snowNoise(i, 1);
+    snow.y[i] = snowNoise(i, 2);
+    // Scene heights per millisecond: between 6 and 2 seconds per screen
+    snow.fall[i] = (1 + 2 * snowNoise(i, 3)) / 6000;
+    // Peak sideways drift, in scene widths
+    snow.sway[i] = 0.05 * (2 * snowNoise(i, 4) - 1);
+  }
+  snow.capacity = count;
+};
+
+const drawSnow = (time) => {
+  if (snowCount > snow.capacity) {
+    growSnow(snowCount);
+  }
+  // Long gaps (hidden tab, first frame) do not teleport the flakes
+  const dt = snow.lastTime === null ? 0 : Math.min(Math.max(time - snow.lastTime, 0), 100);
+  snow.lastTime = time;
+  const fall = snowSpeed * dt;
+  const wind = snowWind * dpr / 1000 / sceneWidth * dt;
+  const sway = Math.cos(time / 600) / 600 * dt;
+  const { x, y } = snow;
+  const fallRates = snow.fall;
+  const swayRates = snow.sway;
+  ctx.fillStyle = "white";
+  ctx.beginPath();
+  for (let i = 0; i < snowCount; i++) {
+    let fx = x[i] + wind + swayRates[i] * sway;
+    let fy = y[i] + fallRates[i] * fall;
+    if (fx < 0 || fx >= 1) fx -= Math.floor(fx);
+    if (fy >= 1) fy -= Math.floor(fy);
+    x[i] = fx;
+    y[i] = fy;
+    ctx.rect(fx * sceneWidth, fy * sceneHeight, 2, 2);
+  }
+  ctx.fill();
+};
+'''
+
+MESSAGE_JS = r'''const asciiElement = document.querySelector('#ascii-art');
+
+// page.py has already padded the lines to center the ascii art
+asciiElement.textContent = rawMessage;
+'''
+
+MOBILE_JS = r'''// Mobile specific adjustments
+if (window.innerWidth <= 768) {
+    document.querySelector('#ascii-art').style.fontSize = '5vw';
+}
+'''
+
+# Stand-ins for disabled features, so the renderers need no feature checks
+NO_SCENERY_JS = r'''const drawSectionScenery = (i) => {};
+'''
+
+NO_LIGHTS_JS = r'''const drawSectionLights = (i, time) => {};
+'''
+
+NO_SNOW_JS = r'''let snowCount = 0;
+const drawSnow = (time) => {};
+'''
+
+# Playlist pages rotate the message box through `ledPlaylist` while the engine
+# keeps running; each item fades in like the first and stays for its dwell time
+PLAYLIST_JS = r'''const ledMessageBox = document.querySelector("#led-message");
+const ledRoot = document.documentElement;
+let playlistIndex = 0;
+
+const showPlaylistItem = (index) => {
+  const item = ledPlaylist[index];
+  asciiElement.textContent = item.message;
+  ledRoot.style.setProperty("--led-color", item.color);
+};
+
+const advancePlaylist = () => {
+  playlistIndex = (playlistIndex + 1) % ledPlaylist.length;
+  showPlaylistItem(playlistIndex);
+  // Replay the fade-in, this time without the initial delay
+  ledRoot.style.setProperty("--led-delay", "0s");
+  ledMessageBox.style.animation = "none";
+  void ledMessageBox.offsetWidth;
+  ledMessageBox.style.animation = "";
+  setTimeout(advancePlaylist, (2 + ledPlaylist[playlistIndex].dwell) * 1000);
+};
+
+showPlaylistItem(0);
+if (ledPlaylist.length > 1) {
+  const initialDelay = parseFloat(getComputedStyle(ledRoot).getPropertyValue("--led-delay")) || 0;
+  setTimeout(advancePlaylist, (initialDelay + 2 + ledPlaylist[0].dwell) * 1000);
+}
+'''
+
+# Immediate mode: every section is redrawn from scratch on every frame
+RENDER_JS = r'''const renderScenery = (time) => {
+  resetView();
+  ctx.fillStyle = bgGradient;
+  ctx.fillRect(0, 0, sceneWidth, sceneHeight);
+  ctx.translate(0, scrollOffset(time));
+
+  for (let i = -2; i < sectionCount * 2; i++) {
+    drawSectionScenery(i);
+    drawSectionLights(i, time);
+  }
+};
+'''
+
+# Cached mode: the static scenery (background included) is drawn once into an
+# offscreen canvas covering every scroll position; each frame is one drawImage
+# plus the tree lights and snow on top.
+CACHED_RENDER_JS = r'''const sceneryTop = -2 * sectionHeight;
+let sceneryLayer = null;
+
+const buildSceneryLayer = () => {
+  const layer = document.createElement("canvas");
+  layer.layerName = "scenery-cache";
+  layer.width = Math.round(sceneWidth * renderScale);
+  layer.height = Math.round((sceneHeight - sceneryTop) * renderScale);
+  layer.renderScale = renderScale;
+  const screenCtx = ctx;
+  ctx = layer.getContext("2d", { alpha: false });
+  resetView();
+  ctx.fillStyle = bgGradient;
+  ctx.fillRect(0, 0, sceneWidth, sceneHeight - sceneryTop);
+  ctx.translate(0, -sceneryTop);
+  for (let i = -2; i < sectionCount * 2; i++) {
+    drawSectionScenery(i);
+  }
+  ctx = screenCtx;
+  return layer;
+};
+
+const renderScenery = (time) => {
+  // Rebuilt lazily, and again whenever the render scale changes
+  if (!sceneryLayer || sceneryLayer.renderScale !== renderScale) {
+    sceneryLayer = buildSceneryLayer();
+  }
+  resetView();
+  ctx.translate(0, scrollOffset(time));
+  ctx.drawImage(sceneryLayer, 0, sceneryTop, sceneWidth, sceneHeight - sceneryTop);
+
+  for (let i = -2; i < sectionCount * 2; i++) {
+    drawSectionLights(i, time);
+  }
+};
+'''
+
+FRAME_JS = r'''const renderFrame = (time) => {
+  renderScenery(time);
+  resetView();
+  drawSnow(time);
+};
+'''
+
+# Low power: snow moves on its own overlay canvas, and the scenery canvas is only
+# redrawn when the scroll has moved a whole pixel or the tree lights change color
+LOW_POWER_FRAME_JS = r'''const snowCanvas = document.createElement("canvas");
+snowCanvas.layerName = "snow";
+snowCanvas.style.cssText = "position: fixed; top: 0; left: 0; width: 100vw; height: 100vh; pointer-events: none; image-rendering: pixelated;";
+document.body.appendChild(snowCanvas);
+const snowCtx = snowCanvas.getContext("2d");
+let lastSceneryKey = null;
+
+const renderFrame = (time) => {
+  const sceneryKey = [
+    Math.round(scrollOffset(time) * renderScale),
+    Math.floor(time / 1000) % lights.length,
+    renderScale
+  ].join();
+  if (sceneryKey !== lastSceneryKey) {
+    lastSceneryKey = sceneryKey;
+    renderScenery(time);
+  }
+
+  if (snowCanvas.width !== c.width || snowCanvas.height !== c.height) {
+    snowCanvas.width = c.width;
+    snowCanvas.height = c.height;
+  }
+  const screenCtx = ctx;
+  ctx = snowCtx;
+  ctx.clearRect(0, 0, snowCanvas.width, snowCanvas.height);
+  resetView();
+  drawSnow(time);
+  ctx = screenCtx;
+};
+'''
+
+# Adaptive quality: every sample window, compares frame times against the target
+# and steps the render scale and snow density; thresholds and a cooldown give
+# hysteresis so the page does not oscillate between levels
+ADAPTIVE_JS = r'''const quality = {
+  targetFrameTime: 1000 / {{target_fps}},
+  minScale: {{min_render_scale}},
+  maxScale: Math.max({{min_render_scale}}, Math.min({{max_render_scale}}, (window.devicePixelRatio || 1) / dpr)),
+  tiers: [{{quality_tiers}}],
+  tier: {{start_tier}},
+  sampleFrames: 30,
+  frames: 0,
+  intervalTotal: 0,
+  workTotal: 0,
+  lastTime: null,
+  goodWindows: 0,
+  cooldown: 0,
+};
+
+const stepQuality = (direction) => {
+  const scale = renderScale;
+  if (direction < 0) {
+    // Shed resolution first, then effects
+    if (scale > quality.minScale) {
+      setRenderScale(Math.max(quality.minScale, Math.round(scale * 80) / 100));
+    } else if (quality.tier > 0) {
+      quality.tier--;
+    } else {
+      return;
+    }
+  } else {
+    // Restore in reverse order: effects first, then resolution
+    if (quality.tier < quality.tiers.length - 1) {
+      quality.tier++;
+    } else if (scale < quality.maxScale) {
+      setRenderScale(Math.min(quality.maxScale, Math.round(scale * 125) / 100));
+    } else {
+      return;
+    }
+  }
+  snowCount = quality.tiers[quality.tier];
+  quality.cooldown = 2;
+};
+
+frameHooks.push((time, workTime) => {
+  const interval = quality.lastTime === null ? 0 : time - quality.lastTime;
+  quality.lastTime = time;
+  // Ignore gaps from hidden tabs and the first frame
+  if (interval <= 0 || interval > 250) {
+    return;
+  }
+  quality.frames++;
+  quality.intervalTotal += interval;
+  quality.workTotal += workTime;
+  if (quality.frames < quality.sampleFrames) {
+    return;
+  }
+
+  const avgInterval = quality.intervalTotal / quality.frames;
+  const avgWork = quality.workTotal / quality.frames;
+  quality.frames = quality.intervalTotal = quality.workTotal = 0;
+  if (quality.cooldown > 0) {
+    quality.cooldown--;
+    return;
+  }
+
+  if (avgInterval > quality.targetFrameTime * 1.15) {
+    quality.goodWindows = 0;
+    stepQuality(-1);
+  } else if (avgWork < quality.targetFrameTime * 0.5 && avgInterval < quality.targetFrameTime * 1.05) {
+    // Upgrades need two good windows in a row
+    if (++quality.goodWindows >= 2) {
+      quality.goodWindows = 0;
+      stepQuality(1);
+    }
+  } else {
+    quality.goodWindows = 0;
+  }
+});
+
+snowCount = quality.tiers[quality.tier];
+setRenderScale(Math.min(Math.max(1, quality.minScale), quality.maxScale));
+'''
+
+# Offscreen mode: the engine chunks are wrapped in `ledEngine` and, where the
+# browser supports it, run in a Web Worker that draws into the transferred #c
+# canvas. The worker gets small stand-ins for the DOM globals the engine uses
+# (`document`, `window`, `Image`), so the same engine source runs on either
+# thread and the main thread only keeps the LED overlay.
+OFFSCREEN_WORKER_JS = r'''const ledWorkerMain = () => {
+  const visibilityListeners = [];
+  let hidden = false;
+  let host = null;
+  // Engine code sets canvas.style; offscreen canvases have none
+  const withStyle = (canvas) => {
+    canvas.style = {};
+    return canvas;
+  };
+
+  self.window = self;
+  self.document = {
+    querySelector: () => host.canvas,
+    createElement: () => withStyle(new OffscreenCanvas(300, 150)),
+    get hidden() {
+      return hidden;
+    },
+    addEventListener: (type, listener) => {
+      if (type === "visibilitychange") {
+        visibilityListeners.push(listener);
+      }
+    },
+  };
+  // Sprites load through fetch + createImageBitmap and are copied into an
+  // OffscreenCanvas, which drawImage accepts like an image
+  self.Image = function (width, height) {
+    const canvas = new OffscreenCanvas(width, height);
+    let ready = Promise.resolve();
+    Object.defineProperty(canvas, "src", {
+      set(src) {
+        ready = fetch(new URL(src, host.baseUrl))
+          .then(response => response.blob())
+          .then(blob => createImageBitmap(blob))
+          .then(bitmap => canvas.getContext("2d").drawImage(bitmap, 0, 0));
+      },
+    });
+    canvas.decode = () => ready;
+    return canvas;
+  };
+  if (!self.requestAnimationFrame) {
+    self.requestAnimationFrame = (callback) => setTimeout(() => callback(performance.now()), 1000 / 60);
+  }
+
+  self.onmessage = (event) => {
+    const data = event.data;
+    hidden = data.hidden;
+    if (host) {
+      visibilityListeners.forEach(listener => listener());
+      return;
+    }
+    host = data;
+    withStyle(host.canvas);
+    self.innerWidth = host.width;
+    self.innerHeight = host.height;
+    self.devicePixelRatio = host.devicePixelRatio;
+    ledEngine();
+  };
+};
+'''
+
+# Hand the canvas to a worker when the browser can; otherwise run the engine here
+OFFSCREEN_START_JS = r'''const startEngine = () => {
+  const c = document.querySelector("#c");
+  if (!c.transferControlToOffscreen || !window.Worker || !window.OffscreenCanvas) {
+    ledEngine();
+    return;
+  }
+  let worker;
+  try {
+    const source = `const ledEngine = ${ledEngine};\n(${ledWorkerMain})();\n`;
+    worker = new Worker(URL.createObjectURL(new Blob([source], { type: "text/javascript" })));
+  } catch (error) {
+    // e.g. a Content-Security-Policy without blob: workers
+    ledEngine();
+    return;
+  }
+  c.style.width = "100vw";
+  c.style.height = "100vh";
+  c.style.imageRendering = "pixelated";
+  const canvas = c.transferControlToOffscreen();
+  worker.postMessage({
+    canvas: canvas,
+    width: window.innerWidth,
+    height: window.innerHeight,
+    devicePixelRatio: window.devicePixelRatio || 1,
+    hidden: document.hidden,
+    baseUrl: location.href,
+  }, [canvas]);
+  document.addEventListener("visibilitychange", () => worker.postMessage({ hidden: document.hidden }));
+};
+
+startEngine();
+'''
+
+# Hooks run after every frame with the timestamp and the milliseconds spent drawing it.
+# A frameInterval of 0 draws on every animation frame.
+LOOP_JS = r'''const frameHooks = [];
+const frameInterval = {{frame_interval}};
+const pauseWhenHidden = {{pause_when_hidden}};
+let lastFrameTime = null;
+let paused = false;
+
+const animate = (time) => {
+  if (pauseWhenHidden && document.hidden) {
+    paused = true;
+    return;
+  }
+  requestAnimationFrame(animate);
+  if (frameInterval && lastFrameTime !== null) {
+    const elapsed = time - lastFrameTime;
+    // 1 ms of slack so a 30 fps cap still lands on every other 60 Hz frame
+    if (elapsed < frameInterval - 1) {
+      return;
+    }
+    lastFrameTime = elapsed > frameInterval ? time - (elapsed % frameInterval) : time;
+  } else {
+    lastFrameTime = time;
+  }
+
+  const start = performance.now();
+  renderFrame(time);
+  const workTime = performance.now() - start;
+  for (const hook of frameHooks) {
+    hook(time, workTime);
+  }
+};
+
+if (pauseWhenHidden) {
+  document.addEventListener("visibilitychange", () => {
+    if (!document.hidden && paused) {
+      paused = false;
+      requestAnimationFrame(animate);
+    }
+  });
+}
+'''
+
+# Instrumentation, part 1: runs before the engine so that startup work is counted.
+# Every 2D context call is tallied against the `layerName` of its canvas ("main"
+# for the visible one).
+INSTRUMENT_SETUP_JS = r'''const ledPerf = {
+  scriptStart: performance.now(),
+  engine: {{engine_options}},
+  startup: { calls: {} },
+  calls: {},
+  frames: [],
+  maxFrames: 3600,
+  nextFrame: 0,
+  marks: {},
+  begin(name) {
+    this.marks[name] = performance.now();
+  },
+  end(name) {
+    this.startup[name] = performance.now() - this.marks[name];
+  },
+};
+
+if (window.CanvasRenderingContext2D) {
+  const proto = CanvasRenderingContext2D.prototype;
+  for (const name of [
+    "fillRect", "strokeRect", "clearRect", "fill", "stroke", "beginPath", "closePath", "moveTo", "lineTo",
+    "arc", "rect", "drawImage", "putImageData", "getImageData", "createLinearGradient", "setTransform",
+    "resetTransform", "translate", "scale", "fillText", "save", "restore"
+  ]) {
+    const original = proto[name];
+    if (!original) {
+      continue;
+    }
+    proto[name] = function (...args) {
+      const layer = this.canvas.layerName || "main";
+      ledPerf.calls[layer] = (ledPerf.calls[layer] || 0) + 1;
+      return original.apply(this, args);
+    };
+  }
+}
+'''
+
+# Instrumentation, part 2: per-frame records, the HUD ("h") and JSON export ("e")
+INSTRUMENT_JS = r'''ledPerf.takeCalls = () => {
+  const calls = ledPerf.calls;
+  ledPerf.calls = {};
+  return calls;
+};
+
+ledPerf.export = () => {
+  const frames = ledPerf.frames.slice(ledPerf.nextFrame).concat(ledPerf.frames.slice(0, ledPerf.nextFrame));
+  const params = new URLSearchParams(location.search);
+  return {
+    version: 1,
+    device: params.get("device") || `${screen.width}x${screen.height}@${window.devicePixelRatio || 1}`,
+    userAgent: navigator.userAgent,
+    viewport: [window.innerWidth, window.innerHeight],
+    engine: ledPerf.engine,
+    startup: ledPerf.startup,
+    frames: frames,
+  };
+};
+
+ledPerf.download = () => {
+  const blob = new Blob([JSON.stringify(ledPerf.export())], { type: "application/json" });
+  const link = document.createElement("a");
+  link.href = URL.createObjectURL(blob);
+  link.download = `led-perf-${Date.now()}.json`;
+  document.body.appendChild(link);
+  link.click();
+  link.remove();
+};
+
+const perfHud = document.createElement("pre");
+perfHud.style.cssText = "position: fixed; top: 8px; left: 8px; margin: 0; padding: 6px 8px; z-index: 2000; font: 11px monospace; color: #fff; background: rgba(0, 0, 0, 0.6); pointer-events: none;";
+perfHud.hidden = !new URLSearchParams(location.search).has("hud");
+document.body.appendChild(perfHud);
+
+let lastPerfTime = null;
+let lastHudUpdate = 0;
+
+frameHooks.push((time, workTime) => {
+  const calls = ledPerf.takeCalls();
+  if (ledPerf.startup.firstFrame === undefined) {
+    ledPerf.startup.firstFrame = performance.now() - ledPerf.scriptStart;
+    ledPerf.startup.calls = calls;
+    lastPerfTime = time;
+    return;
+  }
+  const record = { t: Math.round(time), dt: time - lastPerfTime, ms: workTime, calls: calls };
+  lastPerfTime = time;
+  ledPerf.frames[ledPerf.nextFrame] = record;
+  ledPerf.nextFrame = (ledPerf.nextFrame + 1) % ledPerf.maxFrames;
+
+  if (!perfHud.hidden && time - lastHudUpdate > 500) {
+    lastHudUpdate = time;
+    const recent = ledPerf.frames.filter(frame => frame && frame.t > time - 2000);
+    const times = recent.map(frame => frame.ms).sort((a, b) => a - b);
+    const p95 = times[Math.min(times.length - 1, Math.floor(times.length * 0.95))] || 0;
+    const callTotal = Object.values(calls).reduce((a, b) => a + b, 0);
+    perfHud.textContent = [
+      `fps ${(recent.length / 2).toFixed(0)}  frame ${workTime.toFixed(2)} ms  p95 ${p95.toFixed(2)} ms`,
+      `calls ${callTotal}  ` + Object.entries(calls).map(([layer, count]) => `${layer}:${count}`).join(" "),
+      `scale ${renderScale}  snow ${snowCount}  textures ${(ledPerf.startup.textures || 0).toFixed(1)} ms`,
+      "[h] hide  [e] export"
+    ].join("\n");
+  }
+});
+
+document.addEventListener("keydown", (event) => {
+  if (event.key === "h") {
+    perfHud.hidden = !perfHud.hidden;
+  } else if (event.key === "e") {
+    ledPerf.download();
+  }
+});
+'''
+
+START_JS = r'''animate(0);
+'''
+
+# Start once the sprites are decoded so the first frame already has its trees
+PREBAKED_START_JS = r'''Promise.all([threeCanvas, christmassThreeCanvas].map(image => image.decode().catch(() => {})))
+  .then(() => animate(0));
+'''
+
+PAGE_HEAD = '''<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>Winter Landscape with LED Message</title>
+'''
+
+PAGE_VARS = ''':root {
+  --led-color: {{color}};
+  --led-delay: {{delay}}s;
+}
+'''
+
+PAGE_BODY = '''</head>
+<body>
+<canvas id="c"></canvas>
+<div id="led-message" class="blink">
+    <pre id="ascii-art"></pre>
+    <div id="ieee-sub-message">🎄 Merry Christmas from IEEE NDU 🎄</div>
+</div>
+
+<script>
+const rawMessage = {{message}};
+</script>
+'''
+
+# Left out of pages that have no canvas engine
+CANVAS_TAG = '<canvas id="c"></canvas>\n'
+
+# The first playlist item doubles as the page's message
+PLAYLIST_BODY = PAGE_BODY.replace(
+    "const rawMessage = {{message}};",
+    "const ledPlaylist = {{playlist}};\nconst rawMessage = ledPlaylist[0].message;",
+)
+
+PAGE_TAIL = '''</body>
+</html>'''
+
+
+class PageTemplate:
+    """A page split into static segments and named slots"""
+
+    def __init__(self, source, assets=None):
+        parts = _SLOT_RE.split(source)
+        # re.split alternates text and captured slot names
+        self.segments = tuple(parts[0::2])
+        self.slots = tuple(parts[1::2])
+        self.assets = assets or {}
+        # Identifies the engine build: any change to the page source or its assets changes it
+        digest = hashlib.sha256(source.encode("utf-8"))
+        for name in sorted(self.assets):
+            digest.update(name.encode("utf-8"))
+        self.version = digest.hexdigest()[:16]
+
+    def render_chunks(self, values):
+        """Yield the page in order; a slot value may be a string or an iterable of strings"""
+        yield self.segments[0]
+        for slot, segment in zip(self.slots, self.segments[1:]):
+            value = values[slot]
+            if isinstance(value, str):
+                yield value
+            else:
+                yield from value
+            yield segment
+
+    def render(self, values):
+        return "".join(self.render_chunks(values))
+
+
+def asset_name(kind, content):
+    """Content-hashed file name for a shared asset, e.g. winter-1a2b3c4d5e6f.js"""
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    digest = hashlib.sha256(content).hexdigest()[:12]
+    return f"winter-{digest}.{kind}"
+
+
+def fill_slots(source, values):
+    """Fill compile-time {{markers}} in an engine chunk"""
+    return _SLOT_RE.sub(lambda m: str(values[m.group(1)]), source)
+
+
+def normalize_features(features):
+    """``features`` as a tuple in FEATURES order; raises ValueError for unknown names"""
+    features = set(features)
+    unknown = features - set(FEATURES)
+    if unknown:
+        raise ValueError(f"unknown features: {', '.join(sorted(unknown))} (available: {', '.join(FEATURES)})")
+    return tuple(name for name in FEATURES if name in features)
+
+
+def build_engine(prebaked_textures=False, cached_scenery=False, target_fps=None, min_render_scale=0.5,
+                 max_render_scale=4.0, quality_tiers=QUALITY_TIERS, max_fps=None, pause_when_hidden=False,
+                 low_power=False, instrument=False, offscreen=False, playlist=False, snow_count=SNOW_COUNT,
+                 snow_speed=1.0, snow_wind=0.0, features=FEATURES, assets=None):
+    """Assemble the engine script for one configuration.
+
+    With ``assets`` (a dict), binary resources are added to it and referenced
+    by path; otherwise they are inlined as data URIs.
+
+    ``offscreen`` runs the drawing in a Web Worker on an OffscreenCanvas,
+    falling back to the main thread where that is unavailable. The overlay
+    canvas of ``low_power`` and the DOM hooks of ``instrument`` need the
+    main thread, so neither can be combined with it.
+
+    ``playlist`` adds the message rotation for pages built from
+    ``playlist_values``.
+
+    ``snow_count`` flakes fall at ``snow_speed`` times the default speed and
+    drift ``snow_wind`` CSS pixels per second to the right (negative: left).
+    With ``target_fps`` the count follows ``quality_tiers`` instead.
+
+    Only the chunks for ``features`` are emitted; disabled drawing features
+    are replaced by one-line stand-ins. Without scenery there are no sprites
+    to prebake or scenery to cache, so those two options have no effect.
+    Without any of the canvas features the script is just the message code,
+    and the options that configure the render loop raise ValueError.
+    """
+    features = normalize_features(features)
+    if offscreen and (low_power or instrument):
+        raise ValueError("offscreen cannot be combined with low_power or instrument")
+    if snow_count < 0 or snow_speed < 0:
+        raise ValueError("snow_count and snow_speed must not be negative")
+    message = [MESSAGE_JS, PLAYLIST_JS] if playlist else [MESSAGE_JS]
+    if "mobile" in features:
+        message.insert(1, MOBILE_JS)
+    if not set(features) & set(CANVAS_FEATURES):
+        if target_fps or max_fps or pause_when_hidden or low_power or instrument or offscreen:
+            raise ValueError(f"render loop options need one of the {', '.join(CANVAS_FEATURES)} features")
+        return "\n".join(message)
+    scenery = "scenery" in features
+    prebaked_textures = prebaked_textures and scenery
+    cached_scenery = cached_scenery and scenery
+
+    chunks = [ENGINE_SETUP_JS]
+    if instrument:
+        engine_options = {
+            "prebaked_textures": prebaked_textures,
+            "cached_scenery": cached_scenery,
+            "target_fps": target_fps,
+            "max_fps": max_fps,
+            "pause_when_hidden": pause_when_hidden,
+            "low_power": low_power,
+            "features": list(features),
+        }
+        chunks.insert(0, fill_slots(INSTRUMENT_SETUP_JS, {"engine_options": json.dumps(engine_options)}))
+
+    if scenery:
+        chunks.append(SCENERY_SETUP_JS)
+        if instrument:
+            chunks.append('ledPerf.begin("textures");\n')
+        if prebaked_textures:
+            # NumPy is only needed when textures are baked
+            from textures import png_data_uri, scene_textures
+
+            values = {}
+            for name, (png, width, height) in scene_textures().items():
+                if assets is None:
+                    values[name] = png_data_uri(png)
+                else:
+                    png_name = asset_name("png", png)
+                    assets[png_name] = png
+                    values[name] = f"{ASSETS_DIR}/{png_name}"
+                values[f"{name}_width"] = width
+                values[f"{name}_height"] = height
+            chunks.append(fill_slots(PREBAKED_TEXTURE_JS, values))
+        else:
+            chunks.append(TEXTURE_JS)
+        if instrument:
+            chunks.append('ledPerf.end("textures");\n')
+        chunks.append(SCENE_JS)
+    else:
+        chunks.append(NO_SCENERY_JS)
+    chunks.append(LIGHTS_JS if "lights" in features else NO_LIGHTS_JS)
+    if "snow" in features:
+        chunks.append(fill_slots(SNOW_JS, {
+            "snow_count": int(snow_count),
+            "snow_speed": float(snow_speed),
+            "snow_wind": float(snow_wind),
+        }))
+    else:
+        chunks.append(NO_SNOW_JS)
+    if not offscreen:
+        chunks.extend(message)
+    chunks.append(CACHED_RENDER_JS if cached_scenery else RENDER_JS)
+    chunks.append(LOW_POWER_FRAME_JS if low_power else FRAME_JS)
+    chunks.append(fill_slots(LOOP_JS, {
+        "frame_interval": round(1000 / max_fps, 3) if max_fps else 0,
+        "pause_when_hidden": "true" if pause_when_hidden else "false",
+    }))
+    if target_fps:
+        if not 0 < min_render_scale <= max_render_scale:
+            raise ValueError("render scales must satisfy 0 < min_render_scale <= max_render_scale")
+        if not quality_tiers:
+            raise ValueError("quality_tiers must list at least one snow count")
+        chunks.append(fill_slots(ADAPTIVE_JS, {
+            "target_fps": target_fps,
+            "min_render_scale": min_render_scale,
+            "max_render_scale": max_render_scale,
+            "quality_tiers": ", ".join(str(int(count)) for count in quality_tiers),
+            "start_tier": len(quality_tiers) // 2,
+        }))
+    if instrument:
+        chunks.append(INSTRUMENT_JS)
+    chunks.append(PREBAKED_START_JS if prebaked_textures else START_JS)
+    if offscreen:
+        # Only the message stays outside the function; it needs the DOM
+        engine = "\n".join(chunks)
+        return "\n".join([
+            *message,
+            "const ledEngine = () => {\n" + engine + "};\n",
+            OFFSCREEN_WORKER_JS,
+            OFFSCREEN_START_JS,
+        ])
+    return "\n".join(chunks)
+
+
+@lru_cache(maxsize=None)
+def compile_page(shared_assets=False, minify=False, **engine_options):
+    """Build the page template once per engine configuration.
+
+    ``engine_options`` are passed to ``build_engine`` and must be hashable.
+    With ``minify``, the static parts are minified here, once, so minified
+    pages cost nothing extra to render.
+    """
+    features = engine_options.get("features", FEATURES)
+    css = PAGE_CSS
+    if "effects" in features:
+        css += "\n" + EFFECTS_CSS
+    head, tail = PAGE_HEAD, PAGE_TAIL
+    body = PLAYLIST_BODY if engine_options.get("playlist") else PAGE_BODY
+    if not set(features) & set(CANVAS_FEATURES):
+        css += "\n" + STATIC_BACKGROUND_CSS
+        body = body.replace(CANVAS_TAG, "")
+    assets = {} if shared_assets else None
+    engine = build_engine(assets=assets, **engine_options)
+    page_vars = PAGE_VARS
+    if minify:
+        from minify import minify_css, minify_html, minify_js
+
+        css, page_vars, engine = minify_css(css), minify_css(page_vars), minify_js(engine)
+        head, body, tail = minify_html(head), minify_html(body), minify_html(tail)
+
+    if not shared_assets:
+        source = (
+            head
+            + "<style>\n" + page_vars + "\n" + css + "\n</style>\n"
+            + body
+            + "<script>\n" + engine + "</script>\n"
+            + tail
+        )
+        return PageTemplate(source)
+
+    css_name = asset_name("css", css)
+    js_name = asset_name("js", engine)
+    assets[css_name] = css
+    assets[js_name] = engine
+    source = (
+        head
+        + f'<link rel="stylesheet" href="{ASSETS_DIR}/{css_name}">\n'
+        + "<style>\n" + page_vars + "</style>\n"
+        + body
+        + f'<script src="{ASSETS_DIR}/{js_name}"></script>\n'
+        + tail
+    )
+    return PageTemplate(source, assets)
+
+
+def page_template(shared_assets=False, minify=False, quality_tiers=QUALITY_TIERS, features=FEATURES,
+                  **engine_options):
+    """Compiled template for a set of create_html_file options"""
+    return compile_page(shared_assets, minify, quality_tiers=tuple(quality_tiers),
+                        features=normalize_features(features), **engine_options)
+
+
+def write_atomic(path, data):
+    """Write bytes via a temporary file so readers never see a partial file"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        _remove_quietly(tmp_path)
+        raise
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def write_compressed(path, data):
+    """Write .gz and, if the brotli module is installed, .br siblings of a file.
+
+    Both use maximum compression, for servers with gzip_static/brotli_static.
+    """
+    # mtime=0 keeps the output byte-identical across runs
+    write_atomic(path + ".gz", gzip.compress(data, 9, mtime=0))
+    try:
+        import brotli
+    except ImportError:
+        return
+    write_atomic(path + ".br", brotli.compress(data, quality=11))
+
+
+def write_chunks(path, chunks, precompress=False):
+    """Stream str chunks to ``path`` as UTF-8 without joining them in memory.
+
+    With ``precompress`` the .gz (and .br) siblings are compressed from the
+    same stream. Returns the size and SHA-256 hex digest of the written file.
+    """
+    brotli = None
+    if precompress:
+        try:
+            import brotli
+        except ImportError:
+            pass
+    digest = hashlib.sha256()
+    size = 0
+    tmp_suffix = f".{os.getpid()}.tmp"
+    targets = [path]
+    try:
+        with ExitStack() as stack:
+            out = stack.enter_context(open(path + tmp_suffix, 'wb'))
+            sinks = [out.write]
+            if precompress:
+                targets.append(path + ".gz")
+                gz_file = stack.enter_context(open(path + ".gz" + tmp_suffix, 'wb'))
+                # No file name and mtime=0 keep the output byte-identical across runs
+                gz = stack.enter_context(gzip.GzipFile("", 'wb', 9, gz_file, mtime=0))
+                sinks.append(gz.write)
+            if brotli is not None:
+                targets.append(path + ".br")
+                br_file = stack.enter_context(open(path + ".br" + tmp_suffix, 'wb'))
+                compressor = brotli.Compressor(quality=11)
+                sinks.append(lambda data: br_file.write(compressor.process(data)))
+            for chunk in chunks:
+                data = chunk.encode('utf-8')
+                digest.update(data)
+                size += len(data)
+                for sink in sinks:
+                    sink(data)
+            if brotli is not None:
+                br_file.write(compressor.finish())
+        for target in targets:
+            os.replace(target + tmp_suffix, target)
+    except BaseException:
+        # Never leave a partial page behind to be published
+        for target in targets:
+            _remove_quietly(target + tmp_suffix)
+        raise
+    return size, digest.hexdigest()
+
+
+_written_assets = set()
+
+
+def write_assets(template, output_dir, precompress=False):
+    """Write the template's shared assets into output_dir/assets once"""
+    assets_dir = os.path.join(output_dir, ASSETS_DIR)
+    for name, content in template.assets.items():
+        path = os.path.join(assets_dir, name)
+        if (path, precompress) in _written_assets:
+            continue
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        # Batch workers may race on the same asset; the name is the content hash,
+        # so whichever replace lands last writes identical bytes
+        if not os.path.exists(path):
+            os.makedirs(assets_dir, exist_ok=True)
+            write_atomic(path, content)
+        # Images are already compressed
+        if precompress and not name.endswith(".png") and not os.path.exists(path + ".gz"):
+            write_compressed(path, content)
+        _written_assets.add((path, precompress))
+
+
+def _iter_lines(text):
+    # str.split would hold a second copy of very large art in memory
+    start = 0
+    while True:
+        end = text.find("\n", start)
+        if end == -1:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
+
+
+def center_lines(message):
+    """Left-pad each line so the ascii art is centered on its widest line"""
+    width = max(map(len, _iter_lines(message)))
+    for line in _iter_lines(message):
+        yield " " * ((width - len(line)) // 2) + line
+
+
+def message_literal(message, lines_per_chunk=4096):
+    """The centered message as a JavaScript string literal, in chunks of lines"""
+    parts = ['"']
+    for i, line in enumerate(center_lines(message)):
+        if i:
+            parts.append("\\n")
+            if i % lines_per_chunk == 0:
+                yield "".join(parts)
+                parts = []
+        # JSON escapes the line for JavaScript; "</" must not close the script tag
+        parts.append(json.dumps(line)[1:-1].replace("</", "<\\/"))
+    parts.append('"')
+    yield "".join(parts)
+
+
+def page_values(message, color, delay):
+    """Slot values for a single message; the message is an iterator of chunks"""
+    return {
+        "message": message_literal(message),
+        "color": color,
+        "delay": str(delay),
+    }
+
+
+def playlist_literal(items):
+    """Playlist items as a JavaScript array literal, in chunks"""
+    yield "["
+    for i, item in enumerate(items):
+        yield ',{"message":' if i else '{"message":'
+        yield from message_literal(item["message"])
+        # Colors are user input too; keep them from closing the script tag
+        yield ',"color":' + json.dumps(item["color"]).replace("</", "<\\/") + ',"dwell":' + repr(float(item["dwell"])) + "}"
+    yield "]"
+
+
+def playlist_values(items, color, delay, dwell=PLAYLIST_DWELL):
+    """Slot values for a playlist page.
+
+    ``items`` are messages, or dicts with a ``message`` and optional
+    ``color`` and ``dwell`` (seconds on screen after fading in), which
+    default to ``color`` and ``dwell``.
+    """
+    playlist = []
+    for item in items:
+        item = {"message": item} if isinstance(item, str) else dict(item)
+        item.setdefault("color", color)
+        item.setdefault("dwell", dwell)
+        if float(item["dwell"]) <= 0:
+            raise ValueError("playlist dwell times must be positive")
+        playlist.append(item)
+    if not playlist:
+        raise ValueError("a playlist needs at least one message")
+    return {
+        "playlist": playlist_literal(playlist),
+        "color": playlist[0]["color"],
+        "delay": str(delay),
+    }
+
+
+def render_page(message, color="#ff3366", delay=5, shared_assets=False, minify=False, **engine_options):
+    """Render the full HTML for one message"""
+    template = compile_page(shared_assets, minify, **engine_options)
+    return template.render(page_values(message, color, delay))
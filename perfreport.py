@@ -0,0 +1,126 @@
+"""Aggregate performance exports from instrumented pages.
+
+Pages generated with ``instrument=True`` export a JSON report (press "e" on
+the page). This command reads a directory of those exports and prints
+p50/p95/p99 frame-time tables per device and per engine configuration.
+
+Usage:
+    python perfreport.py exports/ --by device engine
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+from collections import defaultdict
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-pct * len(sorted_values) // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def engine_label(engine):
+    """Short name for an engine configuration, e.g. 'cached_scenery+max_fps=30'"""
+    parts = []
+    for key, value in sorted((engine or {}).items()):
+        if value is True:
+            parts.append(key)
+        elif value not in (None, False, 0):
+            parts.append(f"{key}={value}")
+    return "+".join(parts) or "default"
+
+
+def load_exports(directory):
+    """Yield (path, export) for every JSON export in a directory"""
+    for path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"skipping {path}: {e}", file=sys.stderr)
+            continue
+        if isinstance(data, dict) and "frames" in data:
+            yield path, data
+
+
+def aggregate(exports, by=("device", "engine")):
+    """Group frame records and compute frame-time percentiles per group"""
+    groups = defaultdict(lambda: {"exports": 0, "frame_ms": [], "intervals": [], "calls": 0, "startup": []})
+    for _, data in exports:
+        key_parts = []
+        for field in by:
+            key_parts.append(engine_label(data.get("engine")) if field == "engine" else str(data.get(field, "?")))
+        group = groups[tuple(key_parts)]
+        group["exports"] += 1
+        if "firstFrame" in data.get("startup", {}):
+            group["startup"].append(data["startup"]["firstFrame"])
+        for frame in data["frames"]:
+            group["frame_ms"].append(frame["ms"])
+            if 0 < frame.get("dt", 0) < 250:
+                group["intervals"].append(frame["dt"])
+            group["calls"] += sum(frame.get("calls", {}).values())
+
+    rows = []
+    for key, group in sorted(groups.items()):
+        frame_ms = sorted(group["frame_ms"])
+        intervals = sorted(group["intervals"])
+        startup = sorted(group["startup"])
+        frames = len(frame_ms)
+        median_interval = percentile(intervals, 50)
+        row = {
+            "group": dict(zip(by, key)),
+            "exports": group["exports"],
+            "frames": frames,
+            "fps": 1000 / median_interval if median_interval else 0.0,
+            "calls_per_frame": group["calls"] / frames if frames else 0.0,
+            "first_frame_ms": percentile(startup, 50),
+        }
+        for pct in PERCENTILES:
+            row[f"p{pct}"] = percentile(frame_ms, pct)
+        rows.append(row)
+    return rows
+
+
+def format_table(rows, by):
+    """Render aggregated rows as a plain-text table"""
+    headers = list(by) + ["exports", "frames", "fps"] + [f"p{pct} ms" for pct in PERCENTILES] + ["calls/frame", "startup ms"]
+    lines = []
+    for row in rows:
+        lines.append(
+            [row["group"][field] for field in by]
+            + [str(row["exports"]), str(row["frames"]), f"{row['fps']:.1f}"]
+            + [f"{row[f'p{pct}']:.2f}" for pct in PERCENTILES]
+            + [f"{row['calls_per_frame']:.0f}", f"{row['first_frame_ms']:.0f}"]
+        )
+    widths = [max(len(str(cell)) for cell in column) for column in zip(headers, *lines)]
+    out = []
+    for cells in [headers] + lines:
+        out.append("  ".join(str(cell).ljust(width) for cell, width in zip(cells, widths)).rstrip())
+    out.insert(1, "  ".join("-" * width for width in widths))
+    return "\n".join(out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarise frame-time exports from instrumented LED pages.")
+    parser.add_argument("directory", help="directory of exported JSON reports")
+    parser.add_argument("--by", nargs="+", choices=("device", "engine", "userAgent"), default=["device", "engine"],
+                        help="fields to group by (default: device engine)")
+    parser.add_argument("--json", action="store_true", help="print the table as JSON")
+    args = parser.parse_args(argv)
+
+    rows = aggregate(load_exports(args.directory), args.by)
+    if not rows:
+        print(f"no exports found in {args.directory}", file=sys.stderr)
+        return 1
+    print(json.dumps(rows, indent=2) if args.json else format_table(rows, args.by))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""Live preview page for the GUI.
+
+``PreviewWriter`` keeps one scratch HTML page up to date with the latest
+message, color and delay. Only the slots whose input changed are
+re-rendered (re-centering and escaping the message is the expensive part),
+and the page is rewritten on a worker thread, so the Tk event loop never
+waits on rendering or disk. Submissions that arrive while a write is in
+progress collapse into a single follow-up write of the newest values.
+"""
+import os
+import tempfile
+import threading
+
+from page import compile_page, message_literal, write_atomic
+
+PREVIEW_PATH = os.path.join(tempfile.gettempdir(), "winter-led-preview.html")
+
+
+class PreviewWriter:
+    """Re-renders a single scratch page whenever new inputs are submitted.
+
+    ``notify(path)`` is called from the worker thread after each write, and
+    ``on_error(exception)`` when a write fails; the worker keeps going and
+    writes the next submission as usual.
+    """
+
+    def __init__(self, path=PREVIEW_PATH, notify=None, on_error=None, **engine_options):
+        self.path = path
+        self.notify = notify
+        self.on_error = on_error
+        self.template = compile_page(**engine_options)
+        self._inputs = {}
+        self._values = {}
+        self._pending = None
+        self._stopping = False
+        self._lock = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="preview-worker", daemon=True)
+        self._thread.start()
+
+    def submit(self, message, color, delay):
+        """Schedule a write of the page for these inputs, replacing any pending one"""
+        with self._lock:
+            self._pending = {"message": message, "color": color, "delay": delay}
+            self._lock.notify()
+
+    def close(self, timeout=None):
+        """Finish any pending write, then stop the worker"""
+        with self._lock:
+            self._stopping = True
+            self._lock.notify()
+        self._thread.join(timeout)
+
+    def is_alive(self):
+        """Whether the worker is still running (a closed writer may still be writing)"""
+        return self._thread.is_alive()
+
+    def render(self, inputs):
+        """Page HTML for ``inputs``, reusing the slot values that did not change"""
+        for slot, value in inputs.items():
+            if self._inputs.get(slot) == value and slot in self._values:
+                continue
+            if slot == "message":
+                self._values[slot] = "".join(message_literal(value))
+            else:
+                self._values[slot] = str(value)
+            self._inputs[slot] = value
+        return self.template.render(self._values)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while self._pending is None and not self._stopping:
+                    self._lock.wait()
+                inputs, self._pending = self._pending, None
+                stopping = self._stopping
+            if inputs is not None:
+                try:
+                    write_atomic(self.path, self.render(inputs).encode("utf-8"))
+                except Exception as e:
+                    # One bad submission must not stop the previews that follow
+                    if self.on_error:
+                        self.on_error(e)
+                else:
+                    if self.notify:
+                        self.notify(self.path)
+            if stopping:
+                break
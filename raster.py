@@ -0,0 +1,631 @@
+"""Static PNG frames of a page without a browser.
+
+A NumPy port of what the engine's ``animate`` draws at a given time: the
+gradient building rhombi laid out by ``getScreenCoords``, windows, icicles,
+trees, tree lights and snow, with the LED message box on top in the page's
+color. Used for gallery thumbnails, Open Graph images and no-JS poster
+frames.
+
+Nothing in the scenery depends on time except the scroll offset, so each
+process rasterizes the scenery once per viewport size into a layer tall
+enough for every scroll position (the page's ``cached_scenery`` mode does
+the same). A frame is a crop of that layer plus the lights, snow and
+message. Strokes are 1px and unantialiased, and the message is drawn as one
+block per character cell, shaded by how much ink the character has; it is
+a preview, not a pixel-exact screenshot.
+
+Usage:
+    python raster.py docs --size og -j 8
+
+Requires NumPy.
+"""
+import argparse
+import json
+import math
+import os
+import re
+import sys
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+
+from gallery import MANIFEST_NAME, page_inputs
+from page import SNOW_COUNT, center_lines, write_atomic
+from textures import TEXTURE_DPR, christmas_tree_texture, encode_png, hsl_to_rgb, tree_texture
+
+POSTERS_DIR = "posters"
+# name: (output width, output height, viewport width, viewport height)
+SIZES = {
+    "thumb": (320, 180, 1280, 720),
+    "og": (1200, 630, 1200, 630),
+    "poster": (1920, 1080, 1920, 1080),
+}
+# zlib level for frames; 9 is several times slower for a few percent
+PNG_LEVEL = 6
+
+# Scene constants, mirroring ENGINE_SETUP_JS and SCENE_JS
+DPR = TEXTURE_DPR
+SECTION_HEIGHT = 600 * DPR
+HEIGHT = 300 * DPR
+LEVELS = 7
+LEVEL_HEIGHT = HEIGHT / (LEVELS + 1)
+LEVEL_WIDTH = LEVEL_HEIGHT * (3.6 / 3.0)
+WINDOW_HEIGHT = LEVEL_HEIGHT * (1.5 / 3.0)
+WINDOW_WIDTH = WINDOW_HEIGHT * (2.4 / 1.5)
+WINDOW_LEFT_PADDING = (LEVEL_WIDTH - WINDOW_WIDTH) / 2
+WINDOW_TOP_PADDING = (LEVEL_HEIGHT - WINDOW_HEIGHT) / 2
+SECTIONS = range(-2, 3 * 2)
+# The scroll offset wraps at two sections, so no frame shows anything above section -2
+LAYER_TOP = -2 * SECTION_HEIGHT
+
+PALETTE = ["#65dcf3", "hsl(204deg 67% 44%)", "#4ca7df", "#367cb1", "#286097"]
+LIGHTS = ["hsl(323deg, 78%, 75%)", "hsl(42deg, 61%, 75%)", "hsl(143deg, 61%, 75%)"]
+WINDOWS = [
+    ("#286097", "#1f4c7d"),
+    ("#286097", "#1f4c7d"),
+    ("#286097", "#1f4c7d"),
+    ("#286097", "#1f4c7d"),
+    ("#e087a7", "#c172ab"),
+    ("#5fb7e7", "#4aa2d4"),
+    ("#7ad2a1", "#4ea695"),
+]
+
+SUB_MESSAGE = "🎄 Merry Christmas from IEEE NDU 🎄"
+# Share of a character cell covered by ink, for the block rendering of text
+RAMP = " .:-=+*#%@"
+INK = {ch: i / (len(RAMP) - 1) for i, ch in enumerate(RAMP)}
+INK.update({"█": 1.0, "▓": 0.75, "▒": 0.5, "░": 0.25, "_": 0.2, "|": 0.35, "/": 0.3, "\\": 0.3})
+LETTER_INK = 0.55
+PUNCTUATION_INK = 0.3
+
+# The page's default message color, drawn in place of colors parse_color does not know
+LED_COLOR = "#ff3366"
+_NAMED_COLORS = {"white": (255, 255, 255), "black": (0, 0, 0), "red": (255, 0, 0)}
+_RGB_RE = re.compile(r"rgba?\(\s*([\d.]+)(%?)[\s,]+([\d.]+)(%?)[\s,]+([\d.]+)(%?)")
+_HSL_RE = re.compile(r"hsla?\(\s*([\d.]+)(?:deg)?[\s,]+([\d.]+)%[\s,]+([\d.]+)%")
+
+
+@lru_cache(maxsize=None)
+def parse_color(color):
+    """CSS color (#rgb, #rrggbb, their alpha forms, rgb(), hsl() or a basic name) -> float32 RGB in 0..255
+
+    Alpha is ignored. Any other color the browser may still accept (most
+    CSS names) is drawn as LED_COLOR with a warning rather than failing the
+    frame.
+    """
+    rgb = _css_rgb(color.strip().lower())
+    if rgb is None:
+        warnings.warn(f"unsupported color {color!r}, drawing {LED_COLOR} instead", stacklevel=2)
+        rgb = _css_rgb(LED_COLOR)
+    return np.array(rgb, dtype=np.float32)
+
+
+def _css_rgb(color):
+    if color.startswith("#") and len(color) in (4, 5, 7, 9):
+        digits = color[1:] if len(color) > 5 else "".join(ch * 2 for ch in color[1:])
+        try:
+            return [int(digits[i:i + 2], 16) for i in (0, 2, 4)]
+        except ValueError:
+            return None
+    if color in _NAMED_COLORS:
+        return _NAMED_COLORS[color]
+    match = _RGB_RE.match(color)
+    if match:
+        values = match.groups()
+        return [min(float(value) * (2.55 if percent else 1), 255) for value, percent in zip(values[::2], values[1::2])]
+    match = _HSL_RE.match(color)
+    if match:
+        h, s, l = (float(value) for value in match.groups())
+        return hsl_to_rgb(h, s / 100, l / 100)
+    return None
+
+
+class Raster:
+    """An RGB float32 pixel buffer with the few 2D-context operations the scene uses.
+
+    ``top`` is the scene y coordinate of the first row, so the scenery layer
+    can start above the screen.
+    """
+
+    def __init__(self, width, height, top=0.0):
+        self.width = width
+        self.height = height
+        self.top = top
+        self.pixels = np.empty((height, width, 3), dtype=np.float32)
+
+    def fill(self, color):
+        self.pixels[:] = parse_color(color)
+
+    def _rows(self, y0, y1):
+        return max(0, math.floor(y0 - self.top)), min(self.height, math.ceil(y1 - self.top))
+
+    def fill_columns(self, x0, x1, top, bottom, paint):
+        """Fill the pixels whose centres lie between two edges of a shape with vertical sides.
+
+        ``top`` and ``bottom`` map column centres to scene y (arrays); ``paint``
+        is a color, or a function of the covered pixel centres returning colors.
+        """
+        c0, c1 = max(0, math.ceil(x0 - 0.5)), min(self.width, math.ceil(x1 - 0.5))
+        if c0 >= c1:
+            return
+        px = np.arange(c0, c1) + 0.5
+        upper, lower = top(px), bottom(px)
+        r0, r1 = self._rows(upper.min(), lower.max())
+        if r0 >= r1:
+            return
+        py = np.arange(r0, r1)[:, None] + 0.5 + self.top
+        mask = (py >= upper) & (py < lower)
+        region = self.pixels[r0:r1, c0:c1]
+        if callable(paint):
+            ys, xs = np.nonzero(mask)
+            region[ys, xs] = paint(px[xs], py[ys, 0])
+        else:
+            region[mask] = parse_color(paint)
+
+    def stroke(self, points, color):
+        """1px polyline through scene points"""
+        rgb = parse_color(color)
+        for (x0, y0), (x1, y1) in zip(points, points[1:]):
+            steps = int(max(abs(x1 - x0), abs(y1 - y0))) + 1
+            t = np.linspace(0, 1, steps + 1)
+            xs = np.floor(x0 + (x1 - x0) * t).astype(np.intp)
+            ys = np.floor(y0 + (y1 - y0) * t - self.top).astype(np.intp)
+            inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+            self.pixels[ys[inside], xs[inside]] = rgb
+
+    def fill_rect(self, x, y, width, height, color):
+        self.fill_columns(x, x + width, lambda px: np.full_like(px, y), lambda px: np.full_like(px, y + height), color)
+
+    def draw_image(self, rgba, x, y):
+        """Composite an RGBA sprite with binary alpha at scene position (x, y)"""
+        x, y = round(x), round(y - self.top)
+        height, width = rgba.shape[:2]
+        sx0, sy0 = max(0, -x), max(0, -y)
+        sx1, sy1 = min(width, self.width - x), min(height, self.height - y)
+        if sx0 >= sx1 or sy0 >= sy1:
+            return
+        sprite = rgba[sy0:sy1, sx0:sx1]
+        target = self.pixels[y + sy0:y + sy1, x + sx0:x + sx1]
+        opaque = sprite[..., 3] > 127
+        target[opaque] = sprite[..., :3][opaque]
+
+
+def _lerp_edge(x0, y0, x1, y1):
+    return lambda px: y0 + (px - x0) * ((y1 - y0) / (x1 - x0))
+
+
+def _linear_gradient(x0, y0, x1, y1, color_from, color_to):
+    start, end = parse_color(color_from), parse_color(color_to)
+    dx, dy = x1 - x0, y1 - y0
+    length = dx * dx + dy * dy
+
+    def paint(px, py):
+        t = np.clip(((px - x0) * dx + (py - y0) * dy) / length, 0, 1) if length else np.zeros_like(px)
+        return start + (end - start) * t[:, None]
+
+    return paint
+
+
+def _snow_noise(i, k):
+    """snowNoise in page.py"""
+    s = np.sin(i * 12.9898 + k * 78.233) * 43758.5453
+    return s - np.floor(s)
+
+
+class Scene:
+    """The engine's scene geometry for one viewport, drawing into a Raster"""
+
+    def __init__(self, viewport_width, viewport_height):
+        self.width = int(viewport_width * DPR)
+        self.height = int(viewport_height * DPR)
+        self.colls = math.ceil(self.width / LEVEL_WIDTH)
+        self.tree = tree_texture(DPR)
+        self.christmas_tree = christmas_tree_texture(DPR)
+
+    def screen(self, left, x, y):
+        """getScreenCoords"""
+        shear = x / self.width if left else 1 - x / self.width
+        return x, math.floor(y + shear * HEIGHT)
+
+    def rhombus(self, raster, left, x, y, width, height, color_from, color_to):
+        """drawGradientRhombus; returns its outline for stroking"""
+        ratio = height / width / (math.pi * 2)
+        g0 = self.screen(left, x + width * (0.5 + ratio if left else 0.5 - ratio), y)
+        g1 = self.screen(left, x + width * (0.5 - ratio if left else 0.5 + ratio), y + height)
+        corners = [self.screen(left, x, y), self.screen(left, x, y + height),
+                   self.screen(left, x + width, y + height), self.screen(left, x + width, y)]
+        paint = color_from if color_from == color_to else _linear_gradient(*g0, *g1, color_from, color_to)
+        (ax, ay), (_, by), (cx, cy), (_, dy) = corners
+        raster.fill_columns(ax, cx, _lerp_edge(ax, ay, cx, dy), _lerp_edge(ax, by, cx, cy), paint)
+        return corners + corners[:1]
+
+    def line(self, raster, left, x0, y0, x1, y1, color):
+        raster.stroke([self.screen(left, x0, y0), self.screen(left, x1, y1)], color)
+
+    def window(self, raster, left, x, y, colors):
+        outline = self.rhombus(raster, left, x, y, WINDOW_WIDTH, WINDOW_HEIGHT, *colors)
+        raster.stroke(outline, PALETTE[3])
+        for split in (0.3, 0.7):
+            self.line(raster, left, x + WINDOW_WIDTH * split, y, x + WINDOW_WIDTH * split, y + WINDOW_HEIGHT, PALETTE[3])
+
+    def padik(self, raster, left, x, y):
+        self.rhombus(raster, left, x - WINDOW_LEFT_PADDING, y - WINDOW_TOP_PADDING, LEVEL_WIDTH, LEVEL_HEIGHT,
+                     PALETTE[3], PALETTE[3])
+        self.rhombus(raster, left, x, y, WINDOW_WIDTH, WINDOW_HEIGHT, PALETTE[4], PALETTE[4])
+        for split in (0.3, 0.7):
+            self.line(raster, left, x + WINDOW_WIDTH * split, y, x + WINDOW_WIDTH * split, y + WINDOW_HEIGHT, PALETTE[3])
+        self.line(raster, left, x, y + WINDOW_HEIGHT * 0.5, x + WINDOW_WIDTH, y + WINDOW_HEIGHT * 0.5, PALETTE[3])
+
+    def trees_line(self, raster, left, x, y):
+        for t in range(-1, 5):
+            tx, ty = self.screen(left, x + t * (200 * DPR), y + HEIGHT if left else y + HEIGHT - 20)
+            raster.draw_image(self.tree, tx, ty + math.sin(tx * 10) * 10 - 10)
+
+    def icicles(self, raster, left, x, y):
+        count = math.ceil(self.width / 3)
+        j = np.arange(count)
+        depth = 10 * np.abs(np.sin(j) * np.sin(j / 10))
+        # Zigzag of tip and root points; the path closes straight back to the start
+        xs = np.empty(2 * count + 1)
+        ys = np.empty(2 * count + 1)
+        xs[0], ys[0] = self.screen(left, x, y - 1)
+        tips = [self.screen(left, x + k * 3, y + d) for k, d in zip(j, depth)]
+        roots = [self.screen(left, x + k * 3 + 3, y) for k in j]
+        xs[1::2], ys[1::2] = zip(*tips)
+        xs[2::2], ys[2::2] = zip(*roots)
+        raster.fill_columns(xs[0], xs[-1], _lerp_edge(xs[0], ys[0], xs[-1], ys[-1]),
+                            lambda px: np.interp(px, xs, ys), PALETTE[0])
+
+    def section_scenery(self, raster, i):
+        """drawSectionScenery"""
+        y = i * SECTION_HEIGHT
+        x = 0.0
+        left = i % 2
+
+        self.trees_line(raster, left, x, y - HEIGHT - 25)
+        self.rhombus(raster, left, x, y - HEIGHT / 3, self.width, HEIGHT / 3, PALETTE[2], PALETTE[0])
+        self.rhombus(raster, left, x, y, self.width, HEIGHT, PALETTE[2], PALETTE[3])
+
+        for row in np.arange(0.5, LEVELS):
+            for col in range(self.colls):
+                random = abs(math.sin(i) + math.cos(row) + math.sin(col)) % 1
+                colors = WINDOWS[math.floor(random * len(WINDOWS)) % len(WINDOWS)]
+                wx = col * LEVEL_WIDTH + WINDOW_LEFT_PADDING + x
+                wy = row * LEVEL_HEIGHT + WINDOW_TOP_PADDING + y
+                if i % 2 == 0 and col % 6 < 2:
+                    self.padik(raster, left, wx, wy)
+                else:
+                    self.window(raster, left, wx, wy, colors)
+
+        for col in range(self.colls):
+            self.line(raster, left, col * LEVEL_WIDTH + x, y, col * LEVEL_WIDTH + x, y + HEIGHT, PALETTE[4])
+        self.line(raster, left, 0, y, self.width, y, PALETTE[4])
+        self.line(raster, left, 0, y + 1, self.width, y + 1, PALETTE[4])
+        for row in np.arange(0.5, LEVELS + 1):
+            self.line(raster, left, 0, row * LEVEL_HEIGHT + y, self.width, row * LEVEL_HEIGHT + y, PALETTE[4])
+
+        self.icicles(raster, left, x, y)
+        self.trees_line(raster, left, x, y)
+        raster.draw_image(self.christmas_tree, *self._christmas_tree_position(i))
+
+    def _christmas_tree_position(self, i):
+        return (5 if i % 2 else self.width - 55), i * SECTION_HEIGHT + 100
+
+    def section_lights(self, raster, i, time_ms):
+        """drawSectionLights"""
+        ct_x, ct_y = self._christmas_tree_position(i)
+        ct_c = ct_x + self.christmas_tree.shape[1] / 2
+        zigzag = [(0, 0), (-5, 7), (0, 14), (5, 15), (0, 22), (-8, 25), (0, 32), (8, 35), (0, 43),
+                  (-14, 45), (0, 53), (14, 55), (0, 62), (-18, 56)]
+        color = LIGHTS[math.floor(time_ms / 1000) % len(LIGHTS)]
+        raster.stroke([(ct_c + dx, ct_y + dy) for dx, dy in zigzag], color)
+
+    def snow(self, raster, time_ms):
+        """drawSnow; all flakes in one vectorised pass.
+
+        The page integrates each flake frame by frame; this is the closed
+        form of the same motion from the same starting points, for the
+        default count, speed and wind.
+        """
+        i = np.arange(SNOW_COUNT)
+        x0, y0 = _snow_noise(i, 1), _snow_noise(i, 2)
+        fall = (1 + 2 * _snow_noise(i, 3)) / 6000
+        sway = 0.05 * (2 * _snow_noise(i, 4) - 1)
+        x = (x0 + sway * math.sin(time_ms / 600)) % 1 * self.width
+        y = (y0 + fall * time_ms) % 1 * self.height
+        xs, ys = np.floor(x).astype(np.intp), np.floor(y).astype(np.intp)
+        for dy in (0, 1):
+            for dx in (0, 1):
+                inside = (xs + dx < self.width) & (ys + dy < self.height)
+                raster.pixels[ys[inside] + dy, xs[inside] + dx] = 255
+
+    def scroll_offset(self, time_ms):
+        return (time_ms / 100 / DPR) % (SECTION_HEIGHT * 2)
+
+
+@lru_cache(maxsize=4)
+def scenery_layer(viewport_width, viewport_height):
+    """Scene plus the static scenery of every section, covering every scroll position"""
+    scene = Scene(viewport_width, viewport_height)
+    layer = Raster(scene.width, int(scene.height - LAYER_TOP), top=LAYER_TOP)
+    layer.fill(PALETTE[1])
+    for i in SECTIONS:
+        scene.section_scenery(layer, i)
+    return scene, layer.pixels
+
+
+def render_scene(viewport_width, viewport_height, time_ms):
+    """The canvas at ``time_ms``, at its backing resolution (the viewport times dpr)"""
+    scene, layer = scenery_layer(viewport_width, viewport_height)
+    scroll = math.floor(scene.scroll_offset(time_ms))
+    start = -scroll - int(LAYER_TOP)
+    frame = Raster(scene.width, scene.height, top=-scroll)
+    frame.pixels[:] = layer[start:start + scene.height]
+    for i in SECTIONS:
+        scene.section_lights(frame, i, time_ms)
+    # Snow is drawn after resetView, so it does not scroll
+    frame.top = 0
+    scene.snow(frame, time_ms)
+    return frame.pixels
+
+
+def _resize(pixels, width, height):
+    """Nearest-neighbour upscale (the canvas is shown pixelated) or box-filter downscale"""
+    src_height, src_width = pixels.shape[:2]
+    if width >= src_width and height >= src_height:
+        ys = (np.arange(height) * src_height // height)
+        xs = (np.arange(width) * src_width // width)
+        return pixels[ys][:, xs]
+    ys = np.linspace(0, src_height, height + 1).astype(np.intp)
+    xs = np.linspace(0, src_width, width + 1).astype(np.intp)
+    sums = np.add.reduceat(np.add.reduceat(pixels, ys[:-1], axis=0), xs[:-1], axis=1)
+    return sums / np.outer(np.diff(ys), np.diff(xs))[..., None]
+
+
+def _blur(mask, radius):
+    """Box blur, twice, as a cheap stand-in for the text-shadow glow"""
+    radius = max(1, int(radius))
+    for _ in range(2):
+        for axis in (0, 1):
+            padded = np.concatenate([np.zeros_like(mask.take([0], axis)).repeat(radius + 1, axis), mask,
+                                     np.zeros_like(mask.take([0], axis)).repeat(radius, axis)], axis)
+            summed = np.cumsum(padded, axis=axis)
+            size = mask.shape[axis]
+            mask = (summed.take(range(2 * radius + 1, 2 * radius + 1 + size), axis)
+                    - summed.take(range(size), axis)) / (2 * radius + 1)
+    return mask
+
+
+def _ink(ch):
+    if ch in INK:
+        return INK[ch]
+    if ch.isalnum():
+        return LETTER_INK
+    return PUNCTUATION_INK if ch.isprintable() else 0.0
+
+
+def _text_size(lines, columns, cell_width, line_height):
+    """(height, width) in pixels of ``lines`` lines of ``columns`` monospace characters"""
+    return math.ceil(lines * line_height), math.ceil(columns * cell_width)
+
+
+def _text_coverage(lines, columns, cell_width, line_height, window=None):
+    """Per-pixel ink coverage for lines of monospace text, one block per character.
+
+    ``window`` is ``(top, bottom, left, right)`` in pixels of the whole text
+    block; only the lines and columns inside it are rasterized.
+    """
+    height, width = _text_size(len(lines), columns, cell_width, line_height)
+    top, bottom, left, right = window or (0, height, 0, width)
+    py = np.arange(top, bottom) + 0.5
+    px = np.arange(left, right) + 0.5
+    if not len(py) or not len(px):
+        return np.zeros((len(py), len(px)), dtype=np.float32)
+    rows = np.minimum((py // line_height).astype(np.intp), len(lines) - 1)
+    cols = np.minimum((px // cell_width).astype(np.intp), max(columns, 1) - 1)
+    first_row, first_col = rows[0], cols[0]
+    grid = np.zeros((rows[-1] - first_row + 1, cols[-1] - first_col + 1), dtype=np.float32)
+    for row, line in enumerate(lines[first_row:rows[-1] + 1]):
+        visible = line[first_col:first_col + grid.shape[1]]
+        grid[row, :len(visible)] = [_ink(ch) for ch in visible]
+    # Glyphs fill roughly the middle of their cell
+    in_row = ((py % line_height) / line_height > 0.2) & ((py % line_height) / line_height < 0.85)
+    in_col = ((px % cell_width) / cell_width > 0.1) & ((px % cell_width) / cell_width < 0.9)
+    return grid[rows - first_row][:, cols - first_col] * (in_row[:, None] & in_col[None, :])
+
+
+def _blend(pixels, x, y, alpha, color):
+    """Alpha-blend a color through a coverage array placed at (x, y), clipped to the image"""
+    height, width = alpha.shape
+    x0, y0 = max(0, x), max(0, y)
+    x1, y1 = min(pixels.shape[1], x + width), min(pixels.shape[0], y + height)
+    if x0 >= x1 or y0 >= y1:
+        return
+    a = alpha[y0 - y:y1 - y, x0 - x:x1 - x, None]
+    region = pixels[y0:y1, x0:x1]
+    region += (color - region) * a
+
+
+def _blend_rect(pixels, x, y, width, height, alpha, color):
+    """Alpha-blend a color over a rectangle with uniform coverage, clipped to the image"""
+    x0, y0 = max(0, x), max(0, y)
+    x1, y1 = min(pixels.shape[1], x + width), min(pixels.shape[0], y + height)
+    if x0 < x1 and y0 < y1:
+        region = pixels[y0:y1, x0:x1]
+        region += (color - region) * alpha
+
+
+def message_opacity(time_ms, delay):
+    """Opacity of the message box: the fadeIn animation, 2s ease-in after ``delay``"""
+    progress = min(max((time_ms / 1000 - delay) / 2, 0.0), 1.0)
+    # Close enough to CSS ease-in for a still frame
+    return progress * progress
+
+
+def draw_message(pixels, message, color, scale, viewport_width, opacity, centered=False):
+    """The #led-message box (see PAGE_CSS), sized for a viewport shown at ``scale``
+
+    ``centered`` says the message is already padded like a page's rawMessage,
+    so its lines are drawn as they are.
+    """
+    if opacity <= 0:
+        return
+    rgb = parse_color(color)
+    font_size = (viewport_width * 0.05 if viewport_width <= 768 else min(max(viewport_width * 0.04, 24), 48)) * scale
+    cell_width, line_height = font_size * 0.6, font_size * 1.13
+    padding = min(max(viewport_width * 0.015, 10), 20) * scale
+    gap, border = 15 * scale, max(1, round(2 * scale))
+    sub_size = 12 * scale
+
+    lines = message.split("\n") if centered else list(center_lines(message))
+    columns = max(map(len, lines))
+    text_height, text_width = _text_size(len(lines), columns, cell_width, line_height)
+    sub = _text_coverage([SUB_MESSAGE], len(SUB_MESSAGE), sub_size * 0.55, sub_size * 1.15)
+
+    inner_width = max(text_width, sub.shape[1]) + 2 * padding
+    inner_height = text_height + gap + sub.shape[0] + 2 * padding
+    box_width, box_height = round(inner_width + 2 * border), round(inner_height + 2 * border)
+    box_x = (pixels.shape[1] - box_width) // 2
+    box_y = (pixels.shape[0] - box_height) // 2
+
+    _blend_rect(pixels, box_x, box_y, box_width, box_height, 0.7 * opacity, np.zeros(3, np.float32))
+    for x, y, width, height in ((box_x, box_y, box_width, border),
+                                (box_x, box_y + box_height - border, box_width, border),
+                                (box_x, box_y + border, border, box_height - 2 * border),
+                                (box_x + box_width - border, box_y + border, border, box_height - 2 * border)):
+        _blend_rect(pixels, x, y, width, height, opacity, rgb)
+
+    text_x = box_x + (box_width - text_width) // 2
+    text_y = round(box_y + border + padding)
+    glow_radius = 10 * scale
+    offset = math.ceil(glow_radius * 2)
+    # Large art overflows the frame: rasterize only what is on screen, plus
+    # the text within reach of the glow's blur
+    top, bottom = max(0, -text_y - offset), min(text_height, pixels.shape[0] - text_y + offset)
+    left, right = max(0, -text_x - offset), min(text_width, pixels.shape[1] - text_x + offset)
+    if top < bottom and left < right:
+        text = _text_coverage(lines, columns, cell_width, line_height, (top, bottom, left, right))
+        glow = np.minimum(_blur(np.pad(text, offset), glow_radius) * 2.5, 1)
+        _blend(pixels, text_x + left - offset, text_y + top - offset, glow * 0.6 * opacity, rgb)
+        _blend(pixels, text_x + left, text_y + top, text * opacity, rgb)
+    sub_x = box_x + (box_width - sub.shape[1]) // 2
+    sub_y = round(text_y + text_height + gap)
+    _blend(pixels, sub_x, sub_y, sub * 0.7 * opacity, np.full(3, 255, np.float32))
+
+
+def render_frame(message, color=LED_COLOR, delay=5, size="og", time_ms=None, centered=False):
+    """RGB uint8 array of the page at ``time_ms`` (default: once the message has faded in).
+
+    ``size`` is a SIZES name or ``(output width, output height, viewport
+    width, viewport height)``. ``centered`` is passed on to draw_message.
+    """
+    width, height, viewport_width, viewport_height = SIZES[size] if isinstance(size, str) else size
+    if time_ms is None:
+        time_ms = (float(delay) + 2) * 1000
+    scene = render_scene(viewport_width, viewport_height, time_ms)
+    pixels = _resize(scene, width, height)
+    opacity = message_opacity(time_ms, float(delay))
+    draw_message(pixels, message, color, width / viewport_width, viewport_width, opacity, centered)
+    return np.clip(np.rint(pixels), 0, 255).astype(np.uint8)
+
+
+def frame_png(message, color=LED_COLOR, delay=5, size="og", time_ms=None, centered=False):
+    """PNG bytes of render_frame"""
+    return encode_png(render_frame(message, color, delay, size, time_ms, centered), PNG_LEVEL)
+
+
+def _render_poster(args):
+    page_path, poster_path, size, time_ms = args
+    try:
+        inputs = page_inputs(page_path)
+        # The embedded rawMessage was centered when the page was written
+        frame = frame_png(inputs["message"], inputs["color"], inputs["delay"], size, time_ms, centered=True)
+        write_atomic(poster_path, frame)
+        return page_path, None
+    except Exception as e:
+        return page_path, f"{type(e).__name__}: {e}"
+
+
+def render_posters(output_dir="docs", size="og", workers=None, time_ms=None, force=False):
+    """PNG frames for every page in the output directory's manifest.
+
+    Frames go to ``posters/<size>/<page>.png`` and are skipped while newer
+    than their page unless ``force``. Returns a report like
+    create_html_batch's.
+    """
+    name = size if isinstance(size, str) else "x".join(map(str, size[:2]))
+    poster_dir = os.path.join(output_dir, POSTERS_DIR, name)
+    os.makedirs(poster_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    files = []
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            files = list(dict.fromkeys(json.loads(line)["file"] for line in f if line.strip()))
+
+    tasks = []
+    for filename in files:
+        page_path = os.path.join(output_dir, filename)
+        poster_path = os.path.join(poster_dir, os.path.splitext(filename)[0] + ".png")
+        if not os.path.exists(page_path):
+            continue
+        if not force and os.path.exists(poster_path) and os.path.getmtime(poster_path) >= os.path.getmtime(page_path):
+            continue
+        tasks.append((page_path, poster_path, size, time_ms))
+
+    start = time.perf_counter()
+    if workers == 1 or len(tasks) <= 1:
+        results = list(map(_render_poster, tasks))
+    else:
+        workers = workers or os.cpu_count() or 1
+        # Large chunks, so each worker builds its scenery layer once and reuses it
+        chunksize = max(1, len(tasks) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_render_poster, tasks, chunksize=chunksize))
+    elapsed = time.perf_counter() - start
+
+    errors = [(path, error) for path, error in results if error]
+    return {
+        "total": len(files),
+        "rendered": len(results) - len(errors),
+        "skipped": len(files) - len(tasks),
+        "failed": len(errors),
+        "errors": errors,
+        "elapsed": elapsed,
+        "frames_per_sec": len(results) / elapsed if elapsed > 0 else float("inf"),
+    }
+
+
+def _size(value):
+    if value in SIZES:
+        return value
+    match = re.fullmatch(r"(\d+)x(\d+)", value)
+    if not match:
+        raise argparse.ArgumentTypeError(f"expected one of {', '.join(SIZES)} or WIDTHxHEIGHT")
+    width, height = map(int, match.groups())
+    return width, height, width, height
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render PNG frames of generated pages without a browser.")
+    parser.add_argument("output_dir", nargs="?", default="docs", help="directory holding the pages (default: docs)")
+    parser.add_argument("-s", "--size", type=_size, default="og",
+                        help=f"{', '.join(SIZES)} or WIDTHxHEIGHT (default: og)")
+    parser.add_argument("-t", "--time", type=float, default=None,
+                        help="animation time in ms (default: once the message has faded in)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="re-render frames that are already up to date")
+    args = parser.parse_args(argv)
+
+    report = render_posters(args.output_dir, args.size, args.workers, args.time, args.force)
+    for path, error in report["errors"]:
+        print(f"{path}: {error}", file=sys.stderr)
+    print(f"{report['rendered']}/{report['total']} frames rendered ({report['skipped']} up to date) "
+          f"in {report['elapsed']:.2f}s ({report['frames_per_sec']:.0f} frames/s)")
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
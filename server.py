@@ -0,0 +1,343 @@
+"""Local HTTP server for previewing generated pages.
+
+Serves ``docs/`` the way a static host would: every response carries an
+ETag and Last-Modified, conditional requests get ``304 Not Modified``,
+content-hashed assets are marked immutable, and bodies are sent with
+Content-Encoding from the ``.br``/``.gz`` siblings written by
+``precompress`` or gzipped on the fly.
+
+With live reload on, HTML responses get a small script that listens on
+``/__reload`` (Server-Sent Events) and reloads the page when
+``notify_reload`` is called for it. Pages served that way are never
+precompressed, since the script changes their bytes. The GUI turns it on
+and calls ``notify_reload`` as it writes pages.
+
+The command line serves pages byte-for-byte by default, precompressed
+siblings included, so it measures the exact deploy load path. With
+``--reload`` it injects the script and polls the directory for changed
+``.html`` files instead (see ``PreviewServer.reload_on_change``).
+
+Usage:
+    python server.py docs --port 8000
+    python server.py docs --reload
+"""
+import argparse
+import gzip
+import os
+import queue
+import sys
+import threading
+import time
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+from page import ASSETS_DIR
+
+RELOAD_PATH = "/__reload"
+PREVIEW_URL = "/__preview.html"
+# Seconds between keep-alive comments on idle event streams
+HEARTBEAT = 15
+GZIP_CACHE_SIZE = 64
+COMPRESSIBLE = ("text/", "application/javascript", "application/json", "image/svg+xml")
+
+RELOAD_SCRIPT = b'''<script>
+(() => {
+  const page = decodeURIComponent(location.pathname.split('/').pop()) || 'index.html';
+  new EventSource('/__reload').onmessage = (event) => {
+    if (event.data === '*' || event.data === page) location.reload();
+  };
+})();
+</script>
+'''
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, directory, live_reload, aliases, verbose):
+        super().__init__(address, _Handler)
+        self.directory = directory
+        self.live_reload = live_reload
+        self.aliases = aliases
+        self.verbose = verbose
+        self.stopping = False
+        self.subscribers = set()
+        self.gzip_cache = OrderedDict()
+        self.lock = threading.Lock()
+
+
+class _Handler(SimpleHTTPRequestHandler):
+    server_version = "WinterLED/1.0"
+
+    def __init__(self, request, client_address, server):
+        super().__init__(request, client_address, server, directory=server.directory)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        self._serve(send_body=True)
+
+    def do_HEAD(self):
+        self._serve(send_body=False)
+
+    def _serve(self, send_body):
+        url_path = unquote(urlsplit(self.path).path)
+        if url_path == RELOAD_PATH:
+            self._stream_events()
+            return
+
+        path = self.server.aliases.get(url_path) or self.translate_path(self.path)
+        if os.path.isdir(path):
+            if not url_path.endswith("/"):
+                self.send_response(301)
+                self.send_header("Location", url_path + "/")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            path = os.path.join(path, "index.html")
+        if not os.path.isfile(path):
+            self.send_error(404, "File not found")
+            return
+
+        stat = os.stat(path)
+        content_type = self.guess_type(path)
+        inject = self.server.live_reload and content_type == "text/html"
+        encoding, source = self._choose_encoding(path, stat, content_type, inject)
+        # One validator per representation: the raw file, the injected page and each encoding
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}{"-r" if inject else ""}{"-" + encoding if encoding else ""}"'
+
+        headers = {
+            "ETag": etag,
+            "Last-Modified": formatdate(stat.st_mtime, usegmt=True),
+            "Cache-Control": self._cache_control(url_path),
+        }
+        if content_type.startswith(COMPRESSIBLE):
+            headers["Vary"] = "Accept-Encoding"
+
+        if self._not_modified(etag, stat.st_mtime):
+            self.send_response(304)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            return
+
+        body = self._body(path, stat, encoding, source, inject)
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _accepts(self, encoding):
+        accepted = self.headers.get("Accept-Encoding", "")
+        for item in accepted.split(","):
+            name, _, params = item.strip().partition(";")
+            if name.strip() == encoding and params.replace(" ", "") != "q=0":
+                return True
+        return False
+
+    def _choose_encoding(self, path, stat, content_type, inject):
+        """(encoding, precompressed sibling or None) for this request"""
+        if not content_type.startswith(COMPRESSIBLE):
+            return None, None
+        if not inject:
+            for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+                sibling = path + suffix
+                # A sibling older than its page is stale; fall through to on-the-fly gzip
+                if self._accepts(encoding) and os.path.exists(sibling) and os.stat(sibling).st_mtime >= stat.st_mtime:
+                    return encoding, sibling
+        if self._accepts("gzip"):
+            return "gzip", None
+        return None, None
+
+    def _body(self, path, stat, encoding, source, inject):
+        if source:
+            with open(source, "rb") as f:
+                return f.read()
+        key = (path, stat.st_mtime_ns, stat.st_size, inject)
+        if encoding == "gzip":
+            with self.server.lock:
+                if key in self.server.gzip_cache:
+                    self.server.gzip_cache.move_to_end(key)
+                    return self.server.gzip_cache[key]
+        with open(path, "rb") as f:
+            data = f.read()
+        if inject:
+            end = data.rfind(b"</body>")
+            data = data + RELOAD_SCRIPT if end == -1 else data[:end] + RELOAD_SCRIPT + data[end:]
+        if encoding == "gzip":
+            data = gzip.compress(data, 6, mtime=0)
+            with self.server.lock:
+                self.server.gzip_cache[key] = data
+                if len(self.server.gzip_cache) > GZIP_CACHE_SIZE:
+                    self.server.gzip_cache.popitem(last=False)
+        return data
+
+    @staticmethod
+    def _cache_control(url_path):
+        # Asset names are content hashes, so they can never change in place
+        if url_path.startswith(f"/{ASSETS_DIR}/"):
+            return "public, max-age=31536000, immutable"
+        return "no-cache"
+
+    def _not_modified(self, etag, mtime):
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            return "*" in tags or etag in tags or f"W/{etag}" in tags
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since:
+            try:
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(mtime) <= since
+        return False
+
+    def _stream_events(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        events = queue.Queue()
+        with self.server.lock:
+            self.server.subscribers.add(events)
+        try:
+            self.wfile.write(b"retry: 1000\n\n")
+            self.wfile.flush()
+            while not self.server.stopping:
+                try:
+                    name = events.get(timeout=HEARTBEAT)
+                except queue.Empty:
+                    # Also how a closed tab is noticed: the write fails
+                    self.wfile.write(b": ping\n\n")
+                    self.wfile.flush()
+                    continue
+                if name is None:
+                    break
+                self.wfile.write(f"data: {name}\n\n".encode("utf-8"))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            with self.server.lock:
+                self.server.subscribers.discard(events)
+
+
+class PreviewServer:
+    """Serves a directory on a background thread.
+
+    ``aliases`` maps extra URL paths to files outside the directory, e.g.
+    the GUI's scratch preview page.
+    """
+
+    def __init__(self, directory="docs", host="127.0.0.1", port=0, live_reload=True, aliases=None, verbose=False):
+        self._server = _Server((host, port), os.path.abspath(directory), live_reload, dict(aliases or {}), verbose)
+        self._thread = threading.Thread(target=self._server.serve_forever, name="preview-server", daemon=True)
+        self._stopped = threading.Event()
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def url(self, path=""):
+        host = self._server.server_address[0]
+        return f"http://{host}:{self.port}/{path.lstrip('/')}"
+
+    def notify_reload(self, name="*"):
+        """Tell open pages that ``name`` (a file name, or "*" for all) changed"""
+        name = os.path.basename(name) if name != "*" else name
+        with self._server.lock:
+            subscribers = list(self._server.subscribers)
+        for events in subscribers:
+            events.put(name)
+
+    def reload_on_change(self, interval=1.0):
+        """Poll the directory and call notify_reload for .html files that change.
+
+        For when nothing else writes through this process, as on the command
+        line. Each poll is one ``stat`` per page.
+        """
+        def poll(seen):
+            while not self._stopped.wait(interval):
+                current = _html_signatures(self._server.directory)
+                for path in current.keys() | seen.keys():
+                    if current.get(path) != seen.get(path):
+                        self.notify_reload(path)
+                seen = current
+
+        seen = _html_signatures(self._server.directory)
+        threading.Thread(target=poll, args=(seen,), name="preview-reload", daemon=True).start()
+        return self
+
+    def serve_forever(self):
+        """Serve on the calling thread until interrupted (for the command line)"""
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def stop(self):
+        """Close open event streams and shut the server down"""
+        self._server.stopping = True
+        self._stopped.set()
+        with self._server.lock:
+            subscribers = list(self._server.subscribers)
+        for events in subscribers:
+            events.put(None)
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def _html_signatures(directory):
+    signatures = {}
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = [d for d in dirs if not d.startswith(".")]
+        for name in files:
+            if name.endswith(".html"):
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                signatures[path] = (stat.st_mtime_ns, stat.st_size)
+    return signatures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve generated pages locally with caching headers and live reload.")
+    parser.add_argument("directory", nargs="?", default="docs", help="directory to serve (default: docs)")
+    parser.add_argument("--host", default="127.0.0.1", help="address to bind (default: 127.0.0.1)")
+    parser.add_argument("-p", "--port", type=int, default=8000, help="port to listen on (default: 8000)")
+    parser.add_argument("--reload", action="store_true",
+                        help="reload open pages when their files change (pages are then not served precompressed)")
+    parser.add_argument("--interval", type=float, default=1.0,
+                        help="seconds between checks for changed pages with --reload (default: 1)")
+    args = parser.parse_args(argv)
+
+    server = PreviewServer(args.directory, args.host, args.port, live_reload=args.reload, verbose=True)
+    if args.reload:
+        server.reload_on_change(args.interval)
+    print(f"Serving {args.directory} at {server.url()}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+# The modules live at the top level of the repository
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def run_git(args, cwd):
+    return subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True, check=True).stdout.strip()
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    """A clone of a local bare ``origin`` with one pushed commit.
+
+    The bare repository's post-receive hook appends a line to
+    ``<tmp_path>/pushes`` for every push it accepts.
+    """
+    origin = tmp_path / "origin.git"
+    work = tmp_path / "work"
+    run_git(["init", "-q", "--bare", "-b", "main", str(origin)], tmp_path)
+    hook = origin / "hooks" / "post-receive"
+    hook.write_text(f"#!/bin/sh\necho push >> '{tmp_path / 'pushes'}'\n")
+    hook.chmod(0o755)
+    run_git(["clone", "-q", str(origin), str(work)], tmp_path)
+    for key, value in (("user.name", "Test"), ("user.email", "test@example.com"), ("commit.gpgsign", "false")):
+        run_git(["config", key, value], work)
+    (work / "docs").mkdir()
+    (work / "docs" / "first.html").write_text("<p>first</p>\n")
+    run_git(["add", "."], work)
+    run_git(["commit", "-q", "-m", "Initial commit"], work)
+    run_git(["push", "-q", "-u", "origin", "main"], work)
+    (tmp_path / "pushes").unlink()
+    return work
+
+
+def pushes(work):
+    """Pushes the fixture's origin received since it was set up"""
+    path = work.parent / "pushes"
+    return len(path.read_text().splitlines()) if path.exists() else 0
@@ -0,0 +1,52 @@
+import hashlib
+import json
+
+from batch import create_html_batch, load_manifest
+from cache import PageCache
+
+JOBS = [{"message": "HELLO", "filename": "hello.html"}, {"message": "SNOW", "color": "#00ff00"}]
+
+
+def manifest_entries(output_dir):
+    with open(output_dir / "manifest.jsonl", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_running_a_manifest_again_replaces_its_cards(tmp_path):
+    create_html_batch(JOBS, str(tmp_path), workers=1)
+    report = create_html_batch(JOBS, str(tmp_path), workers=1)
+
+    assert report["ok"] == 2
+    entries = manifest_entries(tmp_path)
+    assert sorted(entry["file"] for entry in entries) == ["hello.html", "message-000001.html"]
+    assert (tmp_path / "index.html").read_text().count('class="card"') == 2
+    for entry in entries:
+        digest = hashlib.sha256((tmp_path / entry["file"]).read_bytes()).hexdigest()
+        assert entry["hash"] == digest[:16]
+
+
+def test_cache_hits_are_not_counted_as_rendered(tmp_path):
+    cache = PageCache(str(tmp_path))
+    create_html_batch(JOBS, workers=1, cache=cache)
+
+    report = create_html_batch(JOBS * 50, workers=1, cache=PageCache(str(tmp_path)))
+
+    assert (report["ok"], report["rendered"], report["cached"]) == (100, 0, 100)
+    assert report["pages_per_sec"] == 0
+
+
+def test_csv_messages_keep_backslashes_unless_escapes_are_on(tmp_path):
+    manifest = tmp_path / "jobs.csv"
+    manifest.write_text('message,escapes\n"\\n/\n/\\n",\n"A\\nB\\\\n",1\n', encoding="utf-8")
+
+    assert [job["message"] for job in load_manifest(str(manifest))] == ["\\n/\n/\\n", "A\nB\\n"]
+
+
+def test_filenames_cannot_leave_the_output_directory(tmp_path):
+    docs = tmp_path / "docs"
+    jobs = [{"message": "X", "filename": name} for name in ("../x.html", "a/x.html", "..", "index.html")]
+
+    report = create_html_batch(jobs, str(docs), workers=1)
+
+    assert report["failed"] == 4
+    assert not (tmp_path / "x.html").exists()
@@ -0,0 +1,69 @@
+import itertools
+
+import cache
+from cache import PageCache, page_filename
+from generator import cached_html_file
+
+
+def write_page(cache_dir, key, size):
+    path = cache_dir / page_filename(key)
+    path.write_bytes(b"x" * size)
+    return str(path)
+
+
+def test_least_recently_used_pages_are_evicted_to_fit_the_budget(tmp_path, monkeypatch):
+    clock = itertools.count()
+    monkeypatch.setattr(cache.time, "time", lambda: next(clock))
+    pages = PageCache(str(tmp_path), max_bytes=300)
+    for key in ("a", "b", "c"):
+        pages.put(key, write_page(tmp_path, key, 100))
+    # Using "a" makes "b" the least recently used page
+    assert pages.get("a") is not None
+
+    pages.put("d", write_page(tmp_path, "d", 100))
+
+    assert set(pages.entries) == {"a", "c", "d"}
+    assert not (tmp_path / page_filename("b")).exists()
+    assert pages.total_bytes() == 300
+
+
+def test_a_new_page_is_kept_even_if_it_alone_exceeds_the_budget(tmp_path):
+    pages = PageCache(str(tmp_path), max_bytes=150)
+    pages.put("a", write_page(tmp_path, "a", 100))
+    pages.put("b", write_page(tmp_path, "b", 200))
+
+    assert set(pages.entries) == {"b"}
+    assert (tmp_path / page_filename("b")).exists()
+
+
+def test_compressed_siblings_count_towards_the_budget_and_are_evicted(tmp_path, monkeypatch):
+    clock = itertools.count()
+    monkeypatch.setattr(cache.time, "time", lambda: next(clock))
+    pages = PageCache(str(tmp_path), max_bytes=250)
+    path = write_page(tmp_path, "a", 100)
+    (tmp_path / (page_filename("a") + ".gz")).write_bytes(b"x" * 50)
+    pages.put("a", path)
+    assert pages.total_bytes() == 150
+
+    pages.put("b", write_page(tmp_path, "b", 150))
+
+    assert set(pages.entries) == {"b"}
+    assert not (tmp_path / (page_filename("a") + ".gz")).exists()
+
+
+def test_index_survives_a_restart(tmp_path):
+    pages = PageCache(str(tmp_path))
+    pages.put("a", write_page(tmp_path, "a", 10))
+    pages.save()
+
+    reopened = PageCache(str(tmp_path))
+    assert reopened.get("a") == str(tmp_path / page_filename("a"))
+    assert reopened.get("missing") is None
+
+
+def test_cached_pages_can_skip_the_gallery(tmp_path):
+    pages = PageCache(str(tmp_path))
+    path, hit = cached_html_file(pages, "HELLO", manifest=False)
+    assert not hit
+    assert cached_html_file(pages, "HELLO", manifest=True) == (path, True)
+    assert not (tmp_path / "manifest.jsonl").exists()
@@ -0,0 +1,119 @@
+import os
+import threading
+import time
+
+import gallery
+from conftest import pushes, run_git
+from deploy import DeployQueue
+from gallery import Gallery, gallery_files
+from generator import create_html_file
+
+
+class Events:
+    """Collects DeployQueue notifications from the worker thread"""
+
+    def __init__(self):
+        self.items = []
+        self.lock = threading.Lock()
+
+    def __call__(self, event, payload):
+        with self.lock:
+            self.items.append((event, payload))
+
+    def of(self, kind):
+        return [payload for event, payload in self.items if event == kind]
+
+
+def write_page(work, name, text):
+    path = work / "docs" / name
+    path.write_text(text)
+    return str(path)
+
+
+def test_pages_within_the_window_become_one_commit_and_one_push(git_repo):
+    events = Events()
+    deploys = DeployQueue(events, cwd=git_repo, window=0.5)
+    for i in range(3):
+        deploys.submit(write_page(git_repo, f"page-{i}.html", f"<p>{i}</p>\n"))
+    deploys.close(timeout=30)
+
+    assert events.of("error") == []
+    [result] = events.of("done")
+    assert len(result["files"]) == 3
+    assert run_git(["rev-list", "--count", "main"], git_repo.parent / "origin.git") == "2"
+    assert run_git(["rev-parse", "main"], git_repo.parent / "origin.git") == result["commit"]
+    assert pushes(git_repo) == 1
+    assert run_git(["status", "--porcelain"], git_repo) == ""
+
+
+def test_failed_push_is_reported_and_retried_with_the_next_batch(git_repo):
+    origin = str(git_repo.parent / "origin.git")
+    run_git(["remote", "set-url", "origin", str(git_repo.parent / "missing.git")], git_repo)
+    events = Events()
+    deploys = DeployQueue(events, cwd=git_repo, window=0.1)
+    page = write_page(git_repo, "page.html", "<p>page</p>\n")
+    deploys.submit(page)
+    deploys.close(timeout=30)
+
+    [error] = events.of("error")
+    assert "Failed to deploy" in error
+    assert pushes(git_repo) == 0
+
+    # Resubmitting the already committed page pushes the pending commit
+    run_git(["remote", "set-url", "origin", origin], git_repo)
+    events = Events()
+    deploys = DeployQueue(events, cwd=git_repo, window=0.1)
+    deploys.submit(page)
+    deploys.close(timeout=30)
+
+    assert events.of("error") == []
+    [result] = events.of("done")
+    assert result["commit"] == run_git(["rev-parse", "HEAD"], git_repo)
+    assert run_git(["rev-parse", "main"], origin) == result["commit"]
+    assert pushes(git_repo) == 1
+
+
+def test_gallery_files_are_deployed_with_the_page(git_repo, monkeypatch):
+    monkeypatch.setattr(gallery, "PAGE_SIZE", 1)
+    docs = str(git_repo / "docs")
+    events = Events()
+    deploys = DeployQueue(events, cwd=git_repo, window=0.1)
+    for message in ("ONE", "TWO"):
+        deploys.submit(create_html_file(message, filename=f"{message}.html", output_dir=docs), *gallery_files(docs))
+    deploys.close(timeout=30)
+
+    assert events.of("error") == []
+    assert [result["files"] for result in events.of("done")] == [[f"{docs}/ONE.html", f"{docs}/TWO.html"]]
+    tree = run_git(["ls-tree", "-r", "--name-only", "main"], git_repo.parent / "origin.git").split("\n")
+    assert {"docs/index.html", "docs/index-2.html", "docs/manifest.jsonl", "docs/.gallery-state.json"} <= set(tree)
+    assert any(path.startswith("docs/thumbs/") for path in tree)
+
+    # Removing a page shrinks the gallery; the dropped gallery page is deleted on the remote too
+    os.remove(f"{docs}/TWO.html")
+    Gallery(docs).remove(["TWO.html"])
+    events = Events()
+    deploys = DeployQueue(events, cwd=git_repo, window=0.1)
+    deploys.submit(create_html_file("ONE AGAIN", filename="ONE.html", output_dir=docs), *gallery_files(docs))
+    deploys.close(timeout=30)
+
+    assert events.of("error") == []
+    tree = run_git(["ls-tree", "-r", "--name-only", "main"], git_repo.parent / "origin.git").split("\n")
+    assert "docs/index-2.html" not in tree
+    assert run_git(["status", "--porcelain", "--", "docs/index*.html"], git_repo) == ""
+
+
+def test_closing_without_waiting_still_deploys_the_queued_page(git_repo):
+    events = Events()
+    # A window far longer than the test: closing must cut it short
+    deploys = DeployQueue(events, cwd=git_repo, window=60)
+    deploys.submit(write_page(git_repo, "late.html", "<p>late</p>\n"))
+    deploys.close(timeout=0)
+
+    deadline = time.monotonic() + 30
+    while deploys.is_alive() and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    assert not deploys.is_alive()
+    [result] = events.of("done")
+    assert result["commit"] == run_git(["rev-parse", "main"], git_repo.parent / "origin.git")
+    assert pushes(git_repo) == 1
@@ -0,0 +1,85 @@
+import json
+import os
+
+import gallery
+from cache import PageCache
+from gallery import Gallery, gallery_page_name, page_entry
+from generator import cached_html_file, create_html_file
+
+
+def manifest_files(output_dir):
+    with open(output_dir / "manifest.jsonl", encoding="utf-8") as f:
+        return [json.loads(line)["file"] for line in f]
+
+
+def add_pages(output_dir, names):
+    pages = Gallery(str(output_dir))
+    for name in names:
+        path = output_dir / name
+        path.write_text(name)
+        pages.add([page_entry(str(path), name, "#ff3366", 1, "0" * 64)])
+
+
+def test_gallery_rolls_over_to_a_new_page_at_page_size(tmp_path, monkeypatch):
+    monkeypatch.setattr(gallery, "PAGE_SIZE", 3)
+    add_pages(tmp_path, [f"p{i}.html" for i in range(3)])
+    assert (tmp_path / "index.html").exists()
+    assert not (tmp_path / "index-2.html").exists()
+
+    add_pages(tmp_path, ["p3.html"])
+
+    first = (tmp_path / "index.html").read_text()
+    second = (tmp_path / "index-2.html").read_text()
+    assert [f'href="p{i}.html"' in first for i in range(4)] == [True, True, True, False]
+    assert 'href="p3.html"' in second
+    assert 'href="index-2.html"' in first and 'href="index.html"' in second
+
+
+def test_regenerating_a_page_replaces_its_card(tmp_path):
+    create_html_file("ONE", output_dir=str(tmp_path))
+    create_html_file("OTHER", filename="other.html", output_dir=str(tmp_path))
+    create_html_file("TWO", output_dir=str(tmp_path))
+
+    # The card keeps its place
+    assert manifest_files(tmp_path) == ["winter_led.html", "other.html"]
+    assert (tmp_path / "index.html").read_text().count('href="winter_led.html"') == 1
+
+
+def test_evicted_pages_leave_the_gallery(tmp_path, monkeypatch):
+    monkeypatch.setattr(gallery, "PAGE_SIZE", 1)
+    pages = PageCache(str(tmp_path), max_bytes=1)
+    first, _ = cached_html_file(pages, "FIRST")
+    second, _ = cached_html_file(pages, "SECOND")
+
+    assert manifest_files(tmp_path) == [os.path.basename(second)]
+    assert os.path.basename(first) not in (tmp_path / "index.html").read_text()
+    # The second gallery page from before the eviction is gone
+    assert not (tmp_path / gallery_page_name(1)).exists()
+
+
+def test_a_regenerated_card_is_updated_in_place(tmp_path, monkeypatch):
+    monkeypatch.setattr(gallery, "PAGE_SIZE", 2)
+    add_pages(tmp_path, [f"p{i}.html" for i in range(5)])
+    for name in ("index.html", "index-2.html", "index-3.html"):
+        os.utime(tmp_path / name, ns=(0, 0))
+    size = (tmp_path / "manifest.jsonl").stat().st_size
+
+    Gallery(str(tmp_path)).add([page_entry(str(tmp_path / "p1.html"), "NEW", "#00ff00", 2, "1" * 64)], replace=True)
+
+    assert manifest_files(tmp_path) == [f"p{i}.html" for i in range(5)]
+    assert (tmp_path / "manifest.jsonl").stat().st_size == size
+    assert "NEW" in (tmp_path / "index.html").read_text()
+    # Only the card's page and the last page are written
+    assert (tmp_path / "index-2.html").stat().st_mtime_ns == 0
+
+
+def test_a_card_that_outgrows_its_line_moves_to_the_end(tmp_path, monkeypatch):
+    monkeypatch.setattr(gallery, "PAGE_SIZE", 2)
+    add_pages(tmp_path, [f"p{i}.html" for i in range(3)])
+
+    entry = page_entry(str(tmp_path / "p0.html"), "LONG " * 20, "#00ff00", 2, "1" * 64)
+    Gallery(str(tmp_path)).add([entry], replace=True)
+
+    assert manifest_files(tmp_path) == ["p1.html", "p2.html", "p0.html"]
+    assert 'href="p0.html"' in (tmp_path / "index-2.html").read_text()
+    assert 'href="p0.html"' not in (tmp_path / "index.html").read_text()
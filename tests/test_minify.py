@@ -0,0 +1,42 @@
+from minify import minify_css, minify_js
+
+
+def test_line_breaks_that_end_statements_are_kept():
+    # Joining these lines would return (x), or turn a; ++b into a++ b
+    assert minify_js("return\n(x)") == "return\n(x)\n"
+    assert minify_js("a\n++b") == "a\n++b\n"
+    assert minify_js("f(a,\n  b);\nx = 1") == "f(a,b);x=1\n"
+
+
+def test_operators_that_would_merge_keep_a_space():
+    assert minify_js("a + +b") == "a+ +b\n"
+    assert minify_js("a - -b") == "a- -b\n"
+
+
+def test_regex_literals_are_copied_verbatim():
+    assert minify_js("s.replace(/ +/g, ' ')") == "s.replace(/ +/g,' ')\n"
+    assert minify_js("const r = /[/*]\\/ x/i; // note") == "const r=/[/*]\\/ x/i;\n"
+    assert minify_js("return /a b/.test(s)") == "return/a b/.test(s)\n"
+
+
+def test_slashes_after_operands_are_division():
+    assert minify_js("x = a / b / 2") == "x=a/b/2\n"
+    assert minify_js("y = (a) / 2 + arr[0] / 3") == "y=(a)/2+arr[0]/3\n"
+    assert minify_js("z = i++ / 2") == "z=i++/2\n"
+
+
+def test_template_literals_keep_their_text_and_minify_their_expressions():
+    source = "const s = `a  ${ f( x ) }  b ${ {k: 1}.k } // not a comment`;"
+    assert minify_js(source) == "const s=`a  ${f(x)}  b ${{k:1}.k} // not a comment`;\n"
+    assert minify_js("`${ `inner ${ x }` }  end`") == "`${`inner ${x}`}  end`\n"
+
+
+def test_strings_and_comments():
+    assert minify_js("a = 'it\\'s  // here' /* gone */ + \"b\"") == "a='it\\'s  // here'+\"b\"\n"
+
+
+def test_css_keeps_the_space_before_a_pseudo_class():
+    assert minify_css("div :hover { color: red; }") == "div :hover{color:red}\n"
+    assert minify_css("a:hover > b,\n.c::before {margin: 0}") == "a:hover > b,.c::before{margin:0}\n"
+    assert minify_css("@media (max-width: 768px) { p { font-size: 5vw; } }") == \
+        "@media (max-width:768px){p{font-size:5vw}}\n"
@@ -0,0 +1,36 @@
+import tracemalloc
+
+import pytest
+
+from gallery import page_inputs
+from generator import create_html_file
+from page import center_lines, write_chunks
+
+
+def test_very_large_art_is_streamed_to_disk(tmp_path):
+    art = "\n".join("*" * (i % 200) for i in range(50000))
+    # Compile the template first so only the page itself is measured
+    create_html_file("warm up", output_dir=str(tmp_path), manifest=False)
+    tracemalloc.start()
+    try:
+        path = create_html_file(art, filename="large.html", output_dir=str(tmp_path), manifest=False)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    assert page_inputs(path)["message"] == "\n".join(center_lines(art))
+    assert not list(tmp_path.glob("*.tmp"))
+    # Joining the page in memory would take more than a copy of the art
+    assert peak < len(art)
+
+
+def test_a_failed_write_leaves_no_temporary_files(tmp_path):
+    def chunks():
+        yield "<html>"
+        raise RuntimeError("render failed")
+
+    path = tmp_path / "page.html"
+    with pytest.raises(RuntimeError):
+        write_chunks(str(path), chunks(), precompress=True)
+
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,30 @@
+import json
+
+from gallery import page_inputs
+from generator import create_playlist_file
+
+
+def manifest_entries(output_dir):
+    with open(output_dir / "manifest.jsonl", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_playlists_sharing_a_first_item_stay_distinct(tmp_path):
+    one = create_playlist_file(["HELLO", "SNOW"], filename="one.html", output_dir=str(tmp_path))
+    two = create_playlist_file(["HELLO", "LIGHTS"], filename="two.html", output_dir=str(tmp_path))
+
+    # The first item is only what the gallery card and poster show
+    assert page_inputs(one)["message"] == page_inputs(two)["message"] == "HELLO"
+    entries = manifest_entries(tmp_path)
+    assert [entry["file"] for entry in entries] == ["one.html", "two.html"]
+    assert entries[0]["hash"] != entries[1]["hash"]
+
+
+def test_regenerating_a_playlist_writes_its_new_items(tmp_path):
+    create_playlist_file(["HELLO", "SNOW"], output_dir=str(tmp_path))
+    path = create_playlist_file(["HELLO", "LIGHTS"], output_dir=str(tmp_path))
+
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    assert '"LIGHTS"' in text and '"SNOW"' not in text
+    assert [entry["file"] for entry in manifest_entries(tmp_path)] == ["playlist.html"]
@@ -0,0 +1,21 @@
+import queue
+
+from preview import PreviewWriter
+
+
+def test_a_failed_write_is_reported_and_later_previews_still_work(tmp_path):
+    events = queue.Queue()
+    path = tmp_path / "missing" / "preview.html"
+    writer = PreviewWriter(str(path), notify=lambda p: events.put(("written", p)),
+                           on_error=lambda e: events.put(("error", e)))
+    try:
+        writer.submit("HELLO", "#ff3366", 5)
+        event, error = events.get(timeout=10)
+        assert event == "error" and isinstance(error, OSError)
+
+        path.parent.mkdir()
+        writer.submit("HELLO AGAIN", "#ff3366", 5)
+        assert events.get(timeout=10) == ("written", str(path))
+        assert "HELLO AGAIN" in path.read_text(encoding="utf-8")
+    finally:
+        writer.close(timeout=10)
@@ -0,0 +1,39 @@
+from conftest import pushes, run_git
+from deploy import publish_pages
+
+
+def test_pages_are_published_in_one_commit_and_one_push(git_repo):
+    docs = git_repo / "docs"
+    for i in range(5):
+        (docs / f"page-{i}.html").write_text(f"<p>{i}</p>\n")
+    (docs / ".page-cache.json").write_text("{}")
+
+    result = publish_pages("docs", cwd=str(git_repo))
+
+    origin = git_repo.parent / "origin.git"
+    assert run_git(["rev-list", "--count", "main"], origin) == "2"
+    assert run_git(["rev-parse", "main"], origin) == result["commit"]
+    assert pushes(git_repo) == 1
+    assert sorted(result["files"]) == [f"docs/page-{i}.html" for i in range(5)]
+    assert "docs/.page-cache.json" not in run_git(["ls-tree", "-r", "--name-only", "main"], origin)
+    assert run_git(["status", "--porcelain", "--untracked-files=no"], git_repo) == ""
+
+
+def test_deleted_pages_are_removed_from_head(git_repo):
+    docs = git_repo / "docs"
+    (docs / "kept.html").write_text("<p>kept</p>\n")
+    (docs / "evicted.html").write_text("<p>evicted</p>\n")
+    publish_pages("docs", cwd=str(git_repo))
+
+    (docs / "evicted.html").unlink()
+    (docs / "kept.html").write_text("<p>kept, changed</p>\n")
+    result = publish_pages("docs", cwd=str(git_repo))
+
+    assert result["files"] == ["docs/kept.html"]
+    assert result["deleted"] == ["docs/evicted.html"]
+    tree = run_git(["ls-tree", "-r", "--name-only", "HEAD"], git_repo).split("\n")
+    assert "docs/evicted.html" not in tree and "docs/kept.html" in tree
+    assert run_git(["rev-parse", "main"], git_repo.parent / "origin.git") == result["commit"]
+    assert pushes(git_repo) == 2
+    assert run_git(["status", "--porcelain"], git_repo) == ""
+    assert publish_pages("docs", cwd=str(git_repo))["commit"] is None
@@ -0,0 +1,52 @@
+import tracemalloc
+
+import pytest
+
+from generator import create_html_file
+from raster import LED_COLOR, frame_png, parse_color, render_posters
+
+ART = "*\n*****\n*********"
+
+
+def test_posters_keep_the_page_centering(tmp_path):
+    create_html_file(ART, filename="message-tree.html", output_dir=str(tmp_path))
+
+    report = render_posters(str(tmp_path), size="thumb", workers=1)
+
+    assert report["rendered"] == 1
+    poster = tmp_path / "posters" / "thumb" / "message-tree.png"
+    assert poster.read_bytes() == frame_png(ART, size="thumb")
+
+
+def peak_bytes(message):
+    tracemalloc.start()
+    try:
+        frame_png(message, size="thumb")
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_only_the_visible_part_of_large_art_is_rasterized():
+    art = "\n".join("#" * (i % 200) for i in range(50000))
+    # The scenery layer is built once per process; leave it out of the measure
+    frame_png("x", size="thumb")
+    small = peak_bytes("x")
+
+    # Rasterizing the whole box would take gigabytes
+    assert peak_bytes(art) - small < 4 * len(art)
+
+
+def test_css_colors_the_page_accepts_are_parsed():
+    assert parse_color("rgb(255, 0, 0)").tolist() == [255, 0, 0]
+    assert parse_color("rgba(0 128 255 / 50%)").tolist() == [0, 128, 255]
+    assert parse_color("rgb(100%, 0%, 50%)").tolist() == [255, 0, 127.5]
+    assert parse_color("#00ff0080").tolist() == [0, 255, 0]
+
+
+def test_unknown_colors_fall_back_to_the_led_color():
+    with pytest.warns(UserWarning, match="gold"):
+        rgb = parse_color("gold")
+    assert rgb.tolist() == parse_color(LED_COLOR).tolist()
+    with pytest.warns(UserWarning):
+        frame_png(ART, color="#zzzzzz", size="thumb")
@@ -0,0 +1,63 @@
+import urllib.error
+import urllib.request
+
+import pytest
+
+from server import PreviewServer
+
+
+@pytest.fixture
+def server(tmp_path):
+    (tmp_path / "page.html").write_text("<p>hello</p>\n")
+    server = PreviewServer(str(tmp_path), live_reload=False).start()
+    yield server
+    server.stop()
+
+
+def fetch(url, **headers):
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=10) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+def test_matching_if_none_match_gets_304(server):
+    status, headers, body = fetch(server.url("page.html"))
+    assert status == 200 and body == b"<p>hello</p>\n"
+
+    status, _, body = fetch(server.url("page.html"), **{"If-None-Match": headers["ETag"]})
+    assert status == 304 and body == b""
+
+
+def test_changed_file_gets_a_new_etag(server, tmp_path):
+    _, headers, _ = fetch(server.url("page.html"))
+    (tmp_path / "page.html").write_text("<p>changed page</p>\n")
+
+    status, new_headers, body = fetch(server.url("page.html"), **{"If-None-Match": headers["ETag"]})
+    assert status == 200 and body == b"<p>changed page</p>\n"
+    assert new_headers["ETag"] != headers["ETag"]
+
+
+def test_gzip_representation_has_its_own_etag(server):
+    _, plain, _ = fetch(server.url("page.html"))
+    status, gzipped, _ = fetch(server.url("page.html"), **{"Accept-Encoding": "gzip"})
+    assert status == 200 and gzipped["Content-Encoding"] == "gzip"
+    assert gzipped["ETag"] != plain["ETag"]
+    assert fetch(server.url("page.html"), **{"Accept-Encoding": "gzip", "If-None-Match": gzipped["ETag"]})[0] == 304
+
+
+def test_reload_on_change_notifies_open_pages(tmp_path):
+    (tmp_path / "page.html").write_text("<p>hello</p>\n")
+    server = PreviewServer(str(tmp_path)).reload_on_change(0.05).start()
+    try:
+        with urllib.request.urlopen(server.url("__reload"), timeout=10) as events:
+            # Sent once the stream is subscribed
+            assert events.readline().startswith(b"retry:")
+            (tmp_path / "page.html").write_text("<p>changed page</p>\n")
+            line = events.readline()
+            while not line.startswith(b"data:"):
+                line = events.readline()
+        assert line == b"data: page.html\n"
+    finally:
+        server.stop()
@@ -0,0 +1,112 @@
+import json
+import os
+
+from gallery import page_inputs
+from watch import ArtWatcher
+
+
+def manifest_files(output_dir):
+    with open(output_dir / "manifest.jsonl", encoding="utf-8") as f:
+        return [json.loads(line)["file"] for line in f]
+
+
+def touch_later(path):
+    # Make sure the stat signature changes even on coarse mtime clocks
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+def test_added_sources_become_listed_pages(tmp_path):
+    art, docs = tmp_path / "art", tmp_path / "docs"
+    (art / "trees").mkdir(parents=True)
+    (art / "star.txt").write_text("\n  *\n\n")
+    (art / "trees" / "fir.txt").write_text("^")
+    (art / "trees" / "fir.json").write_text('{"color": "#00FF00", "delay": 2}')
+
+    report = ArtWatcher(str(art), str(docs)).scan()
+
+    assert sorted(report["written"]) == ["star.html", "trees-fir.html"]
+    assert page_inputs(docs / "star.html")["message"] == "  *"
+    fir = page_inputs(docs / "trees-fir.html")
+    assert (fir["color"], fir["delay"]) == ("#00ff00", 2)
+    assert sorted(manifest_files(docs)) == ["star.html", "trees-fir.html"]
+
+
+def test_modified_sources_are_regenerated_once(tmp_path):
+    art, docs = tmp_path / "art", tmp_path / "docs"
+    art.mkdir()
+    (art / "star.txt").write_text("*")
+    (art / "moon.txt").write_text("(")
+    ArtWatcher(str(art), str(docs)).scan()
+
+    (art / "star.txt").write_text("**")
+    touch_later(art / "star.txt")
+    touch_later(art / "moon.txt")
+    # A new watcher reads the index the first one left behind
+    watcher = ArtWatcher(str(art), str(docs))
+    report = watcher.scan()
+
+    assert report["written"] == ["star.html"]
+    assert report["unchanged"] == 1
+    assert page_inputs(docs / "star.html")["message"] == "**"
+    assert sorted(manifest_files(docs)) == ["moon.html", "star.html"]
+    assert watcher.update([str(art / "star.txt")])["unchanged"] == 1
+
+
+def test_removed_sources_take_their_pages_with_them(tmp_path):
+    art, docs = tmp_path / "art", tmp_path / "docs"
+    (art / "trees").mkdir(parents=True)
+    (art / "star.txt").write_text("*")
+    (art / "trees" / "fir.txt").write_text("^")
+    watcher = ArtWatcher(str(art), str(docs), precompress=True)
+    watcher.scan()
+
+    (art / "star.txt").unlink()
+    report = watcher.update([str(art / "star.txt")])
+
+    assert report["removed"] == ["star.html"]
+    assert not (docs / "star.html").exists() and not (docs / "star.html.gz").exists()
+    assert manifest_files(docs) == ["trees-fir.html"]
+    assert 'href="star.html"' not in (docs / "index.html").read_text()
+
+    (art / "trees" / "fir.txt").unlink()
+    (art / "trees").rmdir()
+    assert watcher.update([str(art / "trees")])["removed"] == ["trees-fir.html"]
+    assert manifest_files(docs) == []
+
+
+def test_bad_sidecars_are_reported(tmp_path):
+    art, docs = tmp_path / "art", tmp_path / "docs"
+    art.mkdir()
+    for name, sidecar in (("a", '{"color": 123}'), ("b", '{"delay": []}'), ("c", "[1]"), ("d", "{")):
+        (art / f"{name}.txt").write_text(name)
+        (art / f"{name}.json").write_text(sidecar)
+    (art / "e.txt").write_text("e")
+
+    report = ArtWatcher(str(art), str(docs)).scan()
+
+    assert [name for name, _ in report["errors"]] == ["a.txt", "b.txt", "c.txt", "d.txt"]
+    assert report["written"] == ["e.html"]
+
+
+def test_sources_cannot_overwrite_other_pages(tmp_path):
+    art, docs = tmp_path / "art", tmp_path / "docs"
+    (art / "a").mkdir(parents=True)
+    (art / "a-b.txt").write_text("dash")
+    (art / "a" / "b.txt").write_text("slash")
+    (art / "index.txt").write_text("index")
+    watcher = ArtWatcher(str(art), str(docs))
+
+    report = watcher.scan()
+
+    assert report["written"] == ["a-b.html"]
+    assert sorted(name for name, _ in report["errors"]) == ["a/b.txt", "index.txt"]
+    assert page_inputs(docs / "a-b.html")["message"] == "dash"
+    assert 'href="a-b.html"' in (docs / "index.html").read_text()
+
+    # Once the first source is gone, the other one can have the page
+    (art / "a-b.txt").unlink()
+    report = watcher.update([str(art / "a-b.txt"), str(art / "a" / "b.txt")])
+    assert (report["removed"], report["written"]) == (["a-b.html"], ["a-b.html"])
+    assert page_inputs(docs / "a-b.html")["message"] == "slash"
+    assert manifest_files(docs) == ["a-b.html"]
@@ -0,0 +1,154 @@
+"""Precomputed textures for the winter scene.
+
+Python ports of the engine's ``generateTreeTexture`` and
+``generateChristmasTreeTexture``, computed with NumPy array operations from a
+fixed seed and encoded as PNG, so the page only has to decode an image
+instead of issuing one ``fillRect`` per pixel at load time.
+
+Requires NumPy.
+"""
+import base64
+import struct
+import zlib
+
+import numpy as np
+
+# Must match `dpr` in the generated engine
+TEXTURE_DPR = 0.5
+TEXTURE_SEED = 2025
+
+
+def hsl_to_rgb(h, s, l):
+    """Vectorised CSS hsl() -> uint8 RGB; h in degrees, s and l in 0..1"""
+    l = np.asarray(l, dtype=np.float64)
+    a = s * np.minimum(l, 1 - l)
+    channels = []
+    for n in (0, 8, 4):
+        k = (n + h / 30) % 12
+        channels.append(l - a * np.clip(np.minimum(k - 3, 9 - k), -1, 1))
+    return np.rint(np.stack(channels, axis=-1) * 255).astype(np.uint8)
+
+
+def tree_texture(dpr=TEXTURE_DPR, seed=TEXTURE_SEED):
+    """RGBA array for the round snowy tree sprite (generateTreeTexture)"""
+    size = int(300 * dpr)
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:size, 0:size]
+    c = size / 2
+    inside = np.hypot(x - c, y - c) < c * (0.7 + rng.random((size, size)) * 0.3)
+    w = rng.random((size, size))
+    h = 1 - y / size
+    # Whole-percent lightness keeps the palette small, which keeps the PNG small
+    lightness = np.rint(30 + w * 70 * h) / 100
+
+    rgba = np.zeros((size, size, 4), dtype=np.uint8)
+    rgba[..., :3] = hsl_to_rgb(206, 0.69, lightness)
+    rgba[..., 3] = np.where(inside, 255, 0)
+    rgba[~inside, :3] = 0
+    return rgba
+
+
+def _fill_polygon(rgba, points, color):
+    """Fill a polygon (nonzero rule, sampled at pixel centres) with an RGB color"""
+    height, width = rgba.shape[:2]
+    py, px = np.mgrid[0:height, 0:width] + 0.5
+    winding = np.zeros((height, width), dtype=np.int32)
+    for (x0, y0), (x1, y1) in zip(points, points[1:] + points[:1]):
+        if y0 == y1:
+            continue
+        cross = (x1 - x0) * (py - y0) - (px - x0) * (y1 - y0)
+        upward = (y0 <= py) & (py < y1) & (cross > 0)
+        downward = (y1 <= py) & (py < y0) & (cross < 0)
+        winding += upward.astype(np.int32) - downward.astype(np.int32)
+    mask = winding != 0
+    rgba[mask, :3] = color
+    rgba[mask, 3] = 255
+
+
+def christmas_tree_texture(dpr=TEXTURE_DPR):
+    """RGBA array for the layered Christmas tree sprite (generateChristmasTreeTexture)"""
+    width = int(200 * dpr)
+    height = int(300 * dpr)
+    rgba = np.zeros((height, width, 4), dtype=np.uint8)
+
+    def draw_triangle(x1, y1, x2, y2, x3, y3, color):
+        _fill_polygon(rgba, [(x1, y1), (x1 + (x2 - x1) * 0.5, y1 * 1.15), (x2, y2), (x3, y3)], color)
+
+    base_x = width / 2
+    base_y = height
+    levels = 5
+    for i in range(levels):
+        level_height = height / levels
+        level_width = width - (i * width) / levels
+        top_y = base_y - (i + 1) * level_height
+        left_x = base_x - level_width / 2
+        right_x = base_x + level_width / 2
+        bottom_y = base_y - i * level_height
+
+        dark = hsl_to_rgb(204, 0.67, (24 + i * 5) / 100)
+        draw_triangle(left_x, bottom_y + 2, right_x, bottom_y + 2, base_x, top_y, dark)
+        snow = hsl_to_rgb(204, 0.67, (50 + i * 5) / 100)
+        draw_triangle(left_x, bottom_y - 2, right_x, bottom_y - 2, base_x, top_y, snow)
+    return rgba
+
+
+def _png_chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+
+def encode_png(rgba, level=9):
+    """Encode an RGBA (or RGB) uint8 array as PNG bytes, deflated at zlib ``level``.
+
+    RGBA images with at most 256 distinct colors are written as indexed PNGs
+    with a transparency chunk, which is several times smaller for sprites like
+    these. RGB images (rendered frames) are written as truecolor with the Up
+    filter, which turns the repeated rows of an upscaled frame into zeros.
+    """
+    rgba = np.ascontiguousarray(rgba, dtype=np.uint8)
+    height, width, channels = rgba.shape
+    filter_type = 0
+
+    if channels == 3:
+        header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+        rows = rgba.reshape(height, width * 3)
+        # Up: each byte minus the one above it, modulo 256
+        rows = np.vstack([rows[:1], rows[1:] - rows[:-1]])
+        filter_type = 2
+        chunks = [_png_chunk(b"IHDR", header)]
+    else:
+        packed = rgba.view(np.uint32).reshape(height, width)
+        colors, indices = np.unique(packed, return_inverse=True)
+        if len(colors) <= 256:
+            palette = colors.view(np.uint8).reshape(-1, 4)
+            header = struct.pack(">IIBBBBB", width, height, 8, 3, 0, 0, 0)
+            rows = indices.reshape(height, width).astype(np.uint8)
+            chunks = [
+                _png_chunk(b"IHDR", header),
+                _png_chunk(b"PLTE", palette[:, :3].tobytes()),
+                _png_chunk(b"tRNS", palette[:, 3].tobytes()),
+            ]
+        else:
+            header = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+            rows = rgba.reshape(height, width * 4)
+            chunks = [_png_chunk(b"IHDR", header)]
+
+    # The same filter type on every scanline
+    raw = np.hstack([np.full((height, 1), filter_type, dtype=np.uint8), rows]).tobytes()
+    chunks.append(_png_chunk(b"IDAT", zlib.compress(raw, level)))
+    chunks.append(_png_chunk(b"IEND", b""))
+    return b"\x89PNG\r\n\x1a\n" + b"".join(chunks)
+
+
+def png_data_uri(png):
+    """Inline PNG bytes as a data: URI"""
+    return "data:image/png;base64," + base64.b64encode(png).decode("ascii")
+
+
+def scene_textures(dpr=TEXTURE_DPR, seed=TEXTURE_SEED):
+    """PNG bytes and sizes for the engine's two sprites, keyed by engine variable name"""
+    textures = {}
+    for name, rgba in (("threeCanvas", tree_texture(dpr, seed)),
+                       ("christmassThreeCanvas", christmas_tree_texture(dpr))):
+        height, width = rgba.shape[:2]
+        textures[name] = (encode_png(rgba), width, height)
+    return textures
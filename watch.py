@@ -0,0 +1,301 @@
+"""Keep pages in sync with a folder of ascii art files.
+
+Each ``<name>.txt`` in the source directory becomes ``<name>.html`` in the
+output directory (files in subfolders become ``<folder>-<name>.html``). An
+optional sidecar ``<name>.json`` sets the page's ``color`` and ``delay``.
+Sources that would overwrite another source's page (``a-b.txt`` and
+``a/b.txt``) or a gallery page (``index.txt``) are reported as errors and
+skipped.
+
+A persistent index (``.watch-index.json`` in the output directory) maps
+each source to its stat signature, the content hash of its page inputs
+(see cache.page_key) and its output file. The startup scan compares every
+source against it, rereading only files whose size or mtime changed and
+regenerating only pages whose inputs did. After that, file system events
+name the changed sources, so the work per change is proportional to the
+files that changed; outputs whose sources were removed are deleted.
+
+Written pages are listed in the gallery like any other generated page (see
+gallery.py), and taken off it when their source is removed. ``gallery.py
+--rebuild`` only rescans ``message-*.html`` pages, so after a rebuild a
+watched page is listed again the next time it is regenerated.
+
+Events come from the ``watchdog`` package when it is installed; without
+it, the source directory is polled with ``stat`` calls instead, which
+still only reads and regenerates changed files.
+
+Usage:
+    python watch.py art --output-dir docs
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+
+from cache import COMPRESSED_SUFFIXES, normalize_inputs, page_key
+from gallery import Gallery, is_gallery_page
+from generator import create_html_file
+from page import write_atomic
+
+INDEX_NAME = ".watch-index.json"
+ART_SUFFIX = ".txt"
+SIDECAR_SUFFIX = ".json"
+DEFAULT_COLOR = "#ff3366"
+DEFAULT_DELAY = 5
+
+
+def _signature(path):
+    """(mtime_ns, size) of a file, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+class ArtWatcher:
+    """Regenerates the pages of one source directory as its files change.
+
+    ``options`` are create_html_file keyword arguments (other than the
+    inputs, ``filename`` and ``output_dir``).
+    """
+
+    def __init__(self, source_dir, output_dir="docs", **options):
+        self.source_dir = os.path.abspath(source_dir)
+        self.output_dir = output_dir
+        self.options = options
+        self.index_path = os.path.join(output_dir, INDEX_NAME)
+        self.entries = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding="utf-8") as f:
+                self.entries = json.load(f)
+        # Output file -> source, to catch two sources mapping to one page
+        self.outputs = {entry["file"]: name for name, entry in self.entries.items()}
+
+    def source_name(self, path):
+        """Index key (source path relative to the source directory) for an art or sidecar file"""
+        rel = os.path.relpath(os.path.abspath(path), self.source_dir).replace(os.sep, "/")
+        if rel.endswith(SIDECAR_SUFFIX):
+            rel = rel[:-len(SIDECAR_SUFFIX)] + ART_SUFFIX
+        return rel if rel.endswith(ART_SUFFIX) and not rel.startswith("../") else None
+
+    def output_name(self, name):
+        return name[:-len(ART_SUFFIX)].replace("/", "-") + ".html"
+
+    def _read_inputs(self, name):
+        art_path = os.path.join(self.source_dir, name)
+        with open(art_path, encoding="utf-8") as f:
+            # Same as the GUI: surrounding blank lines are not part of the art
+            message = f.read().strip("\n")
+        settings = {}
+        sidecar = art_path[:-len(ART_SUFFIX)] + SIDECAR_SUFFIX
+        if os.path.exists(sidecar):
+            with open(sidecar, encoding="utf-8") as f:
+                settings = json.load(f)
+        # Hand-edited sidecars are reported like any other bad input, not allowed to stop the watch
+        if not isinstance(settings, dict):
+            raise ValueError(f"{os.path.basename(sidecar)} must hold a JSON object")
+        color, delay = settings.get("color", DEFAULT_COLOR), settings.get("delay", DEFAULT_DELAY)
+        if not isinstance(color, str):
+            raise ValueError(f"{os.path.basename(sidecar)}: color must be a string, not {color!r}")
+        if isinstance(delay, bool) or not isinstance(delay, (int, float, str)):
+            raise ValueError(f"{os.path.basename(sidecar)}: delay must be a number, not {delay!r}")
+        return normalize_inputs(message, color, delay)
+
+    def scan(self):
+        """Full reconcile against the index; run once at startup"""
+        names = set()
+        for root, dirs, files in os.walk(self.source_dir):
+            dirs[:] = [d for d in dirs if not d.startswith(".")]
+            for filename in files:
+                if filename.endswith(ART_SUFFIX) and not filename.startswith("."):
+                    names.add(self.source_name(os.path.join(root, filename)))
+        return self.update_names(names | set(self.entries))
+
+    def update(self, paths):
+        """Bring the pages for these changed source, sidecar or directory paths up to date"""
+        names = set()
+        for path in paths:
+            name = self.source_name(path)
+            if name:
+                names.add(name)
+            else:
+                # A removed or renamed directory: everything indexed under it
+                prefix = os.path.relpath(os.path.abspath(path), self.source_dir).replace(os.sep, "/") + "/"
+                names.update(entry for entry in self.entries if entry.startswith(prefix))
+        return self.update_names(names)
+
+    def update_names(self, names):
+        report = {"written": [], "removed": [], "unchanged": 0, "errors": []}
+        # Removals go first, so a page freed by one source can be written for another in the same pass
+        removed = {name for name in names if _signature(os.path.join(self.source_dir, name)) is None}
+        for name in sorted(removed):
+            self._run(self._remove_one, name, report)
+        if report["removed"]:
+            Gallery(self.output_dir).remove(report["removed"])
+        for name in sorted(set(names) - removed):
+            self._run(self._update_one, name, report)
+        if names:
+            os.makedirs(self.output_dir, exist_ok=True)
+            write_atomic(self.index_path, json.dumps(self.entries, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+        return report
+
+    def _run(self, step, name, report):
+        try:
+            step(name, report)
+        except (OSError, ValueError) as e:
+            report["errors"].append((name, f"{type(e).__name__}: {e}"))
+
+    def _remove_one(self, name, report):
+        entry = self.entries.get(name)
+        if entry:
+            self._remove_output(entry["file"])
+            del self.entries[name]
+            if self.outputs.get(entry["file"]) == name:
+                del self.outputs[entry["file"]]
+            report["removed"].append(entry["file"])
+
+    def _update_one(self, name, report):
+        art_path = os.path.join(self.source_dir, name)
+        entry = self.entries.get(name)
+        art = _signature(art_path)
+        if art is None:
+            # Deleted since update_names looked
+            self._remove_one(name, report)
+            return
+
+        filename = self.output_name(name)
+        if is_gallery_page(filename):
+            raise ValueError(f"{filename} is reserved for the gallery; rename the source")
+        owner = self.outputs.get(filename, name)
+        if owner != name:
+            raise ValueError(f"{filename} is already written for {owner}; rename one of them")
+        sidecar = _signature(art_path[:-len(ART_SUFFIX)] + SIDECAR_SUFFIX)
+        output = os.path.join(self.output_dir, filename)
+        if entry and entry["art"] == art and entry["sidecar"] == sidecar and os.path.exists(output):
+            report["unchanged"] += 1
+            return
+
+        message, color, delay = self._read_inputs(name)
+        key = page_key(message, color, delay, **self.options)
+        if not (entry and entry["key"] == key and os.path.exists(output)):
+            create_html_file(message, color, delay, os.path.basename(output), self.output_dir, **self.options)
+            report["written"].append(os.path.basename(output))
+        else:
+            # Touched but not changed: only the stat signature is new
+            report["unchanged"] += 1
+        self.entries[name] = {"art": art, "sidecar": sidecar, "key": key, "file": filename}
+        self.outputs[filename] = name
+
+    def _remove_output(self, filename):
+        path = os.path.join(self.output_dir, filename)
+        for candidate in (path, *(path + suffix for suffix in COMPRESSED_SUFFIXES)):
+            if os.path.exists(candidate):
+                os.remove(candidate)
+
+    def watch(self, interval=1.0, notify=None, stop=None):
+        """Scan once, then handle changes until ``stop`` (a threading.Event) is set or Ctrl+C.
+
+        ``notify(report)`` is called after every pass that changed something.
+        """
+        notify = notify or (lambda report: None)
+        stop = stop or threading.Event()
+        report = self.scan()
+        notify(report)
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:  # optional; fall back to polling
+            self._poll(interval, notify, stop)
+            return
+
+        changed = set()
+        lock = threading.Lock()
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                with lock:
+                    changed.add(event.src_path)
+                    if getattr(event, "dest_path", None):
+                        changed.add(event.dest_path)
+
+        observer = Observer()
+        observer.schedule(Handler(), self.source_dir, recursive=True)
+        observer.start()
+        try:
+            # Events are collected for one interval so an editor's save burst is one update
+            while not stop.wait(interval):
+                with lock:
+                    paths = set(changed)
+                    changed.clear()
+                if paths:
+                    report = self.update(paths)
+                    if report["written"] or report["removed"] or report["errors"]:
+                        notify(report)
+        finally:
+            observer.stop()
+            observer.join()
+
+    def _poll(self, interval, notify, stop):
+        signatures = self._signatures()
+        while not stop.wait(interval):
+            current = self._signatures()
+            paths = {path for path in signatures.keys() | current.keys() if signatures.get(path) != current.get(path)}
+            signatures = current
+            if paths:
+                report = self.update(paths)
+                if report["written"] or report["removed"] or report["errors"]:
+                    notify(report)
+
+    def _signatures(self):
+        signatures = {}
+        for root, dirs, files in os.walk(self.source_dir):
+            dirs[:] = [d for d in dirs if not d.startswith(".")]
+            for filename in files:
+                if filename.endswith((ART_SUFFIX, SIDECAR_SUFFIX)) and not filename.startswith("."):
+                    path = os.path.join(root, filename)
+                    signatures[path] = _signature(path)
+        return signatures
+
+
+def _print_report(report):
+    for filename in report["written"]:
+        print(f"wrote {filename}")
+    for filename in report["removed"]:
+        print(f"removed {filename}")
+    for name, error in report["errors"]:
+        print(f"{name}: {error}", file=sys.stderr)
+    sys.stdout.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Regenerate pages, and their gallery cards, whenever the ascii art files in a folder change.")
+    parser.add_argument("source_dir", help="folder of <name>.txt art files with optional <name>.json sidecars")
+    parser.add_argument("-o", "--output-dir", default="docs", help="directory to write pages into (default: docs)")
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between change checks (default: 1)")
+    parser.add_argument("--once", action="store_true", help="sync once and exit instead of watching")
+    parser.add_argument("--shared-assets", action="store_true",
+                        help="link one content-hashed CSS/JS asset instead of inlining the engine in every page")
+    parser.add_argument("--minify", action="store_true", help="minify the embedded CSS/JS/HTML")
+    parser.add_argument("--precompress", action="store_true", help="also write .gz/.br siblings for static servers")
+    args = parser.parse_args(argv)
+
+    watcher = ArtWatcher(args.source_dir, args.output_dir, shared_assets=args.shared_assets, minify=args.minify,
+                         precompress=args.precompress)
+    if args.once:
+        report = watcher.scan()
+        _print_report(report)
+        return 1 if report["errors"] else 0
+
+    print(f"watching {args.source_dir} (Ctrl+C to stop)")
+    try:
+        watcher.watch(args.interval, _print_report)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())